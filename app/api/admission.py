@@ -0,0 +1,171 @@
+# app/api/admission.py
+"""
+Admission control in front of the routers.
+
+- Rate limits: token buckets per client (user id from the bearer token, else IP) and route
+  group, plus a per-IP ceiling; kept in the shared cache so all workers and nodes agree.
+  Over the limit -> 429 with Retry-After.
+- Load shedding: in-flight requests per route group in this worker. When a DB-heavy group
+  (login hashing, checkout, search, admin) is saturated, further requests of that group get
+  503 + Retry-After at once instead of queueing for the pool, so cheap reads stay fast.
+
+Pure ASGI (no BaseHTTPMiddleware): streaming exports and background tasks are untouched.
+"""
+from __future__ import annotations
+import logging
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Mapping
+from urllib.parse import parse_qs
+
+import anyio
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.cache import Cache, CacheError, get_cache
+from app.core.config import settings
+from app.core.security import decode_token
+from app.schemas.common import Problem
+
+log = logging.getLogger(__name__)
+
+_EXEMPT = re.compile(r"^/(healthz|docs|redoc|openapi\.json)")
+_PAY = re.compile(r"^/orders/\d+/pay$")
+_READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+@dataclass(frozen=True)
+class Bucket:
+    burst: int
+    rate: float  # tokens per second
+
+    @classmethod
+    def parse(cls, spec: str) -> "Bucket":
+        """'<burst>/<seconds>': `burst` requests, refilled evenly over `seconds`."""
+        n, _, seconds = spec.partition("/")
+        burst, period = int(n), float(seconds or 1)
+        if burst <= 0 or period <= 0:
+            raise ValueError(f"Invalid rate limit {spec!r}")
+        return cls(burst=burst, rate=burst / period)
+
+
+def route_group(method: str, path: str, query_string: bytes, api_prefix: str) -> str:
+    """auth | checkout | search | admin | webhook | write | read"""
+    if not path.startswith(api_prefix):
+        return "read" if method in _READ_METHODS else "write"
+    path = path[len(api_prefix):]
+    if path.startswith("/admin/"):
+        return "admin"
+    if method == "POST" and path.startswith("/payments/webhooks/"):
+        return "webhook"
+    if method == "POST" and path.startswith("/auth/"):
+        return "auth"
+    if method == "POST" and (path == "/orders/checkout" or _PAY.match(path)):
+        return "checkout"
+    if method == "GET" and path.rstrip("/") == "/products" and parse_qs(query_string.decode("latin-1")).get("q"):
+        return "search"
+    return "read" if method in _READ_METHODS else "write"
+
+
+class AdmissionControlMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        cache: Cache | None = None,
+        limits: Mapping[str, str] | None = None,
+        per_ip: str | None = None,
+        max_inflight: Mapping[str, int] | None = None,
+        trust_forwarded: bool | None = None,
+    ):
+        self.app = app
+        self.cache = cache or get_cache()
+        self.limits = {g: Bucket.parse(s) for g, s in (settings.RATE_LIMITS if limits is None else limits).items()}
+        per_ip = settings.RATE_LIMIT_PER_IP if per_ip is None else per_ip
+        self.per_ip = Bucket.parse(per_ip) if per_ip else None
+        self.max_inflight = dict(settings.LOAD_SHED_MAX_INFLIGHT if max_inflight is None else max_inflight)
+        self.trust_forwarded = settings.RATE_LIMIT_TRUST_FORWARDED if trust_forwarded is None else trust_forwarded
+        self.api_prefix = f"/{settings.API_PREFIX}/{settings.API_VERSION}"
+        self.inflight: dict[str, int] = {}  # one event loop per worker: no lock needed
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or _EXEMPT.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        group = route_group(scope["method"], scope["path"], scope.get("query_string", b""), self.api_prefix)
+        headers = {k.decode("latin-1"): v.decode("latin-1") for k, v in scope["headers"]}
+
+        if settings.RATE_LIMIT_ENABLED:
+            ip = self._client_ip(scope, headers)
+            # gateway callbacks arrive in bursts from a few IPs; they only get a group limit if configured
+            checks = [(f"ip:{ip}", self.per_ip)] if self.per_ip and group != "webhook" else []
+            if group in self.limits:
+                checks.append((f"{group}:{self._client(headers) or 'ip:' + ip}", self.limits[group]))
+            wait = await self._throttle(checks)
+            if wait:
+                await self._reject(scope, send, 429, "Too Many Requests", "Rate limit exceeded", wait)
+                return
+
+        limit = self.max_inflight.get(group)
+        if limit is not None and self.inflight.get(group, 0) >= limit:
+            log.warning("load shedding: %s has %s requests in flight", group, self.inflight[group])
+            await self._reject(scope, send, 503, "Service Unavailable", "Server busy, retry shortly", 1)
+            return
+
+        self.inflight[group] = self.inflight.get(group, 0) + 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.inflight[group] -= 1
+
+    # ---------- helpers ----------
+    def _client_ip(self, scope: Scope, headers: Mapping[str, str]) -> str:
+        if self.trust_forwarded and headers.get("x-forwarded-for"):
+            return headers["x-forwarded-for"].split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    def _client(headers: Mapping[str, str]) -> str | None:
+        """User key from the bearer token; decoding is cheap and never touches the DB."""
+        auth = headers.get("authorization", "")
+        if not auth.lower().startswith("bearer "):
+            return None
+        try:
+            sub = decode_token(auth[7:].strip()).get("sub")
+        except Exception:
+            return None
+        return f"user:{sub}" if sub else None
+
+    async def _throttle(self, checks: list[tuple[str, Bucket | None]]) -> float:
+        def run() -> float:
+            return max(
+                (self.cache.throttle(key, rate=b.rate, burst=b.burst) for key, b in checks if b is not None),
+                default=0.0,
+            )
+        try:
+            if self.cache.backend.blocking_io:
+                return await anyio.to_thread.run_sync(run)
+            return run()
+        except CacheError as e:  # fail open: an unavailable cache must not take the API down
+            log.warning("rate limiting skipped: %s", e)
+            return 0.0
+
+    @staticmethod
+    async def _reject(scope: Scope, send: Send, status: int, title: str, detail: str, retry_after: float) -> None:
+        body: dict[str, Any] = Problem(
+            title=title, status=status, detail=detail, instance=scope["path"],
+        ).model_dump()
+        response = JSONResponse(
+            body,
+            status_code=status,
+            media_type="application/problem+json",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+        await response(scope, _no_receive, send)
+
+
+async def _no_receive() -> dict[str, Any]:  # the rejected request body is never read
+    return {"type": "http.disconnect"}
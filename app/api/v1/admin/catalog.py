@@ -1,13 +1,15 @@
 from __future__ import annotations
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, status
+from typing import List, Literal, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Query, UploadFile, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, require_admin
 from app.schemas.page import Page
 from app.schemas.catalog import BrandCreate, BrandOut, BrandUpdate, CategoryCreate, CategoryOut, CategoryUpdate
+from app.schemas.catalog_import import CatalogImportOut, CatalogImportErrorOut
 from app.services.admin.catalog_service import AdminCatalogService
+from app.services.admin.catalog_import_service import CatalogImportService, run_catalog_import
 
 router = APIRouter(prefix="/admin/catalog", tags=["admin:catalog"], dependencies=[Depends(require_admin)])
 
@@ -53,3 +55,24 @@ def move_category(category_id: int, parent_id: int | None = Query(None), db: Ses
 @router.delete("/categories/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_category(category_id: int, hard: bool = Query(False), db: Session = Depends(get_db)):
     AdminCatalogService(db).delete_category(category_id, hard=hard); return
+
+# Bulk import (CSV/JSONL, one row per variant); processed in the background
+@router.post("/imports", response_model=CatalogImportOut, status_code=status.HTTP_202_ACCEPTED)
+def create_import(background: BackgroundTasks, file: UploadFile = File(...), format: Literal["csv", "jsonl"] | None = Form(None), db: Session = Depends(get_db)):
+    row = CatalogImportService(db).create_from_upload(file.file, file.filename or "upload", format)
+    background.add_task(run_catalog_import, row.id)
+    return CatalogImportOut.model_validate(row, from_attributes=True)
+
+@router.get("/imports/{import_id}", response_model=CatalogImportOut)
+def get_import(import_id: int, db: Session = Depends(get_db)):
+    return CatalogImportOut.model_validate(CatalogImportService(db).get(import_id), from_attributes=True)
+
+@router.get("/imports/{import_id}/errors", response_model=Page[CatalogImportErrorOut])
+def list_import_errors(import_id: int, limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0), db: Session = Depends(get_db)):
+    return CatalogImportService(db).list_errors_page(import_id, limit=limit, offset=offset)
+
+@router.post("/imports/{import_id}/resume", response_model=CatalogImportOut, status_code=status.HTTP_202_ACCEPTED)
+def resume_import(import_id: int, background: BackgroundTasks, db: Session = Depends(get_db)):
+    row = CatalogImportService(db).prepare_resume(import_id)
+    background.add_task(run_catalog_import, row.id)
+    return CatalogImportOut.model_validate(row, from_attributes=True)
@@ -1,12 +1,16 @@
 # app/api/routes/admin_inventory.py
 from __future__ import annotations
+from datetime import datetime
 from typing import List
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, require_admin
-from app.schemas.inventory import ManualAdjustIn, InventoryMovementOut
+from app.schemas.inventory import (
+    ManualAdjustIn, InventoryMovementOut, BulkAdjustIn, StockTakeIn, StockChangeReportOut, StockAtOut, ReconcileOut,
+)
 from app.schemas.page import Page
+from app.common.export import ExportFormat, export_response
 from app.db.enums import InventoryMovementType
 from app.services.admin.inventory_service import AdminInventoryService
 
@@ -21,21 +25,67 @@ def list_movements(
     variant_id: int | None = Query(None),
     order_id: int | None = Query(None),
     reason: InventoryMovementType | None = Query(None),
+    created_from: datetime | None = Query(None),
+    created_to: datetime | None = Query(None),
     sort: List[str] = Query(["-created_at"]),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
 ):
     items, total, limit, offset = AdminInventoryService(db).list_movements_page(
-        variant_id=variant_id, order_id=order_id, reason=reason, sort=sort, limit=limit, offset=offset
+        variant_id=variant_id, order_id=order_id, reason=reason,
+        created_from=created_from, created_to=created_to, sort=sort, limit=limit, offset=offset,
     )
     # map ORM rows to DTOs
     dto_items = [InventoryMovementOut.model_validate(o) for o in items]
     return Page[InventoryMovementOut].from_parts(dto_items, total, limit, offset)
 
+@router.get("/movements/export")
+def export_movements(
+    variant_id: int | None = Query(None),
+    order_id: int | None = Query(None),
+    reason: InventoryMovementType | None = Query(None),
+    created_from: datetime | None = Query(None),
+    created_to: datetime | None = Query(None),
+    sort: List[str] = Query(["-created_at"]),
+    format: ExportFormat = Query("csv"),
+    gzip: bool = Query(False),
+    db: Session = Depends(get_db),
+):
+    columns, rows = AdminInventoryService(db).export_movements(
+        variant_id=variant_id, order_id=order_id, reason=reason,
+        created_from=created_from, created_to=created_to, sort=sort,
+    )
+    return export_response(rows, columns, fmt=format, gzip=gzip, name="inventory-movements")
+
 @router.post("/adjust", response_model=InventoryMovementOut, status_code=status.HTTP_201_CREATED)
 def manual_adjust(payload: ManualAdjustIn, db: Session = Depends(get_db)):
     obj = AdminInventoryService(db).manual_adjust(
         variant_id=payload.variant_id, qty_delta=payload.qty_delta, note=payload.note
     )
     return InventoryMovementOut.model_validate(obj)
+
+@router.post("/adjust/bulk", response_model=StockChangeReportOut)
+def bulk_adjust(payload: BulkAdjustIn, db: Session = Depends(get_db)):
+    return AdminInventoryService(db).bulk_adjust(
+        [(it.variant_id, it.qty_delta) for it in payload.items], note=payload.note, dry_run=payload.dry_run
+    )
+
+@router.post("/stock-take", response_model=StockChangeReportOut)
+def stock_take(payload: StockTakeIn, db: Session = Depends(get_db)):
+    return AdminInventoryService(db).stock_take(
+        [(c.sku, c.counted_qty) for c in payload.counts], note=payload.note, dry_run=payload.dry_run
+    )
+
+@router.get("/variants/{variant_id}/stock", response_model=StockAtOut)
+def stock_at(variant_id: int, at: datetime | None = Query(None, description="point in time; default now"), db: Session = Depends(get_db)):
+    return AdminInventoryService(db).stock_at(variant_id, at)
+
+@router.get("/reconcile", response_model=ReconcileOut)
+def reconcile(
+    after_id: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10_000, description="variants scanned per page"),
+    product_id: int | None = Query(None),
+    db: Session = Depends(get_db),
+):
+    return AdminInventoryService(db).reconcile(after_id=after_id, limit=limit, product_id=product_id)
@@ -0,0 +1,32 @@
+# app/api/v1/admin/jobs.py
+from __future__ import annotations
+from typing import List
+from fastapi import APIRouter, Depends, Request
+
+from app.api.deps import require_admin
+from app.exceptions import NotFound
+from app.jobs import Scheduler, default_jobs
+from app.schemas.jobs import JobRunOut, JobStatusOut
+
+router = APIRouter(prefix="/admin/jobs", tags=["admin:jobs"], dependencies=[Depends(require_admin)])
+
+
+def _scheduler(request: Request) -> Scheduler:
+    # metrics are per-process; with JOBS_ENABLED=false we still allow manual runs
+    return getattr(request.app.state, "scheduler", None) or Scheduler(default_jobs())
+
+
+@router.get("", response_model=List[JobStatusOut])
+def list_jobs(request: Request):
+    return _scheduler(request).snapshot()
+
+
+@router.post("/{name}/run", response_model=JobRunOut)
+def run_job(name: str, request: Request):
+    scheduler = _scheduler(request)
+    job = scheduler.jobs.get(name)
+    if not job:
+        raise NotFound(detail="Job not found")
+    ran = scheduler.run_sync(job)
+    snap = next(s for s in scheduler.snapshot() if s["name"] == name)
+    return {"ran": ran, "job": snap}
@@ -1,16 +1,17 @@
 # app/api/v1/admin/orders.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, require_admin
-from app.schemas.order import OrderOut
+from app.schemas.order import OrderOut, OrderDetailOut, OrderInclude, BulkOrderIdsIn, BulkMarkPaidIn, BulkRefundIn, BulkShipIn, BulkOrdersOut
 from app.schemas.page import Page
+from app.common.export import ExportFormat, export_response
 from app.services.admin.order_service import AdminOrderService
 from app.db.enums import ShipmentStatusEnum, PaymentMethodEnum
 from app.services.order_service import OrderService
 
 router = APIRouter(prefix="/admin/orders", tags=["admin:orders"], dependencies=[Depends(require_admin)])
 
-@router.get("", response_model=Page[OrderOut])
+@router.get("", response_model=Page[OrderDetailOut], response_model_exclude_unset=True)
 def list_orders(
     user_id: int | None = None,
     status: list[str] | None = None,
@@ -21,14 +22,58 @@ def list_orders(
     sort: list[str] = ["-created_at"],
     limit: int = 50,
     offset: int = 0,
+    include: list[OrderInclude] = Query([], description="Embed relations: items, payments, shipment, returns"),
     db: Session = Depends(get_db),
 ):
     svc = AdminOrderService(db)
     return svc.list_page(
         user_id=user_id, status=status, created_from=created_from, created_to=created_to,
-        min_total=min_total, max_total=max_total, sort=sort, limit=limit, offset=offset
+        min_total=min_total, max_total=max_total, sort=sort, limit=limit, offset=offset, include=include,
     )
 
+@router.get("/export")
+def export_orders(
+    user_id: int | None = None,
+    status: list[str] | None = Query(None),
+    created_from: str | None = None,
+    created_to: str | None = None,
+    min_total: int | None = None,
+    max_total: int | None = None,
+    sort: list[str] = Query(["-created_at"]),
+    format: ExportFormat = "csv",
+    gzip: bool = False,
+    db: Session = Depends(get_db),
+):
+    columns, rows = AdminOrderService(db).export_rows(
+        user_id=user_id, status=status, created_from=created_from, created_to=created_to,
+        min_total=min_total, max_total=max_total, sort=sort,
+    )
+    return export_response(rows, columns, fmt=format, gzip=gzip, name="orders")
+
+@router.post("/bulk/mark-paid", response_model=BulkOrdersOut)
+def bulk_mark_paid(payload: BulkMarkPaidIn, db: Session = Depends(get_db)):
+    return AdminOrderService(db).bulk_mark_paid(payload.order_ids, payload.method)
+
+@router.post("/bulk/cancel", response_model=BulkOrdersOut)
+def bulk_cancel(payload: BulkOrderIdsIn, db: Session = Depends(get_db)):
+    return AdminOrderService(db).bulk_cancel(payload.order_ids)
+
+@router.post("/bulk/ship", response_model=BulkOrdersOut)
+def bulk_ship(payload: BulkShipIn, db: Session = Depends(get_db)):
+    return AdminOrderService(db).bulk_ship(payload.items, payload.status)
+
+@router.post("/bulk/refund", response_model=BulkOrdersOut)
+def bulk_refund(payload: BulkRefundIn, db: Session = Depends(get_db)):
+    return AdminOrderService(db).bulk_refund(payload.order_ids, payload.reason)
+
+@router.get("/{order_id}", response_model=OrderDetailOut, response_model_exclude_unset=True)
+def get_order(
+    order_id: int,
+    include: list[OrderInclude] = Query(["items", "payments", "shipment"], description="Relations to embed"),
+    db: Session = Depends(get_db),
+):
+    return AdminOrderService(db).get_detail(order_id, include)
+
 @router.post("/{order_id}/mark-paid")
 def mark_paid(order_id: int, method: PaymentMethodEnum = PaymentMethodEnum.momo, db: Session = Depends(get_db)):
     return AdminOrderService(db).mark_paid(order_id, method)
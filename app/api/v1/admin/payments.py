@@ -0,0 +1,51 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import List, Literal
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Query, UploadFile, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, require_admin
+from app.schemas.page import Page
+from app.schemas.reconciliation import ReconciliationOut, ReconciliationItemOut
+from app.payments.reconciliation import ReconciliationService, run_reconciliation
+
+router = APIRouter(prefix="/admin/payments", tags=["admin:payments"], dependencies=[Depends(require_admin)])
+
+# Settlement reconciliation (CSV/JSONL from the gateway); processed in the background
+@router.post("/reconciliations", response_model=ReconciliationOut, status_code=status.HTTP_202_ACCEPTED)
+def create_reconciliation(
+    background: BackgroundTasks,
+    file: UploadFile = File(...),
+    provider: Literal["momo", "zalopay", "fake"] = Form(...),
+    format: Literal["csv", "jsonl"] | None = Form(None),
+    period_from: datetime | None = Form(None, description="with period_to: paid payments in the period missing from the file are reported"),
+    period_to: datetime | None = Form(None),
+    apply_fixes: bool = Form(False),
+    db: Session = Depends(get_db),
+):
+    row = ReconciliationService(db).create_from_upload(
+        file.file, file.filename or "upload", provider=provider, fmt=format,
+        period_from=period_from, period_to=period_to, apply_fixes=apply_fixes,
+    )
+    background.add_task(run_reconciliation, row.id)
+    return ReconciliationOut.model_validate(row, from_attributes=True)
+
+@router.get("/reconciliations/{reconciliation_id}", response_model=ReconciliationOut)
+def get_reconciliation(reconciliation_id: int, db: Session = Depends(get_db)):
+    return ReconciliationOut.model_validate(ReconciliationService(db).get(reconciliation_id), from_attributes=True)
+
+@router.get("/reconciliations/{reconciliation_id}/items", response_model=Page[ReconciliationItemOut])
+def list_reconciliation_items(
+    reconciliation_id: int,
+    kind: List[str] | None = Query(None, description="missing_payment, amount_drift, duplicate_row, duplicate_payment, unsettled, invalid_row"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+):
+    return ReconciliationService(db).list_items_page(reconciliation_id, kind=kind, limit=limit, offset=offset)
+
+@router.post("/reconciliations/{reconciliation_id}/run", response_model=ReconciliationOut, status_code=status.HTTP_202_ACCEPTED)
+def rerun_reconciliation(reconciliation_id: int, background: BackgroundTasks, db: Session = Depends(get_db)):
+    row = ReconciliationService(db).get(reconciliation_id)
+    background.add_task(run_reconciliation, row.id)
+    return ReconciliationOut.model_validate(row, from_attributes=True)
@@ -0,0 +1,43 @@
+# app/api/v1/admin/reports.py
+from __future__ import annotations
+from datetime import date
+from typing import List, Literal
+from fastapi import APIRouter, Depends, Query, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, require_admin
+from app.schemas.report import SalesSummaryOut, SalesPointOut, SalesBreakdownOut, BackfillIn, BackfillOut
+from app.services.admin.report_service import AdminReportService
+
+router = APIRouter(prefix="/admin/reports", tags=["admin:reports"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/sales/summary", response_model=SalesSummaryOut)
+def sales_summary(date_from: date = Query(...), date_to: date = Query(...), db: Session = Depends(get_db)):
+    return AdminReportService(db).summary(date_from, date_to)
+
+
+@router.get("/sales", response_model=List[SalesPointOut])
+def sales_series(
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    granularity: Literal["hour", "day"] = Query("day"),
+    db: Session = Depends(get_db),
+):
+    return AdminReportService(db).series(date_from, date_to, granularity)
+
+
+@router.get("/sales/by/{dimension}", response_model=List[SalesBreakdownOut])
+def sales_breakdown(
+    dimension: Literal["product", "variant", "brand", "category"],
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    return AdminReportService(db).breakdown(dimension, date_from, date_to, limit=limit)
+
+
+@router.post("/backfill", response_model=BackfillOut, status_code=status.HTTP_202_ACCEPTED)
+def backfill(payload: BackfillIn, db: Session = Depends(get_db)):
+    return {"days_queued": AdminReportService(db).backfill(payload.date_from, payload.date_to)}
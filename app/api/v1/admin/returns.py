@@ -1,14 +1,27 @@
 # app/api/v1/admin/returns.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, require_admin
 from app.services.admin.returns_service import AdminReturnsService
+from app.common.export import ExportFormat, export_response
 from app.schemas.returns import (
     ReturnOut, ReturnDecisionIn, ReturnReceiveIn, ReturnRefundIn
 )
 
 router = APIRouter(prefix="/admin/returns", tags=["admin:returns"], dependencies=[Depends(require_admin)])
 
+@router.get("/export")
+def export_returns(
+    order_id: int | None = None,
+    status: list[str] | None = Query(None),
+    sort: list[str] = Query(["-created_at"]),
+    format: ExportFormat = "csv",
+    gzip: bool = False,
+    db: Session = Depends(get_db),
+):
+    columns, rows = AdminReturnsService(db).export_rows(order_id=order_id, status=status, sort=sort)
+    return export_response(rows, columns, fmt=format, gzip=gzip, name="returns")
+
 @router.post("/{return_id}/decision", response_model=ReturnOut)
 def decide(return_id: int, payload: ReturnDecisionIn, db: Session = Depends(get_db)):
     svc = AdminReturnsService(db)
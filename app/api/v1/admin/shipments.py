@@ -0,0 +1,24 @@
+from __future__ import annotations
+from typing import Literal
+from fastapi import APIRouter, Depends, File, Form, UploadFile
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db, require_admin
+from app.schemas.shipment import ShipmentEventsIn, ShipmentIngestOut
+from app.services.admin.shipment_tracking_service import ShipmentTrackingService
+
+router = APIRouter(prefix="/admin/shipments", tags=["admin:shipments"], dependencies=[Depends(require_admin)])
+
+# Carrier tracking: webhook batches (JSON) or status files (CSV/JSONL), keyed by (carrier, tracking_number)
+@router.post("/events", response_model=ShipmentIngestOut)
+def ingest_events(payload: ShipmentEventsIn, db: Session = Depends(get_db)):
+    return ShipmentTrackingService(db).ingest(payload.events)
+
+@router.post("/events/upload", response_model=ShipmentIngestOut)
+def ingest_events_file(
+    file: UploadFile = File(...),
+    format: Literal["csv", "jsonl"] | None = Form(None),
+    carrier: str | None = Form(None),
+    db: Session = Depends(get_db),
+):
+    return ShipmentTrackingService(db).ingest_file(file.file, file.filename or "upload", fmt=format, carrier=carrier)
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from app.api.deps import get_db, require_admin
 from app.schemas.page import Page
+from app.common.export import ExportFormat, export_response
 from app.schemas.user import UserOut
 from app.services.admin.user_service import AdminUserService
 from app.db.enums import UserRoleEnum
@@ -10,9 +11,19 @@ router = APIRouter(prefix="/admin/users", tags=["admin:users"], dependencies=[De
 
 @router.get("", response_model=Page[UserOut])
 def list_users(q: str | None = None, role: str | None = None, is_active: bool | None = None,
-               sort: list[str] = Query(["-created_at"]), limit: int = Query(50, ge=1, le=200),
-               offset: int = Query(0, ge=0), db: Session = Depends(get_db)):
-    return AdminUserService(db).list_page(q=q, role=role, is_active=is_active, sort=sort, limit=limit, offset=offset)
+               include_deleted: bool = True, sort: list[str] = Query(["-created_at"]),
+               limit: int = Query(50, ge=1, le=200), offset: int = Query(0, ge=0), db: Session = Depends(get_db)):
+    return AdminUserService(db).list_page(q=q, role=role, is_active=is_active, include_deleted=include_deleted,
+                                          sort=sort, limit=limit, offset=offset)
+
+@router.get("/export")
+def export_users(q: str | None = None, role: str | None = None, is_active: bool | None = None,
+                 include_deleted: bool = True, sort: list[str] = Query(["-created_at"]),
+                 format: ExportFormat = "csv", gzip: bool = False, db: Session = Depends(get_db)):
+    # same filters and defaults as list_users, so an export matches the listing it was taken from
+    columns, rows = AdminUserService(db).export_rows(q=q, role=role, is_active=is_active,
+                                                     include_deleted=include_deleted, sort=sort)
+    return export_response(rows, columns, fmt=format, gzip=gzip, name="users")
 
 @router.post("/{user_id}/role")
 def set_role(user_id: int, role: UserRoleEnum, db: Session = Depends(get_db)):
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, status
+from typing import List
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_user
@@ -7,7 +8,7 @@ from app.schemas.auth import (
     ForgotPasswordIn, ForgotPasswordOut, ResetPasswordIn, ChangePasswordIn,
 )
 from app.schemas.common import Problem
-from app.services.auth_service import AuthService
+from app.services.auth_service import AuthService, MeExpand
 from app.models.auth import User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -22,9 +23,13 @@ def login(payload: LoginIn, db: Session = Depends(get_db)):
     token = AuthService(db).login(payload.email, payload.password)
     return TokenOut(access_token=token)
 
-@router.get("/me", response_model=MeOut, responses={401: {"model": Problem}})
-def me(current: User = Depends(get_current_user)):
-    return current
+@router.get("/me", response_model=MeOut, response_model_exclude_unset=True, responses={401: {"model": Problem}})
+def me(
+    expand: List[MeExpand] = Query([], description="Optional expansions, e.g. ?expand=stats"),
+    current: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    return AuthService(db).me(current, expand)
 
 @router.post("/forgot-password", response_model=ForgotPasswordOut, status_code=status.HTTP_200_OK)
 def forgot_password(payload: ForgotPasswordIn, db: Session = Depends(get_db)):
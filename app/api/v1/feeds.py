@@ -0,0 +1,23 @@
+# app/api/v1/feeds.py
+from __future__ import annotations
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.db.enums import FeedKindEnum
+from app.repositories.feed_repo import FeedScope
+from app.schemas.common import Problem
+from app.schemas.feed import FeedOut
+from app.services.feed_service import FeedService
+
+router = APIRouter(prefix="/feeds", tags=["feeds"])
+
+@router.get("/{kind}", response_model=FeedOut, responses={400: {"model": Problem}})
+def get_feed(
+    kind: FeedKindEnum,
+    scope: FeedScope = Query("global"),
+    scope_id: int | None = Query(None, description="Category or brand id (scope=category|brand)"),
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    return FeedService(db).get_feed(kind, scope, scope_id, limit=limit)
@@ -5,7 +5,8 @@ from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_user
-from app.schemas.order import CheckoutIn, OrderOut, OrderDetailOut
+from app.schemas.order import CheckoutIn, OrderOut, OrderDetailOut, OrderInclude
+from app.schemas.page import Page
 from app.schemas.common import Problem
 from app.services.order_service import OrderService
 from app.db.enums import PaymentMethodEnum
@@ -13,7 +14,7 @@ from app.models.auth import User
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
-@router.get("", response_model=List[OrderOut])
+@router.get("", response_model=Page[OrderDetailOut], response_model_exclude_unset=True)
 def list_my_orders(
     status: Optional[List[str]] = Query(None, description="Repeat param, e.g. ?status=pending&status=paid"),
     created_from: datetime | None = Query(None),
@@ -23,18 +24,28 @@ def list_my_orders(
     sort: List[str] = Query(["-created_at"], description="fields: id, order_number, created_at, status, total, paid_at"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    include: List[OrderInclude] = Query([], description="Embed relations, e.g. ?include=items&include=shipment"),
     current: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     return OrderService(db).list_my_orders_page(
         current.id, status=status, created_from=created_from, created_to=created_to,
-        min_total=min_total, max_total=max_total, sort=sort, limit=limit, offset=offset,
+        min_total=min_total, max_total=max_total, sort=sort, limit=limit, offset=offset, include=include,
     )
 
-@router.get("/{order_id}", response_model=OrderDetailOut, responses={404: {"model": Problem}})
-def get_order(order_id: int, current: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    o = OrderService(db).get_for_user(current.id, order_id)
-    return OrderDetailOut.model_validate(o, from_attributes=True)
+@router.get(
+    "/{order_id}",
+    response_model=OrderDetailOut,
+    response_model_exclude_unset=True,
+    responses={404: {"model": Problem}},
+)
+def get_order(
+    order_id: int,
+    include: List[OrderInclude] = Query(["items"], description="Relations to embed: items, payments, shipment, returns"),
+    current: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    return OrderService(db).get_detail_for_user(current.id, order_id, include)
 
 @router.post(
     "/checkout",
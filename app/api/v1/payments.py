@@ -0,0 +1,18 @@
+from __future__ import annotations
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+from app.payments.inbox import PaymentInbox
+
+router = APIRouter(prefix="/payments", tags=["payments"])
+
+
+async def _raw_body(request: Request) -> bytes:
+    return await request.body()  # signatures cover the exact bytes
+
+
+# Gateway callbacks (momo | zalopay | fake): stored for the background processor, acknowledged at once
+@router.post("/webhooks/{provider}", status_code=204)
+def payment_webhook(provider: str, request: Request, body: bytes = Depends(_raw_body), db: Session = Depends(get_db)):
+    return PaymentInbox(db).receive(provider, body, request.headers)
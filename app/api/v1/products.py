@@ -4,12 +4,15 @@ from typing import List
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.orm import Session
 from app.api.deps import get_current_user, get_db
+from app.models.auth import User
 from app.schemas.page import Page
 from app.schemas.product import (
     ProductOut, VariantOut, ImageOut
 )
+from app.schemas.related import RelatedOut
 from app.schemas.review import ReviewCreate, ReviewOut
 from app.services.product_service import ProductService
+from app.services.related_service import RelatedService
 from app.services.review_service import ReviewService
 
 router = APIRouter(prefix="/products", tags=["products"])
@@ -23,6 +26,7 @@ def list_products(
     is_archived: bool | None = Query(None),
     price_min: int | None = Query(None, ge=0),
     price_max: int | None = Query(None, ge=0),
+    in_stock: bool | None = Query(None),
     sort: List[str] = Query(["-created_at"]),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
@@ -31,14 +35,38 @@ def list_products(
     return ProductService(db).list_products_page(
         q=q, brand_id=brand_id, category_id=category_id,
         is_active=is_active, is_archived=is_archived,
-        price_min=price_min, price_max=price_max,
+        price_min=price_min, price_max=price_max, in_stock=in_stock,
         sort=sort, limit=limit, offset=offset,
     )
 
+@router.get("/recently-viewed", response_model=List[ProductOut])
+def recently_viewed(
+    limit: int = Query(20, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    return RelatedService(db).recently_viewed(current.id, limit=limit)
+
 @router.get("/{product_id}", response_model=ProductOut)
 def get_product(product_id: int, db: Session = Depends(get_db)):
     return ProductService(db).get_product(product_id)
 
+@router.get("/{product_id}/related", response_model=RelatedOut)
+def related_products(
+    product_id: int,
+    limit: int = Query(10, ge=1, le=20),
+    db: Session = Depends(get_db),
+):
+    return RelatedService(db).get_related(product_id, limit=limit)
+
+@router.post("/{product_id}/view", status_code=status.HTTP_204_NO_CONTENT)
+def record_product_view(
+    product_id: int,
+    db: Session = Depends(get_db),
+    current: User = Depends(get_current_user),
+):
+    RelatedService(db).record_view(current.id, product_id)
+
 @router.get("/{product_id}/variants", response_model=List[VariantOut])
 def list_variants(product_id: int, db: Session = Depends(get_db)):
     return ProductService(db).list_variants(product_id)
@@ -7,7 +7,11 @@ from .admin import users as admin_users
 from .admin import catalog as admin_catalog
 from .admin import returns as admin_returns
 from .admin import inventory as admin_inventory
-from . import auth, cart, orders, products, reviews, catalog, addresses, returns
+from .admin import jobs as admin_jobs
+from .admin import reports as admin_reports
+from .admin import shipments as admin_shipments
+from .admin import payments as admin_payments
+from . import auth, cart, orders, products, reviews, catalog, addresses, returns, payments, feeds, variants
 
 api_router = APIRouter()
 
@@ -19,6 +23,9 @@ api_router.include_router(reviews.router)
 api_router.include_router(catalog.router)
 api_router.include_router(addresses.router)
 api_router.include_router(returns.router)
+api_router.include_router(payments.router)
+api_router.include_router(feeds.router)
+api_router.include_router(variants.router)
 
 # admin
 api_router.include_router(admin_products.router)
@@ -27,4 +34,8 @@ api_router.include_router(admin_orders.router)
 api_router.include_router(admin_users.router)
 api_router.include_router(admin_catalog.router)
 api_router.include_router(admin_returns.router)
-api_router.include_router(admin_inventory.router)
\ No newline at end of file
+api_router.include_router(admin_inventory.router)
+api_router.include_router(admin_jobs.router)
+api_router.include_router(admin_reports.router)
+api_router.include_router(admin_shipments.router)
+api_router.include_router(admin_payments.router)
\ No newline at end of file
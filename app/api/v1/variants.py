@@ -0,0 +1,13 @@
+# app/api/v1/variants.py
+from __future__ import annotations
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.api.deps import get_db
+from app.schemas.product import VariantAvailabilityIn, VariantAvailabilityListOut
+from app.services.product_service import ProductService
+
+router = APIRouter(prefix="/variants", tags=["variants"])
+
+@router.post("/availability", response_model=VariantAvailabilityListOut)
+def variant_availability(payload: VariantAvailabilityIn, db: Session = Depends(get_db)):
+    return ProductService(db).variant_availability(payload)
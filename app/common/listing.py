@@ -9,7 +9,9 @@ T = TypeVar("T")
 Col = ColumnElement[Any] | InstrumentedAttribute[Any]  # “column-ish”
 
 def paginate(db: Session, stmt: Select[tuple[T]], limit: int, offset: int) -> tuple[list[T], int]:
-    total = db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery())) or 0
+    # the count wraps `stmt` in a new SELECT: carry its options (e.g. include_deleted) over
+    count = select(func.count()).select_from(stmt.order_by(None).subquery())
+    total = db.scalar(count.execution_options(**stmt.get_execution_options())) or 0
     items = cast(list[T], db.execute(stmt.limit(limit).offset(offset)).scalars().all())
     return items, total
 
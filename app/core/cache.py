@@ -0,0 +1,464 @@
+# app/core/cache.py
+"""
+Shared cache. `Cache` is the API services use (JSON values, key prefix, tags, locks,
+single-flight); a `CacheBackend` stores bytes:
+
+- MemoryBackend: process-local LRU. Default for dev; NOT shared across uvicorn workers.
+- RedisBackend:  any Redis-protocol server (Redis, Valkey, KeyDB) via CACHE_URL=redis://...
+
+Cache failures never fail a request: reads degrade to a miss, writes are logged.
+`incr`, `throttle` and `lock` raise CacheError, since their callers (rate limits,
+critical sections) must choose between failing open and failing closed.
+"""
+from __future__ import annotations
+import json
+import logging
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Mapping, TypeVar
+
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+_MISS = object()
+
+
+class CacheError(Exception):
+    """The cache backend is unreachable or rejected the command."""
+
+
+# ---------- Backends ----------
+class CacheBackend(ABC):
+    """Byte storage. Keys and tags arrive fully prefixed; ttl is in seconds (None: no expiry)."""
+    blocking_io = False  # True: calls do network I/O (async callers should use a thread)
+
+    @abstractmethod
+    def get_many(self, keys: list[str]) -> list[bytes | None]: ...
+
+    @abstractmethod
+    def set_many(self, items: Mapping[str, bytes], ttl: float | None, tags: Iterable[str] = ()) -> None: ...
+
+    @abstractmethod
+    def add(self, key: str, value: bytes, ttl: float | None) -> bool:
+        """Set only if the key is absent; True when stored."""
+
+    @abstractmethod
+    def delete(self, keys: list[str]) -> int: ...
+
+    @abstractmethod
+    def delete_if_equal(self, key: str, value: bytes) -> bool:
+        """Atomic compare-and-delete (lock release)."""
+
+    @abstractmethod
+    def incr(self, key: str, amount: int, ttl: float | None) -> int:
+        """Atomic add; a new counter starts at 0 and gets `ttl`, an existing one keeps its expiry."""
+
+    @abstractmethod
+    def invalidate_tags(self, tags: list[str]) -> int:
+        """Delete every key written with any of `tags`; returns the number of keys removed."""
+
+    @abstractmethod
+    def throttle(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        """
+        Token bucket (as GCRA): `burst` tokens refilled at `rate` per second. Takes `cost`
+        tokens and returns 0, or returns the seconds until they are available (nothing taken).
+        """
+
+    @abstractmethod
+    def clear(self, prefix: str) -> None: ...
+
+
+class MemoryBackend(CacheBackend):
+    """Thread-safe LRU with per-entry expiry, bounded to `max_entries`."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        # key -> (value, expires_at monotonic | None, tags)
+        self._data: OrderedDict[str, tuple[bytes, float | None, tuple[str, ...]]] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+        self._lock = threading.RLock()
+
+    def _get(self, key: str) -> bytes | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] <= time.monotonic():
+            self._pop(key)
+            return None
+        self._data.move_to_end(key)
+        return item[0]
+
+    def _put(self, key: str, value: bytes, ttl: float | None, tags: tuple[str, ...] = ()) -> None:
+        old = self._data.get(key)
+        if old is not None:
+            self._untag(key, old[2])
+        self._data[key] = (value, time.monotonic() + ttl if ttl else None, tags)
+        self._data.move_to_end(key)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._data) > self.max_entries:
+            self._pop(next(iter(self._data)))
+
+    def _pop(self, key: str) -> bool:
+        item = self._data.pop(key, None)
+        if item is None:
+            return False
+        self._untag(key, item[2])
+        return True
+
+    def _untag(self, key: str, tags: tuple[str, ...]) -> None:
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def get_many(self, keys: list[str]) -> list[bytes | None]:
+        with self._lock:
+            return [self._get(k) for k in keys]
+
+    def set_many(self, items: Mapping[str, bytes], ttl: float | None, tags: Iterable[str] = ()) -> None:
+        tags = tuple(tags)
+        with self._lock:
+            for k, v in items.items():
+                self._put(k, v, ttl, tags)
+
+    def add(self, key: str, value: bytes, ttl: float | None) -> bool:
+        with self._lock:
+            if self._get(key) is not None:
+                return False
+            self._put(key, value, ttl)
+            return True
+
+    def delete(self, keys: list[str]) -> int:
+        with self._lock:
+            return sum(self._pop(k) for k in keys)
+
+    def delete_if_equal(self, key: str, value: bytes) -> bool:
+        with self._lock:
+            return self._get(key) == value and self._pop(key)
+
+    def incr(self, key: str, amount: int, ttl: float | None) -> int:
+        with self._lock:
+            item = self._data.get(key)
+            current = self._get(key)
+            n = int(current or 0) + amount
+            if current is None or item is None:
+                self._put(key, str(n).encode(), ttl)
+            else:  # keep the original expiry window
+                self._data[key] = (str(n).encode(), item[1], item[2])
+            return n
+
+    def invalidate_tags(self, tags: list[str]) -> int:
+        with self._lock:
+            keys = set().union(*(self._tags.get(t, set()) for t in tags))
+            return sum(self._pop(k) for k in keys)
+
+    def throttle(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        interval = 1.0 / rate
+        with self._lock:
+            now = time.time()
+            raw = self._get(key)
+            tat = max(float(raw) if raw is not None else now, now)  # theoretical arrival time
+            new_tat = tat + cost * interval
+            allow_at = new_tat - burst * interval
+            if allow_at > now:
+                return allow_at - now
+            self._put(key, repr(new_tat).encode(), new_tat - now)
+            return 0.0
+
+    def clear(self, prefix: str) -> None:
+        with self._lock:
+            for k in [k for k in self._data if k.startswith(prefix)]:
+                self._pop(k)
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis-protocol backend (redis-py). Tags are sets of member keys that expire no earlier
+    than their longest-lived member. Needs Redis >= 7 (EXPIRE NX/GT); not cluster-aware.
+    """
+    _DELETE_IF_EQUAL = """
+        if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end
+        return 0
+    """
+    _INVALIDATE_TAGS = """
+        local n = 0
+        for _, tag in ipairs(KEYS) do
+            local members = redis.call('smembers', tag)
+            for i = 1, #members, 500 do
+                n = n + redis.call('del', unpack(members, i, math.min(i + 499, #members)))
+            end
+            redis.call('del', tag)
+        end
+        return n
+    """
+    _THROTTLE = """
+        local t = redis.call('time')
+        local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+        local interval = 1 / tonumber(ARGV[1])
+        local tat = math.max(tonumber(redis.call('get', KEYS[1]) or now), now)
+        local new_tat = tat + tonumber(ARGV[3]) * interval
+        local allow_at = new_tat - tonumber(ARGV[2]) * interval
+        if allow_at > now then return tostring(allow_at - now) end
+        redis.call('set', KEYS[1], tostring(new_tat), 'px', math.max(1, math.ceil((new_tat - now) * 1000)))
+        return '0'
+    """
+    blocking_io = True
+
+    def __init__(self, url: str, *, socket_timeout: float = 0.5):
+        try:
+            import redis
+        except ImportError as e:  # pragma: no cover - dependency listed in requirements.txt
+            raise RuntimeError("CACHE_URL points at Redis but the 'redis' package is not installed") from e
+        self._redis_error = redis.RedisError
+        self.client = redis.Redis.from_url(url, socket_timeout=socket_timeout, socket_connect_timeout=socket_timeout)
+        self._delete_if_equal = self.client.register_script(self._DELETE_IF_EQUAL)
+        self._invalidate = self.client.register_script(self._INVALIDATE_TAGS)
+        self._throttle = self.client.register_script(self._THROTTLE)
+
+    @contextmanager
+    def _errors(self) -> Iterator[None]:
+        try:
+            yield
+        except self._redis_error as e:
+            raise CacheError(str(e)) from e
+
+    @staticmethod
+    def _ms(ttl: float | None) -> int | None:
+        return max(1, int(ttl * 1000)) if ttl else None
+
+    def get_many(self, keys: list[str]) -> list[bytes | None]:
+        with self._errors():
+            return self.client.mget(keys)
+
+    def set_many(self, items: Mapping[str, bytes], ttl: float | None, tags: Iterable[str] = ()) -> None:
+        px = self._ms(ttl)
+        with self._errors():
+            pipe = self.client.pipeline(transaction=False)
+            for k, v in items.items():
+                pipe.set(k, v, px=px)
+            for tag in tags:
+                pipe.sadd(tag, *items.keys())
+                if px:
+                    pipe.pexpire(tag, px, nx=True)
+                    pipe.pexpire(tag, px, gt=True)
+                else:
+                    pipe.persist(tag)
+            pipe.execute()
+
+    def add(self, key: str, value: bytes, ttl: float | None) -> bool:
+        with self._errors():
+            return bool(self.client.set(key, value, px=self._ms(ttl), nx=True))
+
+    def delete(self, keys: list[str]) -> int:
+        with self._errors():
+            return int(self.client.delete(*keys)) if keys else 0
+
+    def delete_if_equal(self, key: str, value: bytes) -> bool:
+        with self._errors():
+            return bool(self._delete_if_equal(keys=[key], args=[value]))
+
+    def incr(self, key: str, amount: int, ttl: float | None) -> int:
+        with self._errors():
+            pipe = self.client.pipeline(transaction=True)
+            if ttl:
+                pipe.set(key, 0, px=self._ms(ttl), nx=True)
+            pipe.incrby(key, amount)
+            return int(pipe.execute()[-1])
+
+    def invalidate_tags(self, tags: list[str]) -> int:
+        with self._errors():
+            return int(self._invalidate(keys=tags)) if tags else 0
+
+    def throttle(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        with self._errors():
+            return float(self._throttle(keys=[key], args=[rate, burst, cost]))
+
+    def clear(self, prefix: str) -> None:
+        with self._errors():
+            batch = []
+            for k in self.client.scan_iter(match=f"{prefix}*", count=1000):
+                batch.append(k)
+                if len(batch) >= 500:
+                    self.client.delete(*batch)
+                    batch = []
+            if batch:
+                self.client.delete(*batch)
+
+
+# ---------- Front ----------
+class Cache:
+    """JSON-valued cache over a backend. `ttl=None` means CACHE_DEFAULT_TTL_SECONDS; 0 means no expiry."""
+
+    def __init__(self, backend: CacheBackend, *, prefix: str = "", default_ttl: float = 300):
+        self.backend = backend
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self._flights: dict[str, list[Any]] = {}  # key -> [threading.Lock, waiters]
+        self._flights_lock = threading.Lock()
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _ttl(self, ttl: float | None) -> float | None:
+        ttl = self.default_ttl if ttl is None else ttl
+        return ttl or None
+
+    @staticmethod
+    def _dump(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+    # ---------- Values ----------
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Hits only: missing keys are absent from the result."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        try:
+            raw = self.backend.get_many([self._key(k) for k in keys])
+        except CacheError as e:
+            log.warning("cache get failed: %s", e)
+            return {}
+        return {k: json.loads(v) for k, v in zip(keys, raw) if v is not None}
+
+    def set(self, key: str, value: Any, ttl: float | None = None, *, tags: Iterable[str] = ()) -> None:
+        self.set_many({key: value}, ttl, tags=tags)
+
+    def set_many(self, items: Mapping[str, Any], ttl: float | None = None, *, tags: Iterable[str] = ()) -> None:
+        if not items:
+            return
+        data = {self._key(k): self._dump(v) for k, v in items.items()}
+        try:
+            self.backend.set_many(data, self._ttl(ttl), [self._tag(t) for t in tags])
+        except CacheError as e:
+            log.warning("cache set failed: %s", e)
+
+    def delete(self, *keys: str) -> None:
+        try:
+            self.backend.delete([self._key(k) for k in keys])
+        except CacheError as e:
+            log.error("cache delete failed (stale entries until TTL): %s", e)
+
+    def invalidate_tags(self, *tags: str) -> None:
+        try:
+            self.backend.invalidate_tags([self._tag(t) for t in tags])
+        except CacheError as e:
+            log.error("cache tag invalidation failed (stale entries until TTL): %s", e)
+
+    def clear(self) -> None:
+        self.backend.clear(self.prefix)
+
+    # ---------- Counters, rate limits & locks (raise CacheError) ----------
+    def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        """Atomic counter; the first increment starts the `ttl` window (fixed-window counters)."""
+        return self.backend.incr(self._key(key), amount, self._ttl(ttl))
+
+    def throttle(self, key: str, *, rate: float, burst: int, cost: int = 1) -> float:
+        """Token bucket shared by every process on the backend; 0 = allowed, else retry-after seconds."""
+        return self.backend.throttle(self._key(f"rl:{key}"), rate, burst, cost)
+
+    @contextmanager
+    def lock(self, name: str, *, ttl: float = 10, wait: float = 0, poll: float = 0.05) -> Iterator[bool]:
+        """
+        Distributed mutex; yields whether it was acquired within `wait` seconds. `ttl` bounds
+        how long a crashed holder can keep it. Release only deletes our own token.
+        """
+        key = self._key(f"lock:{name}")
+        token = uuid.uuid4().hex.encode()
+        deadline = time.monotonic() + wait
+        acquired = self.backend.add(key, token, ttl)
+        while not acquired and time.monotonic() < deadline:
+            time.sleep(poll)
+            acquired = self.backend.add(key, token, ttl)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                try:
+                    self.backend.delete_if_equal(key, token)
+                except CacheError as e:
+                    log.warning("cache lock %s not released (expires in %ss): %s", name, ttl, e)
+
+    # ---------- Read-through with single-flight ----------
+    @contextmanager
+    def _flight(self, key: str) -> Iterator[None]:
+        with self._flights_lock:
+            entry = self._flights.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._flights_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    self._flights.pop(key, None)
+
+    def get_or_set(
+        self,
+        key: str,
+        loader: Callable[[], T],
+        ttl: float | None = None,
+        *,
+        tags: Iterable[str] = (),
+        fill_timeout: float = 5,
+    ) -> T:
+        """
+        Read-through. On a miss one caller per key runs `loader`: threads of this process
+        queue on a local lock, other processes on a cache lock, and the waiters re-read the
+        value the leader stored. After `fill_timeout` a waiter loads on its own.
+        """
+        hit = self.get(key, _MISS)
+        if hit is not _MISS:
+            return hit
+        with self._flight(key):
+            hit = self.get(key, _MISS)
+            if hit is not _MISS:
+                return hit
+            try:
+                with self.lock(f"fill:{key}", ttl=fill_timeout, wait=fill_timeout):
+                    hit = self.get(key, _MISS)  # filled by another process while we waited
+                    if hit is not _MISS:
+                        return hit
+                    value = loader()
+                    self.set(key, value, ttl, tags=tags)
+                    return value
+            except CacheError as e:
+                log.warning("cache fill lock unavailable, loading %s directly: %s", key, e)
+                value = loader()
+                self.set(key, value, ttl, tags=tags)
+                return value
+
+
+def _backend_from_url(url: str) -> CacheBackend:
+    scheme = url.split("://", 1)[0].lower()
+    if scheme == "memory":
+        return MemoryBackend(max_entries=settings.CACHE_MEMORY_MAX_ENTRIES)
+    if scheme in ("redis", "rediss", "unix"):
+        return RedisBackend(url, socket_timeout=settings.CACHE_SOCKET_TIMEOUT_SECONDS)
+    raise ValueError(f"Unsupported CACHE_URL scheme: {scheme!r}")
+
+
+@lru_cache
+def get_cache() -> Cache:
+    """Process-wide cache configured from settings."""
+    return Cache(
+        _backend_from_url(settings.CACHE_URL),
+        prefix=settings.CACHE_KEY_PREFIX,
+        default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS,
+    )
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -18,6 +18,20 @@ class Settings(BaseSettings):
     # --- DB (Postgres only) ---
     SQLALCHEMY_DATABASE_URI: str = ""
     ALEMBIC_DATABASE_URI: Optional[str] = None
+    DB_POOL_SIZE: int = 5          # per worker process: workers * (size + overflow) <= max_connections
+                                   # (the job scheduler borrows up to JOBS_MAX_CONCURRENT of these)
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+
+    # --- Server (python -m app.server) ---
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WEB_CONCURRENCY: int = 0  # worker processes; 0 = 2 * CPUs + 1, capped below
+    SERVER_MAX_WORKERS: int = 8
+    SERVER_LIMIT_MAX_REQUESTS: int = 10_000  # recycle a worker after this many requests; 0 = never
+    SERVER_GRACEFUL_TIMEOUT_SECONDS: int = 30  # drain in-flight requests on SIGTERM
+    SERVER_KEEPALIVE_SECONDS: int = 5
 
     # --- Auth ---
     JWT_SECRET: str = ""
@@ -25,6 +39,79 @@ class Settings(BaseSettings):
     RESET_TOKEN_EXPIRE_MINUTES: int = 5
     PASSWORD_MIN_LEN: int = 10
 
+    # --- Inventory ---
+    CART_RESERVATION_TTL_MINUTES: int = 15
+    CART_ABANDON_AFTER_HOURS: int = 72
+    INVENTORY_SNAPSHOT_LAG_MINUTES: int = 15  # snapshots cover movements older than this
+    INVENTORY_PARTITION_PREMAKE_MONTHS: int = 3     # monthly ledger partitions created ahead
+    INVENTORY_PARTITION_RETENTION_MONTHS: int = 24  # older partitions move to the archive schema; 0 = keep
+
+    # --- Admin orders ---
+    ADMIN_BULK_CHUNK_SIZE: int = 200  # orders locked and committed together by the bulk actions
+    SHIPMENT_EVENTS_BATCH_SIZE: int = 1000  # carrier tracking events applied per commit
+
+    # --- Background jobs ---
+    JOBS_ENABLED: bool = True  # run the scheduler inside API processes
+    JOBS_MAX_CONCURRENT: int = 2  # jobs running at once per process, one pooled connection each
+    JOB_RESERVATION_EXPIRY_INTERVAL_SECONDS: int = 60
+    JOB_CART_ABANDON_INTERVAL_SECONDS: int = 600
+    JOB_OUTBOX_RELAY_INTERVAL_SECONDS: float = 2.0
+    JOB_REPORTS_REFRESH_INTERVAL_SECONDS: int = 60
+    JOB_INVENTORY_SNAPSHOT_INTERVAL_SECONDS: int = 3600
+    JOB_PAYMENT_CALLBACKS_INTERVAL_SECONDS: float = 1.0
+    JOB_USER_STATS_REBUILD_INTERVAL_SECONDS: int = 86400
+    JOB_FEEDS_REFRESH_INTERVAL_SECONDS: int = 900
+    JOB_RELATED_PRODUCTS_INTERVAL_SECONDS: int = 86400
+
+    # --- Outbox ---
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_RETENTION_DAYS: int = 7
+
+    # --- Catalog import ---
+    IMPORT_DIR: str = "var/imports"  # uploaded import files
+    IMPORT_BATCH_SIZE: int = 500     # rows per upsert batch / commit (capped by the bind-parameter limit)
+
+    # --- Cache ---
+    CACHE_URL: str = "memory://"  # redis://host:6379/0 to share across workers and nodes
+    CACHE_KEY_PREFIX: str = "fs:"
+    CACHE_DEFAULT_TTL_SECONDS: int = 300
+    CACHE_MEMORY_MAX_ENTRIES: int = 10_000
+    CACHE_SOCKET_TIMEOUT_SECONDS: float = 0.5  # a slow cache degrades to a miss, not a slow request
+
+    # --- Rate limiting / load shedding ---
+    # Token buckets "<burst>/<seconds>" per client (user id when authenticated, else IP) and
+    # route group: auth, checkout, search, admin, write, read. Shared through the cache.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMITS: Dict[str, str] = {
+        "auth": "10/60",
+        "checkout": "20/60",
+        "search": "120/60",
+        "write": "300/60",
+    }
+    RATE_LIMIT_PER_IP: str = "1200/60"     # ceiling per IP over all groups ("" = off)
+    RATE_LIMIT_TRUST_FORWARDED: bool = False  # take the client IP from X-Forwarded-For (behind a proxy)
+    # Max concurrent requests per worker by group; beyond it: 503 (groups not listed: unlimited)
+    LOAD_SHED_MAX_INFLIGHT: Dict[str, int] = {"auth": 8, "checkout": 16, "search": 16, "admin": 8}
+
+    # --- Reports ---
+    REPORTS_TIMEZONE: str = "UTC"  # day/hour buckets of the sales rollups
+
+    # --- Feeds ---
+    FEED_SIZE: int = 50                    # products kept per precomputed list
+    FEED_BESTSELLER_DAYS: int = 30
+    FEED_TOP_RATED_MIN_REVIEWS: int = 3
+    FEED_CACHE_TTL_SECONDS: int = 60       # cached id lists (also dropped after each refresh)
+    PRODUCT_CARD_CACHE_TTL_SECONDS: int = 60
+    VARIANT_AVAILABILITY_CACHE_TTL_SECONDS: float = 0.3  # micro-cache for hot SKUs; 0 disables
+
+    # --- Recommendations ---
+    RELATED_TOP_K: int = 20                # neighbours kept per product and list
+    RELATED_LOOKBACK_DAYS: int = 180       # orders counted for "also bought"
+    RELATED_MIN_COOCCURRENCE: int = 2      # baskets a pair must share
+    RELATED_MAX_BASKET: int = 50           # larger orders are skipped (bulk buys)
+    RELATED_SIMILAR_WINDOW: int = 50       # nearest-by-price peers compared per group
+    RECENTLY_VIEWED_MAX: int = 50
+
     # --- CORS ---
     CORS_ORIGINS: str = ""
 
@@ -34,6 +121,10 @@ class Settings(BaseSettings):
     ZALOPAY_APP_ID: str = ""
     ZALOPAY_KEY1: str = ""
     ZALOPAY_KEY2: str = ""
+    PAYMENT_FAKE_GATEWAY_SECRET: str = ""  # enables /payments/webhooks/fake (tests / local only)
+    PAYMENT_CALLBACK_BATCH_SIZE: int = 500  # stored callbacks applied per commit
+    PAYMENT_CALLBACK_MAX_ATTEMPTS: int = 5
+    RECONCILE_CHUNK_SIZE: int = 5000  # settlement rows matched per lookup
 
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=False)
 
@@ -41,6 +41,22 @@ class PaymentMethodEnum(str, PyEnum):
     zalopay = "zalopay"
 
 
+class PaymentCallbackStatusEnum(str, PyEnum):
+    pending = "pending"              # stored, not yet applied
+    processed = "processed"          # payment (and order) updated
+    ignored = "ignored"              # nothing to do (order no longer pending, replayed ref...)
+    failed = "failed"                # rejected (unknown order, amount mismatch) or gave up
+
+
+class ReconcileMismatchEnum(str, PyEnum):
+    missing_payment = "missing_payment"      # settled, but no paid payment with that ref
+    amount_drift = "amount_drift"            # paid payment amount != settled amount
+    duplicate_row = "duplicate_row"          # ref repeated in the settlement file
+    duplicate_payment = "duplicate_payment"  # several paid payments carry the ref
+    unsettled = "unsettled"                  # paid in the period, absent from the file
+    invalid_row = "invalid_row"
+
+
 # ---------- Shipments ----------
 class ShipmentStatusEnum(str, PyEnum):
     pending = "pending"
@@ -71,13 +87,40 @@ class ReturnStatusEnum(str, PyEnum):
     closed = "closed"
 
 
+# ---------- Outbox ----------
+class OutboxStatusEnum(str, PyEnum):
+    pending = "pending"
+    done = "done"
+    dead = "dead"                    # gave up after max attempts
+
+
+# ---------- Imports ----------
+class ImportStatusEnum(str, PyEnum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"                # stopped early; resumable
+
+
+# ---------- Feeds ----------
+class FeedKindEnum(str, PyEnum):
+    bestsellers = "bestsellers"      # units sold (net of refunds) over FEED_BESTSELLER_DAYS
+    new_arrivals = "new_arrivals"
+    top_rated = "top_rated"          # average rating, at least FEED_TOP_RATED_MIN_REVIEWS reviews
+
+
 __all__ = [
     "UserRoleEnum",
     "CartStatusEnum",
     "OrderStatusEnum",
     "PaymentStatusEnum",
     "PaymentMethodEnum",
+    "PaymentCallbackStatusEnum",
+    "ReconcileMismatchEnum",
     "ShipmentStatusEnum",
     "InventoryMovementType",
     "ReturnStatusEnum",
+    "OutboxStatusEnum",
+    "ImportStatusEnum",
+    "FeedKindEnum",
 ]
@@ -0,0 +1,64 @@
+# app/db/locks.py
+from __future__ import annotations
+import hashlib
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.session import engine as default_engine
+
+
+def lock_key(name: str) -> int:
+    """Stable signed 64-bit key for pg advisory locks."""
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+@contextmanager
+def try_advisory_lock(name: str, *, engine: Engine = default_engine) -> Iterator[bool]:
+    """
+    Hold a session-level advisory lock on a dedicated connection for the duration of the block.
+    Yields False (without waiting) when another session holds it.
+    """
+    key = lock_key(name)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if not conn.scalar(select(func.pg_try_advisory_lock(key))):
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            try:
+                conn.scalar(select(func.pg_advisory_unlock(key)))
+            except Exception:
+                # never hand a connection that may still hold the lock back to the pool
+                conn.invalidate()
+                raise
+
+
+@contextmanager
+def advisory_locked_connection(name: str, *, engine: Engine = default_engine) -> Iterator[Optional[Connection]]:
+    """
+    Like try_advisory_lock, but yields the (transactional) connection holding the lock so the
+    caller can bind its session to it: one pooled connection per holder instead of two.
+    Yields None when another session holds the lock. The lock outlives the caller's commits.
+    """
+    key = lock_key(name)
+    with engine.connect() as conn:
+        acquired = conn.scalar(select(func.pg_try_advisory_lock(key)))
+        conn.commit()
+        if not acquired:
+            yield None
+            return
+        try:
+            yield conn
+        finally:
+            try:
+                conn.rollback()
+                conn.scalar(select(func.pg_advisory_unlock(key)))
+                conn.commit()
+            except Exception:
+                conn.invalidate()
+                raise
@@ -0,0 +1,108 @@
+# app/db/partitions.py
+"""
+Monthly RANGE partitions on a timestamptz column (UTC month boundaries).
+Partition `<table>_yYYYYmMM` holds [first of month, first of next month); `<table>_default`
+catches anything outside the pre-created months. Detached partitions move to the
+`archive` schema instead of being dropped.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+ARCHIVE_SCHEMA = "archive"
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: datetime | None  # None: default partition
+    end: datetime | None
+
+
+def month_start(d: date | datetime) -> date:
+    return date(d.year, d.month, 1)
+
+
+def add_months(d: date, n: int) -> date:
+    y, m = divmod(d.month - 1 + n, 12)
+    return date(d.year + y, m + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+def _bound(month: date) -> str:
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+def create_month_partition_sql(table: str, month: date) -> str:
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(table, month)}" PARTITION OF "{table}" '
+        f"FOR VALUES FROM ('{_bound(month)}') TO ('{_bound(add_months(month, 1))}')"
+    )
+
+
+def create_default_partition_sql(table: str) -> str:
+    return f'CREATE TABLE IF NOT EXISTS "{table}_default" PARTITION OF "{table}" DEFAULT'
+
+
+def month_range(first: date, last: date) -> Iterable[date]:
+    m = month_start(first)
+    while m <= last:
+        yield m
+        m = add_months(m, 1)
+
+
+def list_partitions(db: Session, table: str) -> list[Partition]:
+    """Attached partitions of `table`, oldest first (default partition last)."""
+    rows = db.execute(
+        text(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:table AS regclass)
+            """
+        ),
+        {"table": table},
+    ).all()
+    out = []
+    for name, bound in rows:
+        if bound == "DEFAULT":
+            out.append(Partition(name, None, None))
+            continue
+        # FOR VALUES FROM ('2026-10-01 00:00:00+00') TO ('2026-11-01 00:00:00+00')
+        lo, hi = bound.split("'")[1], bound.split("'")[3]
+        out.append(Partition(name, datetime.fromisoformat(lo), datetime.fromisoformat(hi)))
+    far = datetime.max.replace(tzinfo=timezone.utc)
+    return sorted(out, key=lambda p: p.start or far)
+
+
+def ensure_month_partitions(db: Session, table: str, *, through: date) -> list[str]:
+    """Create missing monthly partitions from the current month through `through`. No commit."""
+    existing = {p.name for p in list_partitions(db, table)}
+    today = datetime.now(timezone.utc).date()
+    created = []
+    for month in month_range(today, through):
+        name = partition_name(table, month)
+        if name not in existing:
+            db.execute(text(create_month_partition_sql(table, month)))
+            created.append(name)
+    return created
+
+
+def default_partition_rows(db: Session, table: str) -> int:
+    """Rows that fell outside every monthly partition (should stay 0)."""
+    return int(db.execute(text(f'SELECT count(*) FROM "{table}_default"')).scalar() or 0)
+
+
+def archive_partition(db: Session, table: str, partition: str) -> None:
+    """Detach a partition and move it to the archive schema. No commit."""
+    db.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{ARCHIVE_SCHEMA}"'))
+    db.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{partition}"'))
+    db.execute(text(f'ALTER TABLE "{partition}" SET SCHEMA "{ARCHIVE_SCHEMA}"'))
@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import configure_mappers, sessionmaker
 from app.core.config import settings
+from app.db.soft_delete import hide_soft_deleted
 
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
@@ -8,6 +9,32 @@ engine = create_engine(
     if settings.SQLALCHEMY_DATABASE_URI.startswith("sqlite")
     else {},
     pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
 )
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# soft-deleted rows are invisible to ORM reads unless a statement opts out
+event.listen(SessionLocal, "do_orm_execute", hide_soft_deleted)
+
+
+def warm_up() -> None:
+    """Resolve ORM mappers and open the pool's base connections before taking traffic."""
+    configure_mappers()
+    conns = [engine.connect() for _ in range(settings.DB_POOL_SIZE)]
+    try:
+        for c in conns:
+            c.execute(text("SELECT 1"))
+    finally:
+        for c in conns:
+            c.close()
+
+
+def check_ready() -> dict:
+    """Readiness probe: one round trip through the pool; raises when the DB is unreachable."""
+    with engine.connect() as c:
+        c.execute(text("SELECT 1"))
+    pool = engine.pool
+    return {"size": pool.size(), "checked_out": pool.checkedout(), "overflow": pool.overflow()}
@@ -0,0 +1,46 @@
+# app/db/soft_delete.py
+"""
+Global soft-delete filter. Every ORM SELECT run through the app's sessions gets
+`deleted_at IS NULL` for each SoftDeleteMixin entity it touches (joins and subqueries
+included, and Session.get), so repositories no longer repeat the condition and the
+partial `WHERE deleted_at IS NULL` indexes always match.
+
+Opt out per statement where deleted rows are wanted (admin views, restores, uniqueness
+lookups, history such as the stock ledger):
+
+    db.execute(stmt, execution_options=WITH_DELETED)
+    db.get(Review, review_id, execution_options=WITH_DELETED)
+    stmt.execution_options(**WITH_DELETED)
+
+Relationship loads and attribute refreshes are left alone: navigating from a live row to
+a deleted one (cart line -> variant, review -> user) keeps working as before. Core
+statements, INSERT ... SELECT and bulk UPDATE/DELETE are not filtered either; those keep
+their explicit conditions.
+"""
+from __future__ import annotations
+from typing import Any
+
+from sqlalchemy.orm import ORMExecuteState, with_loader_criteria
+
+from app.db.mixins import SoftDeleteMixin
+
+INCLUDE_DELETED = "include_deleted"
+WITH_DELETED: dict[str, Any] = {INCLUDE_DELETED: True}
+
+
+def hide_soft_deleted(state: ORMExecuteState) -> None:
+    """do_orm_execute hook (see app/db/session.py)."""
+    if (
+        state.is_select
+        and not state.is_column_load
+        and not state.is_relationship_load
+        and not state.execution_options.get(INCLUDE_DELETED, False)
+    ):
+        state.statement = state.statement.options(
+            with_loader_criteria(
+                SoftDeleteMixin,
+                lambda cls: cls.deleted_at.is_(None),
+                include_aliases=True,
+                propagate_to_loaders=False,
+            )
+        )
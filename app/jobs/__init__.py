@@ -0,0 +1,5 @@
+from app.jobs.base import Job, JobContext, JobMetrics
+from app.jobs.registry import default_jobs
+from app.jobs.scheduler import Scheduler
+
+__all__ = ["Job", "JobContext", "JobMetrics", "Scheduler", "default_jobs"]
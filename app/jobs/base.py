@@ -0,0 +1,56 @@
+# app/jobs/base.py
+from __future__ import annotations
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+
+@dataclass
+class JobContext:
+    """Handed to every job run. Jobs should commit per batch and stop when `should_stop()`."""
+    db: Session
+    batch_size: int
+    deadline: float                 # time.monotonic() value
+    stop_event: threading.Event     # scheduler shutdown
+    cancel_event: threading.Event = field(default_factory=threading.Event)  # this run timed out
+
+    def time_left(self) -> float:
+        return self.deadline - time.monotonic()
+
+    def should_stop(self) -> bool:
+        return self.stop_event.is_set() or self.cancel_event.is_set() or self.time_left() <= 0
+
+
+@dataclass
+class JobMetrics:
+    runs: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    skipped_not_leader: int = 0
+    total_processed: int = 0
+    last_started_at: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    last_processed: Optional[int] = None
+    last_error: Optional[str] = None
+
+
+@dataclass
+class Job:
+    """
+    A periodic maintenance task. `func(ctx)` returns the number of rows it processed.
+    Only one node runs a given job at a time (Postgres advisory lock on `lock_name`).
+    """
+    name: str
+    func: Callable[[JobContext], int]
+    interval_seconds: float
+    timeout_seconds: float = 60.0
+    batch_size: int = 500
+    metrics: JobMetrics = field(default_factory=JobMetrics)
+
+    @property
+    def lock_name(self) -> str:
+        return f"job:{self.name}"
@@ -0,0 +1,84 @@
+# app/jobs/registry.py
+from __future__ import annotations
+
+from app.core.config import settings
+from app.jobs.base import Job
+from app.jobs import tasks
+
+
+def default_jobs() -> list[Job]:
+    """Every periodic job the API/worker processes run. Add new maintenance tasks here."""
+    return [
+        Job(
+            name="reservations.expire",
+            func=tasks.expire_reservations,
+            interval_seconds=settings.JOB_RESERVATION_EXPIRY_INTERVAL_SECONDS,
+            timeout_seconds=60,
+        ),
+        Job(
+            name="carts.abandon",
+            func=tasks.abandon_idle_carts,
+            interval_seconds=settings.JOB_CART_ABANDON_INTERVAL_SECONDS,
+            timeout_seconds=120,
+        ),
+        Job(
+            name="outbox.relay",
+            func=tasks.relay_outbox,
+            interval_seconds=settings.JOB_OUTBOX_RELAY_INTERVAL_SECONDS,
+            timeout_seconds=60,
+            batch_size=100,
+        ),
+        Job(
+            name="payments.callbacks",
+            func=tasks.process_payment_callbacks,
+            interval_seconds=settings.JOB_PAYMENT_CALLBACKS_INTERVAL_SECONDS,
+            timeout_seconds=120,
+            batch_size=settings.PAYMENT_CALLBACK_BATCH_SIZE,
+        ),
+        Job(
+            name="outbox.purge",
+            func=tasks.purge_outbox,
+            interval_seconds=3600,
+            timeout_seconds=300,
+            batch_size=5000,
+        ),
+        Job(
+            name="reports.refresh",
+            func=tasks.refresh_sales_rollups,
+            interval_seconds=settings.JOB_REPORTS_REFRESH_INTERVAL_SECONDS,
+            timeout_seconds=600,
+            batch_size=5,
+        ),
+        Job(
+            name="inventory.snapshot",
+            func=tasks.snapshot_inventory,
+            interval_seconds=settings.JOB_INVENTORY_SNAPSHOT_INTERVAL_SECONDS,
+            timeout_seconds=900,
+            batch_size=1000,
+        ),
+        Job(
+            name="feeds.refresh",
+            func=tasks.refresh_feeds,
+            interval_seconds=settings.JOB_FEEDS_REFRESH_INTERVAL_SECONDS,
+            timeout_seconds=600,
+        ),
+        Job(
+            name="products.related",
+            func=tasks.rebuild_related_products,
+            interval_seconds=settings.JOB_RELATED_PRODUCTS_INTERVAL_SECONDS,
+            timeout_seconds=1800,
+        ),
+        Job(
+            name="users.stats_rebuild",
+            func=tasks.rebuild_user_stats,
+            interval_seconds=settings.JOB_USER_STATS_REBUILD_INTERVAL_SECONDS,
+            timeout_seconds=1800,
+            batch_size=1000,
+        ),
+        Job(
+            name="partitions.maintain",
+            func=tasks.maintain_partitions,
+            interval_seconds=21600,
+            timeout_seconds=300,
+        ),
+    ]
@@ -0,0 +1,132 @@
+# app/jobs/scheduler.py
+from __future__ import annotations
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.locks import advisory_locked_connection
+from app.db.session import SessionLocal, engine as default_engine
+from app.jobs.base import Job, JobContext
+
+log = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """
+    In-process periodic runner. Each job gets its own asyncio loop; the job body runs in a
+    worker thread under a Postgres advisory lock, so with N API workers/nodes (plus any
+    standalone worker) exactly one of them executes a given job at a time. A job's session runs
+    on the connection holding its lock, and at most JOBS_MAX_CONCURRENT jobs run at once, so
+    the scheduler takes no more than that many connections from the request pool.
+    """
+    def __init__(
+        self,
+        jobs: Iterable[Job],
+        *,
+        engine: Engine = default_engine,
+        session_factory: sessionmaker[Session] = SessionLocal,
+    ) -> None:
+        self.jobs: dict[str, Job] = {j.name: j for j in jobs}
+        self.engine = engine
+        self.session_factory = session_factory
+        self._stop = threading.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._slots = asyncio.Semaphore(settings.JOBS_MAX_CONCURRENT)
+
+    # ---------- lifecycle ----------
+    async def start(self) -> None:
+        self._stop.clear()
+        for job in self.jobs.values():
+            self._tasks.append(asyncio.create_task(self._loop(job), name=f"job:{job.name}"))
+        log.info("Scheduler started (%s)", ", ".join(self.jobs) or "no jobs")
+
+    async def stop(self) -> None:
+        self._stop.set()  # running job bodies see ctx.should_stop() and wind down
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        log.info("Scheduler stopped")
+
+    async def _loop(self, job: Job) -> None:
+        # spread first runs so nodes booting together don't stampede
+        await asyncio.sleep(random.uniform(0, min(job.interval_seconds, 5.0)))
+        while not self._stop.is_set():
+            await self.run_once(job)
+            await asyncio.sleep(job.interval_seconds * random.uniform(0.9, 1.1))
+
+    # ---------- execution ----------
+    async def run_once(self, job: Job) -> None:
+        async with self._slots:
+            cancel = threading.Event()
+            work = asyncio.ensure_future(asyncio.to_thread(self.run_sync, job, cancel))
+            try:
+                await asyncio.wait_for(asyncio.shield(work), timeout=job.timeout_seconds)
+            except asyncio.TimeoutError:
+                job.metrics.timeouts += 1
+                log.warning("Job %s exceeded %.0fs timeout", job.name, job.timeout_seconds)
+                # a thread can't be killed: ask the body to stop at its next batch boundary and
+                # keep the slot (and its connection) accounted for until it has returned
+                cancel.set()
+                await work
+
+    def run_sync(self, job: Job, cancel: Optional[threading.Event] = None) -> bool:
+        """Run one iteration if we win the advisory lock. Returns False when another node holds it."""
+        with advisory_locked_connection(job.lock_name, engine=self.engine) as conn:
+            if conn is None:
+                job.metrics.skipped_not_leader += 1
+                return False
+            self._execute(job, conn, cancel or threading.Event())
+        return True
+
+    def _execute(self, job: Job, conn: Connection, cancel: threading.Event) -> None:
+        m = job.metrics
+        m.runs += 1
+        m.last_started_at = datetime.now(timezone.utc)
+        started = time.monotonic()
+        db = self.session_factory(bind=conn)
+        timeout_ms = int(job.timeout_seconds * 1000)
+
+        @event.listens_for(db, "after_begin")
+        def _statement_timeout(session, transaction, connection):
+            connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+        ctx = JobContext(
+            db=db,
+            batch_size=job.batch_size,
+            deadline=started + job.timeout_seconds,
+            stop_event=self._stop,
+            cancel_event=cancel,
+        )
+        try:
+            processed = int(job.func(ctx) or 0)
+            m.last_processed = processed
+            m.total_processed += processed
+            m.last_error = None
+            if processed:
+                log.info("Job %s processed %d rows", job.name, processed)
+        except Exception as e:
+            db.rollback()
+            m.failures += 1
+            m.last_error = f"{type(e).__name__}: {e}"[:500]
+            log.exception("Job %s failed", job.name)
+        finally:
+            db.close()
+            m.last_duration_ms = round((time.monotonic() - started) * 1000, 1)
+
+    # ---------- introspection ----------
+    def snapshot(self) -> list[dict]:
+        return [
+            {"name": j.name, "interval_seconds": j.interval_seconds, "timeout_seconds": j.timeout_seconds, **asdict(j.metrics)}
+            for j in self.jobs.values()
+        ]
@@ -0,0 +1,130 @@
+# app/jobs/tasks.py
+from __future__ import annotations
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.jobs.base import JobContext
+from app.outbox.relay import OutboxRelay
+from app.payments.processor import PaymentCallbackProcessor
+from app.services.cart_service import CartService
+from app.services.reservation_service import ReservationService
+from app.services.admin.report_service import AdminReportService
+from app.services.admin.inventory_service import AdminInventoryService
+from app.services.admin.user_service import AdminUserService
+from app.services.feed_service import FeedService
+from app.services.related_service import RelatedService
+
+
+def expire_reservations(ctx: JobContext) -> int:
+    """Release cart stock holds whose TTL has passed."""
+    svc = ReservationService(ctx.db)
+    total = 0
+    while not ctx.should_stop():
+        n = svc.expire_stale(batch_size=ctx.batch_size, max_batches=1)
+        total += n
+        if n < ctx.batch_size:
+            break
+    return total
+
+
+def abandon_idle_carts(ctx: JobContext) -> int:
+    """Flip open carts with no recent activity to `abandoned` and free their holds."""
+    svc = CartService(ctx.db)
+    idle_for = timedelta(hours=settings.CART_ABANDON_AFTER_HOURS)
+    total = 0
+    while not ctx.should_stop():
+        n = svc.abandon_idle_batch(idle_for, ctx.batch_size)
+        total += n
+        if n < ctx.batch_size:
+            break
+    return total
+
+
+def relay_outbox(ctx: JobContext) -> int:
+    """Deliver pending outbox events to their local handlers."""
+    relay = OutboxRelay(ctx.db)
+    total = 0
+    while not ctx.should_stop():
+        n = relay.relay_batch(ctx.batch_size)
+        total += n
+        if n < ctx.batch_size:
+            break
+    return total
+
+
+def purge_outbox(ctx: JobContext) -> int:
+    """Delete delivered outbox rows past retention."""
+    relay = OutboxRelay(ctx.db)
+    total = 0
+    while not ctx.should_stop():
+        n = relay.purge_processed(batch_size=ctx.batch_size)
+        total += n
+        if n < ctx.batch_size:
+            break
+    return total
+
+
+def refresh_sales_rollups(ctx: JobContext) -> int:
+    """Recompute sales rollups for days queued by order events or backfills."""
+    svc = AdminReportService(ctx.db)
+    total = 0
+    while not ctx.should_stop():
+        n = svc.refresh_dirty(batch_size=ctx.batch_size)
+        total += n
+        if n < ctx.batch_size:
+            break
+    return total
+
+
+def snapshot_inventory(ctx: JobContext) -> int:
+    """Write ledger balance snapshots for variants that moved since their last snapshot."""
+    svc = AdminInventoryService(ctx.db)
+    # lag behind now so transactions still in flight at as_of have committed
+    as_of = datetime.now(timezone.utc) - timedelta(minutes=settings.INVENTORY_SNAPSHOT_LAG_MINUTES)
+    after = total = 0
+    while not ctx.should_stop():
+        n, after = svc.snapshot_batch(as_of, after_variant_id=after, batch_size=ctx.batch_size)
+        total += n
+        if n < ctx.batch_size:
+            break
+    return total
+
+
+def maintain_partitions(ctx: JobContext) -> int:
+    """Pre-create upcoming monthly ledger partitions and archive expired ones."""
+    created, archived = AdminInventoryService(ctx.db).maintain_partitions()
+    return len(created) + len(archived)
+
+
+def process_payment_callbacks(ctx: JobContext) -> int:
+    """Apply stored gateway callbacks to payments and orders."""
+    processor = PaymentCallbackProcessor(ctx.db)
+    total = 0
+    while not ctx.should_stop():
+        n = processor.process_batch(ctx.batch_size)
+        total += n
+        if n < ctx.batch_size:
+            break
+    return total
+
+
+def rebuild_user_stats(ctx: JobContext) -> int:
+    """Recompute user_stats for every user (repairs drift, backfills new columns)."""
+    svc = AdminUserService(ctx.db)
+    after = total = 0
+    while not ctx.should_stop():
+        n, after = svc.rebuild_stats_batch(after_user_id=after, batch_size=ctx.batch_size)
+        total += n
+        if n < ctx.batch_size:
+            break
+    return total
+
+
+def refresh_feeds(ctx: JobContext) -> int:
+    """Recompute the ranked product lists behind /feeds (bestsellers, new arrivals, top rated)."""
+    return FeedService(ctx.db).refresh_all(ctx.should_stop)
+
+
+def rebuild_related_products(ctx: JobContext) -> int:
+    """Recompute the "also bought" and "similar" lists behind /products/{id}/related."""
+    return RelatedService(ctx.db).rebuild(ctx.should_stop)
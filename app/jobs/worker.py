@@ -0,0 +1,37 @@
+# app/jobs/worker.py
+"""
+Standalone job worker: `python -m app.jobs.worker`.
+Runs the same jobs as the in-process scheduler; advisory locks keep the two from overlapping,
+so API processes can run with JOBS_ENABLED=false and leave maintenance to this process.
+"""
+from __future__ import annotations
+import asyncio
+import signal
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.jobs.registry import default_jobs
+from app.jobs.scheduler import Scheduler
+
+
+async def run() -> None:
+    scheduler = Scheduler(default_jobs())
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await scheduler.start()
+    try:
+        await stop.wait()
+    finally:
+        await scheduler.stop()
+
+
+def main() -> None:
+    setup_logging(settings.LOG_LEVEL)
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
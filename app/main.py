@@ -1,20 +1,42 @@
 from __future__ import annotations
+import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+import anyio
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.core.cache import get_cache
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.db import session as db_session
+from app.api.admission import AdmissionControlMiddleware
 from app.api.error_handlers import register_exception_handlers
 from app.api.v1.router import api_router
+from app.jobs import Scheduler, default_jobs
+
+log = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # ---- startup ----
     setup_logging('INFO')
+    app.state.ready = False
+    # warm before the worker accepts connections: mappers, pool connections, cache client
+    await anyio.to_thread.run_sync(db_session.warm_up)
+    get_cache()
+    scheduler = Scheduler(default_jobs()) if settings.JOBS_ENABLED else None
+    if scheduler:
+        await scheduler.start()
+    app.state.scheduler = scheduler
+    app.state.ready = True
     yield
-    # ---- shutdown ----
+    # ---- shutdown ---- (uvicorn has already drained in-flight requests)
+    app.state.ready = False
+    if scheduler:
+        await scheduler.stop()
+    db_session.engine.dispose()
 
 def create_app() -> FastAPI:
     app = FastAPI(
@@ -23,6 +45,9 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
+    # Rate limits / load shedding (added first so CORS headers wrap its 429/503s)
+    app.add_middleware(AdmissionControlMiddleware)
+
     # CORS
     app.add_middleware(
         CORSMiddleware,
@@ -35,11 +60,24 @@ def create_app() -> FastAPI:
     register_exception_handlers(app)
     app.include_router(api_router, prefix=f"/{settings.API_PREFIX}/{settings.API_VERSION}")
 
-    # Basic health endpoint
+    # Liveness: the process answers (restart it if not). Kept at /healthz for old probes.
     @app.get("/healthz", tags=["_ops"])
-    def healthz():
+    @app.get("/healthz/live", tags=["_ops"])
+    async def healthz_live():
         return {"status": "ok"}
 
+    # Readiness: warmed up and the DB answers through the pool (route traffic here if so).
+    @app.get("/healthz/ready", tags=["_ops"])
+    def healthz_ready(request: Request):
+        if not getattr(request.app.state, "ready", False):
+            return JSONResponse({"status": "starting"}, status_code=503)
+        try:
+            pool = db_session.check_ready()
+        except Exception as e:
+            log.warning("readiness check failed: %s", e)
+            return JSONResponse({"status": "unavailable", "detail": "database unreachable"}, status_code=503)
+        return {"status": "ok", "db_pool": pool}
+
     return app
 
 
@@ -9,3 +9,10 @@ from .payment import *   # noqa
 from .shipment import *  # noqa
 from .inventory import * # noqa
 from .returns import *   # noqa
+from .outbox import *   # noqa
+from .report import *   # noqa
+from .catalog_import import * # noqa
+from .reconciliation import * # noqa
+from .user_stats import * # noqa
+from .feed import * # noqa
+from .recommendation import * # noqa
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import Optional, List
 
-from sqlalchemy import String, Boolean
+from sqlalchemy import String, Boolean, Index
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -58,6 +58,13 @@ class User(Base, TimestampMixin, SoftDeleteMixin):
         back_populates="user",
     )
 
+    __table_args__ = (
+        # Admin user list: newest first, optionally by role. Not partial: the admin list
+        # includes soft-deleted users by default.
+        Index("ix_users_created_id", "created_at", "id"),
+        Index("ix_users_role_created_id", "role", "created_at", "id"),
+    )
+
     # Helpful for debugging
     def __repr__(self) -> str:
         return f"<User id={self.id} email={self.email!r} role={self.role} active={self.is_active} deleted={self.deleted_at is not None}>"
@@ -59,6 +59,12 @@ class Cart(Base, TimestampMixin, SoftDeleteMixin):
             sqlite_where=text("status = 'open' AND deleted_at IS NULL"),
             postgresql_where=text("status = 'open' AND deleted_at IS NULL"),
         ),
+        # abandonment sweep: oldest idle open carts first
+        Index(
+            "ix_carts_open_updated",
+            "updated_at",
+            postgresql_where=text("status = 'open' AND deleted_at IS NULL"),
+        ),
     )
 
     def __repr__(self) -> str:
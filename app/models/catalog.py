@@ -10,8 +10,11 @@ from sqlalchemy import (
     ForeignKey,
     UniqueConstraint,
     CheckConstraint,
+    Index,
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import text
 
 from app.db.base import Base
 from app.db.mixins import TimestampMixin, SoftDeleteMixin
@@ -77,6 +80,14 @@ class Product(Base, TimestampMixin, SoftDeleteMixin):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     is_archived: Mapped[bool] = mapped_column(Boolean, default=False, index=True, nullable=False)
 
+    # Listing denormalization over live variants (effective price = variant price or base price).
+    # Prices/total recomputed by ProductRepository.refresh_listing on variant/product writes;
+    # stock deltas from the ledger are applied at commit (see queue_product_stock).
+    min_price_cents: Mapped[Optional[int]] = mapped_column(Integer)
+    max_price_cents: Mapped[Optional[int]] = mapped_column(Integer)
+    total_stock: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
+    in_stock: Mapped[bool] = mapped_column(Boolean, default=False, server_default=text("false"), nullable=False)  # a live variant has stock_qty > reserved_qty
+
     brand: Mapped[Optional["Brand"]] = relationship(back_populates="products")
 
     variants: Mapped[List["ProductVariant"]] = relationship(
@@ -98,6 +109,17 @@ class Product(Base, TimestampMixin, SoftDeleteMixin):
 
     __table_args__ = (
         CheckConstraint("base_price_cents >= 0", name="ck_product_price_nonneg"),
+        # Listing filters / sorts: price range overlap and in-stock.
+        Index("ix_products_min_price", "min_price_cents"),
+        Index("ix_products_max_price", "max_price_cents"),
+        Index("ix_products_in_stock_created", "in_stock", "created_at"),
+        # Default list order (created_at DESC, id DESC) over live rows: admin, storefront, per brand.
+        Index("ix_products_live_created", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index(
+            "ix_products_storefront_created", "created_at", "id",
+            postgresql_where=text("deleted_at IS NULL AND is_active AND NOT is_archived"),
+        ),
+        Index("ix_products_brand_created", "brand_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
     )
 
     def __repr__(self) -> str:
@@ -119,6 +141,8 @@ class ProductVariant(Base, TimestampMixin, SoftDeleteMixin):
     size: Mapped[Optional[str]] = mapped_column(String(32))
 
     stock_qty: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # sum of live cart reservations (see StockReservation); available = stock - reserved
+    reserved_qty: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
     price_cents: Mapped[Optional[int]] = mapped_column(Integer)
     image_url: Mapped[Optional[str]] = mapped_column(String(500))
 
@@ -127,9 +151,21 @@ class ProductVariant(Base, TimestampMixin, SoftDeleteMixin):
     __table_args__ = (
         UniqueConstraint("product_id", "color", "size", name="uq_variant_product_color_size"),
         CheckConstraint("stock_qty >= 0", name="ck_variant_stock_nonneg"),
+        CheckConstraint("reserved_qty >= 0", name="ck_variant_reserved_nonneg"),
         CheckConstraint("price_cents IS NULL OR price_cents >= 0", name="ck_variant_price_nonneg"),
+        # Live variants of a product, newest first: variant lists and listing price/stock recompute.
+        Index("ix_product_variants_live_product", "product_id", "created_at", postgresql_where=text("deleted_at IS NULL")),
     )
 
+    @hybrid_property
+    def available_qty(self) -> int:
+        return (self.stock_qty or 0) - (self.reserved_qty or 0)
+
+    @available_qty.inplace.expression
+    @classmethod
+    def _available_qty_expression(cls):
+        return cls.stock_qty - cls.reserved_qty
+
     def __repr__(self) -> str:
         return f"<Variant id={self.id} sku={self.sku!r} stock={self.stock_qty}>"
 
@@ -149,6 +185,11 @@ class ProductImage(Base, TimestampMixin):
 
     product: Mapped["Product"] = relationship(back_populates="images")
 
+    __table_args__ = (
+        # one row per (product, url); lets bulk imports upsert images
+        UniqueConstraint("product_id", "url", name="uq_product_image_url"),
+    )
+
     def __repr__(self) -> str:
         return f"<ProductImage id={self.id} product_id={self.product_id} primary={self.is_primary}>"
 
@@ -0,0 +1,71 @@
+# app/models/catalog_import.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+from app.db.mixins import TimestampMixin
+from app.db.enums import ImportStatusEnum
+
+
+class CatalogImport(Base, TimestampMixin):
+    """
+    One bulk catalog import run over a CSV/JSONL file.
+    `rows_processed` advances with every committed chunk, so a failed or interrupted
+    run resumes from the first uncommitted row.
+    """
+    __tablename__ = "catalog_imports"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    path: Mapped[str] = mapped_column(String(1000), nullable=False)
+    format: Mapped[str] = mapped_column(String(10), nullable=False)  # csv | jsonl
+
+    status: Mapped[ImportStatusEnum] = mapped_column(
+        SAEnum(ImportStatusEnum, name="import_status", native_enum=False, validate_strings=True),
+        default=ImportStatusEnum.pending,
+        index=True,
+        nullable=False,
+    )
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rows_ok: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    rows_failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    errors: Mapped[List["CatalogImportError"]] = relationship(
+        back_populates="catalog_import",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<CatalogImport id={self.id} {self.filename!r} status={self.status} rows={self.rows_processed}>"
+
+
+class CatalogImportError(Base):
+    """A rejected input row (validation or database error)."""
+    __tablename__ = "catalog_import_errors"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    import_id: Mapped[int] = mapped_column(
+        ForeignKey("catalog_imports.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    row_number: Mapped[int] = mapped_column(Integer, nullable=False)  # 1-based data row
+    sku: Mapped[Optional[str]] = mapped_column(String(64))
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+
+    catalog_import: Mapped["CatalogImport"] = relationship(back_populates="errors")
+
+    __table_args__ = (
+        Index("ix_catalog_import_errors_import_row", "import_id", "row_number"),
+    )
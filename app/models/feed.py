@@ -0,0 +1,35 @@
+# app/models/feed.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import Integer, String, DateTime, func
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.db.enums import FeedKindEnum
+
+
+class ProductFeed(Base):
+    """
+    A precomputed, ranked product-id list (home page rails), one row per kind and scope.
+    Written by the feeds.refresh job; endpoints read one row by primary key and hydrate
+    the ids, so their cost does not depend on order history.
+    """
+    __tablename__ = "product_feeds"
+
+    kind: Mapped[FeedKindEnum] = mapped_column(
+        SAEnum(FeedKindEnum, name="feed_kind", native_enum=False, validate_strings=True),
+        primary_key=True,
+    )
+    scope: Mapped[str] = mapped_column(String(16), primary_key=True)   # global | category | brand
+    scope_id: Mapped[int] = mapped_column(Integer, primary_key=True)   # 0 for global
+
+    product_ids: Mapped[List[int]] = mapped_column(ARRAY(Integer), nullable=False)  # best first
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ProductFeed {self.kind.value}:{self.scope}:{self.scope_id} n={len(self.product_ids)}>"
@@ -1,9 +1,10 @@
 # app/models/inventory.py
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Integer, String, ForeignKey, CheckConstraint, Index
+from sqlalchemy import Integer, String, DateTime, ForeignKey, CheckConstraint, Index, func
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -16,16 +17,26 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from app.models.order import Order
     from app.models.catalog import ProductVariant
+    from app.models.cart import CartItem
 
 class InventoryMovement(Base, TimestampMixin):
     """
     Immutable inventory ledger row. Prefer *appending* new rows over editing past rows.
     Use qty_delta > 0 for inflows (stock_in, return_in, cancel_adjust, manual_adjust+),
     and qty_delta < 0 for outflows (reserve, sold, manual_adjust-, etc.).
+
+    Range-partitioned by month on created_at (see app/db/partitions.py); the partition
+    key has to be part of the primary key. Filter on created_at to get partition pruning.
     """
     __tablename__ = "inventory_movements"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        nullable=False,
+    )
 
     variant_id: Mapped[int] = mapped_column(
         ForeignKey("product_variants.id", ondelete="CASCADE"),
@@ -55,6 +66,7 @@ class InventoryMovement(Base, TimestampMixin):
         CheckConstraint("qty_delta <> 0", name="ck_inventory_qty_nonzero"),
         # Common read pattern: per-variant chronological scans.
         Index("ix_inventory_variant_created", "variant_id", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
     )
 
     # Convenience flags
@@ -68,3 +80,64 @@ class InventoryMovement(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<InvMove id={self.id} variant_id={self.variant_id} delta={self.qty_delta} reason={self.reason}>"
+
+
+class StockReservation(Base, TimestampMixin):
+    """
+    Time-limited hold of stock for one cart line.
+    `ProductVariant.reserved_qty` is the running sum of these rows; every write here
+    adjusts it in the same transaction. Expired rows are released in bulk by the sweeper.
+    """
+    __tablename__ = "stock_reservations"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    cart_item_id: Mapped[int] = mapped_column(
+        ForeignKey("cart_items.id", ondelete="CASCADE"),
+        unique=True,
+        nullable=False,
+    )
+    cart_id: Mapped[int] = mapped_column(
+        ForeignKey("carts.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+    variant_id: Mapped[int] = mapped_column(
+        ForeignKey("product_variants.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False,
+    )
+
+    qty: Mapped[int] = mapped_column(Integer, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    cart_item: Mapped["CartItem"] = relationship()  # from app/models/cart.py
+
+    __table_args__ = (
+        CheckConstraint("qty > 0", name="ck_reservation_qty_pos"),
+        # Sweeper scans oldest-expiring first.
+        Index("ix_stock_reservations_expires", "expires_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<Reservation id={self.id} cart_item_id={self.cart_item_id} variant_id={self.variant_id} qty={self.qty}>"
+
+
+class InventorySnapshot(Base):
+    """
+    Ledger balance of one variant as of `as_of`: the sum of every movement with
+    created_at < as_of. Written periodically by the `inventory.snapshot` job (only for
+    variants that moved since their previous snapshot), so point-in-time and
+    reconciliation reads add a bounded tail of movements to the nearest snapshot.
+    """
+    __tablename__ = "inventory_snapshots"
+
+    variant_id: Mapped[int] = mapped_column(
+        ForeignKey("product_variants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    as_of: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    balance: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<InvSnapshot variant_id={self.variant_id} as_of={self.as_of:%Y-%m-%d %H:%M} balance={self.balance}>"
@@ -10,9 +10,11 @@ from sqlalchemy import (
     ForeignKey,
     CheckConstraint,
     Index,
+    Sequence,
 )
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import text
 
 from app.db.base import Base
 from app.db.mixins import TimestampMixin, SoftDeleteMixin
@@ -24,6 +26,12 @@ if TYPE_CHECKING:
     from app.models.auth import User
     from app.models.payment import Payment
     from app.models.shipment import Shipment
+    from app.models.returns import ReturnRequest
+
+# Order numbers are allocated in blocks (hi/lo): each nextval() hands a process
+# ORDER_NUMBER_BLOCK consecutive numbers. Keep in sync with the migration.
+ORDER_NUMBER_BLOCK = 100
+order_number_seq = Sequence("order_number_seq", start=1, increment=ORDER_NUMBER_BLOCK, metadata=Base.metadata)
 
 class Order(Base, TimestampMixin, SoftDeleteMixin):
     """
@@ -34,7 +42,7 @@ class Order(Base, TimestampMixin, SoftDeleteMixin):
     __tablename__ = "orders"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    order_number: Mapped[str] = mapped_column(String(30), unique=True, index=True, nullable=False)  # e.g., FS-20251015-0001
+    order_number: Mapped[str] = mapped_column(String(30), unique=True, index=True, nullable=False)  # e.g., FS-20251015-00000101
 
     user_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("users.id", ondelete="SET NULL"),
@@ -85,6 +93,10 @@ class Order(Base, TimestampMixin, SoftDeleteMixin):
         uselist=False,
         cascade="all, delete-orphan",
     )
+    returns: Mapped[List["ReturnRequest"]] = relationship(  # defined in app/models/returns.py; read-only side
+        viewonly=True,
+        order_by="ReturnRequest.id",
+    )
 
     __table_args__ = (
         CheckConstraint("subtotal_cents >= 0", name="ck_order_subtotal_nonneg"),
@@ -92,6 +104,14 @@ class Order(Base, TimestampMixin, SoftDeleteMixin):
         CheckConstraint("discount_cents >= 0", name="ck_order_discount_nonneg"),
         CheckConstraint("total_cents >= 0", name="ck_order_total_nonneg"),
         Index("ix_orders_user_status_created", "user_id", "status", "created_at"),
+        # Reporting: transitions by time (sales rollup refresh).
+        Index("ix_orders_created_at", "created_at"),
+        Index("ix_orders_paid_at", "paid_at", postgresql_where=text("paid_at IS NOT NULL")),
+        Index("ix_orders_cancelled_at", "cancelled_at", postgresql_where=text("cancelled_at IS NOT NULL")),
+        # List order (created_at DESC, id DESC) over live orders: admin, per customer, per status.
+        Index("ix_orders_live_created", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_orders_user_created", "user_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
+        Index("ix_orders_status_created", "status", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,57 @@
+# app/models/outbox.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import BigInteger, Integer, String, Text, DateTime, Index, func
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import text
+
+from app.db.base import Base
+from app.db.enums import OutboxStatusEnum
+
+
+class OutboxEvent(Base):
+    """
+    Domain event written in the same transaction as the state change it describes.
+    The relay (app/outbox/relay.py) delivers pending rows to local handlers, at least once,
+    in id order per (aggregate_type, aggregate_id).
+    """
+    __tablename__ = "outbox_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    aggregate_type: Mapped[str] = mapped_column(String(50), nullable=False)
+    aggregate_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+
+    status: Mapped[OutboxStatusEnum] = mapped_column(
+        SAEnum(OutboxStatusEnum, name="outbox_status", native_enum=False, validate_strings=True),
+        default=OutboxStatusEnum.pending,
+        server_default=OutboxStatusEnum.pending.value,
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        # Relay scan + "is there an older pending event for this aggregate?" probe.
+        Index(
+            "ix_outbox_pending_aggregate",
+            "aggregate_type", "aggregate_id", "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # Housekeeping of delivered rows.
+        Index("ix_outbox_processed_at", "processed_at"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent id={self.id} {self.event_type} {self.aggregate_type}:{self.aggregate_id} status={self.status}>"
@@ -1,15 +1,18 @@
 # app/models/payment.py
 from __future__ import annotations
 
-from typing import Optional
+from datetime import datetime
+from typing import Any, Optional
 
-from sqlalchemy import Integer, String, ForeignKey, CheckConstraint, Index
+from sqlalchemy import BigInteger, Integer, String, Text, DateTime, ForeignKey, CheckConstraint, Index, UniqueConstraint, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import text
 
 from app.db.base import Base
 from app.db.mixins import TimestampMixin
-from app.db.enums import PaymentStatusEnum, PaymentMethodEnum
+from app.db.enums import PaymentStatusEnum, PaymentMethodEnum, PaymentCallbackStatusEnum
 
 from typing import TYPE_CHECKING
 
@@ -56,7 +59,50 @@ class Payment(Base, TimestampMixin):
     __table_args__ = (
         CheckConstraint("amount_cents >= 0", name="ck_payment_amount_nonneg"),
         Index("ix_payments_order_created", "order_id", "created_at"),
+        # Reporting: refunds by time.
+        Index("ix_payments_refunded_created", "created_at", postgresql_where=text("status = 'refunded'")),
+        # Gateway transaction lookups (webhook dedupe, settlement matching).
+        Index("ix_payments_transaction_ref", "transaction_ref", postgresql_where=text("transaction_ref IS NOT NULL")),
     )
 
     def __repr__(self) -> str:
         return f"<Payment id={self.id} order_id={self.order_id} amount={self.amount_cents} status={self.status} method={self.method}>"
+
+
+class PaymentCallback(Base):
+    """
+    Inbox of verified gateway callbacks (webhooks), stored as received before any processing.
+    (provider, transaction_ref) is unique, so gateway retries are acknowledged without a second
+    row; app/payments/processor.py applies pending rows to payments and orders in batches.
+    """
+    __tablename__ = "payment_callbacks"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    provider: Mapped[str] = mapped_column(String(20), nullable=False)         # momo | zalopay | fake
+    transaction_ref: Mapped[str] = mapped_column(String(255), nullable=False)  # gateway transaction id
+    order_number: Mapped[str] = mapped_column(String(50), nullable=False)
+    amount_cents: Mapped[int] = mapped_column(Integer, nullable=False)
+    succeeded: Mapped[bool] = mapped_column(nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+
+    status: Mapped[PaymentCallbackStatusEnum] = mapped_column(
+        SAEnum(PaymentCallbackStatusEnum, name="payment_callback_status", native_enum=False, validate_strings=True),
+        default=PaymentCallbackStatusEnum.pending,
+        server_default=PaymentCallbackStatusEnum.pending.value,
+        nullable=False,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+
+    received_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        UniqueConstraint("provider", "transaction_ref"),
+        # Processor scan.
+        Index("ix_payment_callbacks_pending", "id", postgresql_where=text("status = 'pending'")),
+    )
+
+    def __repr__(self) -> str:
+        return f"<PaymentCallback id={self.id} {self.provider}:{self.transaction_ref} order={self.order_number} status={self.status}>"
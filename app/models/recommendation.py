@@ -0,0 +1,41 @@
+# app/models/recommendation.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import Integer, DateTime, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ProductRelated(Base):
+    """
+    Top-K neighbours of a product, best first, written by the products.related job:
+    `also_bought_ids` from order co-occurrence, `similar_ids` from shared categories, brand and
+    price band. Product pages read one row by primary key.
+    """
+    __tablename__ = "product_related"
+
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    also_bought_ids: Mapped[List[int]] = mapped_column(ARRAY(Integer), nullable=False, server_default="{}")
+    similar_ids: Mapped[List[int]] = mapped_column(ARRAY(Integer), nullable=False, server_default="{}")
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ProductRelated {self.product_id} bought={len(self.also_bought_ids)} similar={len(self.similar_ids)}>"
+
+
+class RecentlyViewed(Base):
+    """A user's last viewed products; one row per (user, product), trimmed to RECENTLY_VIEWED_MAX."""
+    __tablename__ = "recently_viewed"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    viewed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_recently_viewed_user_viewed", "user_id", "viewed_at"),
+    )
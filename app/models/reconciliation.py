@@ -0,0 +1,86 @@
+# app/models/reconciliation.py
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import BigInteger, Boolean, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.base import Base
+from app.db.mixins import TimestampMixin
+from app.db.enums import ImportStatusEnum, ReconcileMismatchEnum
+
+
+class PaymentReconciliation(Base, TimestampMixin):
+    """
+    One run of a gateway settlement file against `payments`. Counters cover the whole
+    file; each discrepancy is a PaymentReconciliationItem.
+    """
+    __tablename__ = "payment_reconciliations"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    provider: Mapped[str] = mapped_column(String(20), nullable=False)  # momo | zalopay | fake
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    path: Mapped[str] = mapped_column(String(1000), nullable=False)
+    format: Mapped[str] = mapped_column(String(10), nullable=False)  # csv | jsonl
+    # payments of the provider created in [period_from, period_to) must appear in the file
+    period_from: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    period_to: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    apply_fixes: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+    status: Mapped[ImportStatusEnum] = mapped_column(
+        SAEnum(ImportStatusEnum, name="import_status", native_enum=False, validate_strings=True),
+        default=ImportStatusEnum.pending,
+        index=True,
+        nullable=False,
+    )
+    rows_processed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    matched: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    mismatched: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    fixed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    items: Mapped[List["PaymentReconciliationItem"]] = relationship(
+        back_populates="reconciliation",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<PaymentReconciliation id={self.id} {self.provider} {self.filename!r} status={self.status}>"
+
+
+class PaymentReconciliationItem(Base):
+    """A settlement/payment discrepancy found by a run."""
+    __tablename__ = "payment_reconciliation_items"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    reconciliation_id: Mapped[int] = mapped_column(
+        ForeignKey("payment_reconciliations.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    kind: Mapped[ReconcileMismatchEnum] = mapped_column(
+        SAEnum(ReconcileMismatchEnum, name="reconcile_mismatch", native_enum=False, validate_strings=True),
+        nullable=False,
+    )
+    row_number: Mapped[Optional[int]] = mapped_column(Integer)  # None for unsettled payments
+    transaction_ref: Mapped[Optional[str]] = mapped_column(String(255))
+    order_number: Mapped[Optional[str]] = mapped_column(String(50))
+    payment_id: Mapped[Optional[int]] = mapped_column(Integer)
+    order_id: Mapped[Optional[int]] = mapped_column(Integer)
+    expected_cents: Mapped[Optional[int]] = mapped_column(Integer)  # what our records say
+    settled_cents: Mapped[Optional[int]] = mapped_column(Integer)   # what the gateway settled
+    fixed: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    note: Mapped[Optional[str]] = mapped_column(Text)
+
+    reconciliation: Mapped["PaymentReconciliation"] = relationship(back_populates="items")
+
+    __table_args__ = (
+        Index("ix_payment_reconciliation_items_run_kind", "reconciliation_id", "kind", "id"),
+    )
@@ -0,0 +1,76 @@
+# app/models/report.py
+from __future__ import annotations
+
+from datetime import date, datetime
+from typing import Optional
+
+from sqlalchemy import BigInteger, Integer, String, Date, DateTime, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class _SalesTotals:
+    """Per-bucket order counters. Each transition lands in the bucket of the time it happened."""
+    orders_placed: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    orders_paid: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    orders_cancelled: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    orders_refunded: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    gross_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")     # placed totals
+    revenue_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")   # paid totals
+    refunded_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    units_sold: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class SalesHourly(_SalesTotals, Base):
+    __tablename__ = "sales_hourly"
+
+    # start of the hour in REPORTS_TIMEZONE, stored as an instant
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+
+    def __repr__(self) -> str:
+        return f"<SalesHourly {self.bucket_start} paid={self.orders_paid} revenue={self.revenue_cents}>"
+
+
+class SalesDaily(_SalesTotals, Base):
+    __tablename__ = "sales_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)  # calendar day in REPORTS_TIMEZONE
+
+    def __repr__(self) -> str:
+        return f"<SalesDaily {self.day} paid={self.orders_paid} revenue={self.revenue_cents}>"
+
+
+class ProductSalesDaily(Base):
+    """
+    Units/revenue per SKU per day (paid_at day), with refunds on the refund day.
+    Keyed by the order-item SKU snapshot so history survives variant deletion;
+    product/brand ids are the catalog's values at refresh time (no FKs).
+    """
+    __tablename__ = "product_sales_daily"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    sku: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    variant_id: Mapped[Optional[int]] = mapped_column(Integer)
+    product_id: Mapped[Optional[int]] = mapped_column(Integer)
+    brand_id: Mapped[Optional[int]] = mapped_column(Integer)
+
+    units_sold: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    revenue_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    units_refunded: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+    refunded_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_product_sales_daily_product_day", "product_id", "day"),
+        Index("ix_product_sales_daily_brand_day", "brand_id", "day"),
+    )
+
+
+class SalesRollupDirty(Base):
+    """Days whose rollups must be recomputed (queued by order events and backfills)."""
+    __tablename__ = "sales_rollup_dirty"
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    queued_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -14,6 +14,7 @@ from sqlalchemy import (
     Index,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.sql import text
 
 from app.db.base import Base
 from app.db.mixins import TimestampMixin, SoftDeleteMixin
@@ -54,8 +55,14 @@ class Review(Base, TimestampMixin, SoftDeleteMixin):
         CheckConstraint("rating BETWEEN 1 AND 5", name="ck_review_rating_1_5"),
         UniqueConstraint("product_id", "user_id", name="uq_review_user_once"),
         Index("ix_reviews_product_created_at", "product_id", "created_at"),
-        Index("ix_reviews_user_created_at", "user_id", "created_at"),
+        # A user's live reviews, newest first (also the user_stats review count).
+        Index("ix_reviews_user_live_created", "user_id", "created_at", "id", postgresql_where=text("deleted_at IS NULL")),
         Index("ix_reviews_product_published", "product_id", "is_published"),
+        # Public product reviews page: published, live, newest first.
+        Index(
+            "ix_reviews_published_created", "product_id", "created_at", "id",
+            postgresql_where=text("is_published IS TRUE AND deleted_at IS NULL"),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,33 @@
+# app/models/user_stats.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Integer, DateTime, ForeignKey, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class UserStats(Base):
+    """
+    Per-user order/review counters for profile screens, read by primary key.
+    Recomputed for a user whenever their orders (order.* outbox events) or reviews change,
+    and rebuilt for everyone by the users.stats_rebuild job. Users with no row have no activity.
+    """
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    orders_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    orders_pending: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    orders_paid: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    orders_fulfilled: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    orders_cancelled: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    orders_refunded: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    lifetime_spend_cents: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, server_default="0")  # paid + fulfilled totals
+    reviews_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UserStats user={self.user_id} orders={self.orders_total} spend={self.lifetime_spend_cents}>"
@@ -0,0 +1,4 @@
+from app.outbox.registry import Handler, on, handlers_for
+from app.outbox import handlers as _builtin_handlers  # noqa: F401  (registers built-ins)
+
+__all__ = ["Handler", "on", "handlers_for"]
@@ -0,0 +1,33 @@
+# app/outbox/events.py
+"""Event names and payload builders shared by the services that emit them."""
+from __future__ import annotations
+from typing import Any
+
+from app.models.order import Order
+
+ORDER = "order"
+VARIANT = "variant"
+
+ORDER_PLACED = "order.placed"
+ORDER_PAID = "order.paid"
+ORDER_CANCELLED = "order.cancelled"
+ORDER_FULFILLED = "order.fulfilled"
+ORDER_REFUNDED = "order.refunded"
+
+STOCK_CHANGED = "variant.stock_changed"
+
+
+def order_payload(o: Order) -> dict[str, Any]:
+    return {
+        "order_number": o.order_number,
+        "user_id": o.user_id,
+        "status": o.status.value,
+        "total_cents": o.total_cents,
+        "currency": o.currency,
+        "paid_at": o.paid_at.isoformat() if o.paid_at else None,
+        "cancelled_at": o.cancelled_at.isoformat() if o.cancelled_at else None,
+        "items": [
+            {"product_id": it.product_id, "variant_id": it.variant_id, "qty": it.qty, "line_total_cents": it.line_total_cents}
+            for it in o.items
+        ],
+    }
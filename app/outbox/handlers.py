@@ -0,0 +1,42 @@
+# app/outbox/handlers.py
+"""Built-in local handlers. Feature modules register their own with `@on(...)`."""
+from __future__ import annotations
+import logging
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app.models.outbox import OutboxEvent
+from app.outbox import events
+from app.outbox.registry import on
+from app.repositories.report_repo import SalesReportRepository
+from app.repositories.user_stats_repo import UserStatsRepository
+from app.utils.dates import local_day
+
+log = logging.getLogger("app.outbox.events")
+
+
+@on("order.*")
+def log_order_event(db: Session, event: OutboxEvent) -> None:
+    log.info(
+        "%s order=%s number=%s total=%s",
+        event.event_type, event.aggregate_id, event.payload.get("order_number"), event.payload.get("total_cents"),
+    )
+
+
+@on(events.ORDER_PLACED, events.ORDER_PAID, events.ORDER_CANCELLED, events.ORDER_REFUNDED)
+def queue_sales_rollup(db: Session, event: OutboxEvent) -> None:
+    # the transition's bucket: event.created_at shares the transaction's now() with
+    # created_at / refund payments; paid_at / cancelled_at are app-side timestamps
+    days = {local_day(event.created_at)}
+    for key in ("paid_at", "cancelled_at"):
+        ts = event.payload.get(key)
+        if ts:
+            days.add(local_day(datetime.fromisoformat(ts)))
+    SalesReportRepository(db).mark_dirty(days)
+
+
+@on("order.*")
+def refresh_user_stats(db: Session, event: OutboxEvent) -> None:
+    # recomputed rather than incremented, so redelivery and reordering are harmless
+    UserStatsRepository(db).refresh([event.payload.get("user_id")])
@@ -0,0 +1,29 @@
+# app/outbox/registry.py
+from __future__ import annotations
+from collections import defaultdict
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from app.models.outbox import OutboxEvent
+
+Handler = Callable[[Session, OutboxEvent], None]
+
+_handlers: dict[str, list[Handler]] = defaultdict(list)
+
+
+def on(*event_types: str) -> Callable[[Handler], Handler]:
+    """
+    Register a local handler. Patterns: exact ("order.paid"), prefix ("order.*") or "*".
+    Handlers must be idempotent: delivery is at-least-once.
+    """
+    def deco(fn: Handler) -> Handler:
+        for et in event_types:
+            _handlers[et].append(fn)
+        return fn
+    return deco
+
+
+def handlers_for(event_type: str) -> list[Handler]:
+    prefix = event_type.split(".", 1)[0]
+    return [*_handlers.get(event_type, ()), *_handlers.get(f"{prefix}.*", ()), *_handlers.get("*", ())]
@@ -0,0 +1,66 @@
+# app/outbox/relay.py
+from __future__ import annotations
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.enums import OutboxStatusEnum
+from app.models.outbox import OutboxEvent
+from app.outbox.registry import handlers_for
+from app.repositories.outbox_repo import OutboxRepository
+
+log = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """
+    Drains outbox_events to local handlers. Each event runs in its own SAVEPOINT inside the
+    batch transaction: a failing handler rolls back only its own writes and the event is
+    retried with backoff; handler DB writes commit atomically with the "done" mark.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self.outbox = OutboxRepository(db)
+
+    def relay_batch(self, limit: int = 100) -> int:
+        """Deliver one batch. Returns the number of events claimed (0 = nothing due)."""
+        now = datetime.now(timezone.utc)
+        events = self.outbox.claim_batch(now, limit)
+        # events after a failure in the same aggregate wait for it (order is per aggregate)
+        failed: set[tuple[str, int]] = set()
+        for ev in events:
+            key = (ev.aggregate_type, ev.aggregate_id)
+            if key in failed:
+                continue
+            if not self._deliver(ev, now):
+                failed.add(key)
+        self.db.commit()
+        return len(events)
+
+    def _deliver(self, ev: OutboxEvent, now: datetime) -> bool:
+        ev.attempts += 1
+        try:
+            with self.db.begin_nested():
+                for handler in handlers_for(ev.event_type):
+                    handler(self.db, ev)
+        except Exception as e:
+            ev.last_error = f"{type(e).__name__}: {e}"[:2000]
+            if ev.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                ev.status = OutboxStatusEnum.dead
+                log.error("Outbox event %s (%s) dead after %d attempts: %s", ev.id, ev.event_type, ev.attempts, e)
+            else:
+                ev.available_at = now + timedelta(seconds=min(2 ** ev.attempts, 600))
+                log.warning("Outbox event %s (%s) failed, retrying: %s", ev.id, ev.event_type, e)
+            return False
+        ev.status = OutboxStatusEnum.done
+        ev.processed_at = now
+        ev.last_error = None
+        return True
+
+    def purge_processed(self, *, batch_size: int = 1000) -> int:
+        before = datetime.now(timezone.utc) - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+        n = self.outbox.purge_processed(before, batch_size)
+        self.db.commit()
+        return n
@@ -0,0 +1,4 @@
+"""
+Payment gateway callbacks: gateways.py verifies them, inbox.py stores them from the
+webhook endpoint, and processor.py (the `payments.callbacks` job) applies them in batches.
+"""
@@ -0,0 +1,49 @@
+# app/payments/fake.py
+"""
+Local fake gateway for tests and development. It builds signed callbacks the way a real
+gateway would post them to POST /payments/webhooks/fake (enabled by PAYMENT_FAKE_GATEWAY_SECRET):
+
+    gw = FakeGatewayClient()
+    body, headers = gw.callback(order.order_number, order.total_cents)
+    client.post("/api/v1/payments/webhooks/fake", content=body, headers=headers)
+
+`send` posts through any client with an httpx-style `post` (TestClient, httpx.Client) and
+can replay the same callback to exercise deduplication.
+"""
+from __future__ import annotations
+import json
+import uuid
+from typing import Any
+
+from app.core.config import settings
+from app.payments.gateways import FakeGateway, hmac_sha256
+
+
+class FakeGatewayClient:
+    def __init__(self, secret: str | None = None, *, path: str | None = None):
+        self.secret = secret or settings.PAYMENT_FAKE_GATEWAY_SECRET
+        if not self.secret:
+            raise RuntimeError("PAYMENT_FAKE_GATEWAY_SECRET is not set")
+        self.path = path or f"/{settings.API_PREFIX}/{settings.API_VERSION}/payments/webhooks/fake"
+
+    def callback(
+        self,
+        order_number: str,
+        amount_cents: int,
+        *,
+        succeeded: bool = True,
+        transaction_ref: str | None = None,
+    ) -> tuple[bytes, dict[str, str]]:
+        """A signed callback body and its headers."""
+        body = json.dumps({
+            "transaction_ref": transaction_ref or f"FAKE-{uuid.uuid4().hex}",
+            "order_number": order_number,
+            "amount_cents": amount_cents,
+            "succeeded": succeeded,
+        }).encode()
+        return body, {"Content-Type": "application/json", FakeGateway.header: hmac_sha256(self.secret, body)}
+
+    def send(self, client: Any, order_number: str, amount_cents: int, *, repeat: int = 1, **kwargs: Any) -> list[Any]:
+        """Post one callback `repeat` times (gateway retries); returns the responses."""
+        body, headers = self.callback(order_number, amount_cents, **kwargs)
+        return [client.post(self.path, content=body, headers=headers) for _ in range(repeat)]
@@ -0,0 +1,178 @@
+# app/payments/gateways.py
+"""
+Gateway callback adapters: verify the signature of a raw callback, extract what the
+processor needs and build the acknowledgement each gateway expects.
+
+Amounts are taken as-is: orders are in VND, whose gateway amount equals total_cents.
+"""
+from __future__ import annotations
+import hashlib
+import hmac
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+from fastapi.responses import JSONResponse, Response
+
+from app.core.config import settings
+from app.db.enums import PaymentMethodEnum
+
+
+class InvalidCallback(Exception):
+    """Bad signature or malformed body; the callback is not stored."""
+
+
+@dataclass(frozen=True)
+class Callback:
+    transaction_ref: str
+    order_number: str
+    amount_cents: int
+    succeeded: bool
+    payload: dict[str, Any]
+
+
+def hmac_sha256(key: str, message: str | bytes) -> str:
+    data = message.encode() if isinstance(message, str) else message
+    return hmac.new(key.encode(), data, hashlib.sha256).hexdigest()
+
+
+def _json_object(body: bytes) -> dict[str, Any]:
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        raise InvalidCallback(f"invalid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise InvalidCallback("expected a JSON object")
+    return data
+
+
+class Gateway(ABC):
+    name: str
+    method: PaymentMethodEnum
+
+    @property
+    @abstractmethod
+    def enabled(self) -> bool: ...
+
+    @abstractmethod
+    def parse(self, body: bytes, headers: Mapping[str, str]) -> Callback:
+        """Verify and decode a callback; raises InvalidCallback."""
+
+    def ack(self) -> Response:
+        return Response(status_code=204)
+
+    def reject(self, reason: str) -> Response:
+        return JSONResponse({"detail": reason}, status_code=400)
+
+
+class MomoGateway(Gateway):
+    """MoMo IPN: JSON body signed with HMAC-SHA256(secret key) over the sorted field string."""
+    name = "momo"
+    method = PaymentMethodEnum.momo
+    _SIGNED = (
+        "accessKey", "amount", "extraData", "message", "orderId", "orderInfo", "orderType",
+        "partnerCode", "payType", "requestId", "responseTime", "resultCode", "transId",
+    )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.MOMO_API_KEY and settings.MOMO_SECRET_KEY)
+
+    @classmethod
+    def signature(cls, data: Mapping[str, Any]) -> str:
+        fields = {**data, "accessKey": settings.MOMO_API_KEY}
+        raw = "&".join(f"{k}={fields.get(k, '')}" for k in cls._SIGNED)
+        return hmac_sha256(settings.MOMO_SECRET_KEY, raw)
+
+    def parse(self, body: bytes, headers: Mapping[str, str]) -> Callback:
+        data = _json_object(body)
+        if not hmac.compare_digest(str(data.get("signature", "")), self.signature(data)):
+            raise InvalidCallback("invalid signature")
+        try:
+            return Callback(
+                transaction_ref=str(data["transId"]),
+                order_number=str(data["orderId"]),
+                amount_cents=int(data["amount"]),
+                succeeded=int(data["resultCode"]) == 0,
+                payload=data,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidCallback(f"missing or invalid field: {e}") from None
+
+
+class ZaloPayGateway(Gateway):
+    """
+    ZaloPay callback: {"data": "<json>", "mac": HMAC-SHA256(key2, data)}; sent for successful
+    payments only. app_trans_id is "<yymmdd>_<order_number>".
+    """
+    name = "zalopay"
+    method = PaymentMethodEnum.zalopay
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.ZALOPAY_APP_ID and settings.ZALOPAY_KEY2)
+
+    def parse(self, body: bytes, headers: Mapping[str, str]) -> Callback:
+        envelope = _json_object(body)
+        raw = envelope.get("data")
+        if not isinstance(raw, str):
+            raise InvalidCallback("missing data")
+        if not hmac.compare_digest(str(envelope.get("mac", "")), hmac_sha256(settings.ZALOPAY_KEY2, raw)):
+            raise InvalidCallback("invalid mac")
+        data = _json_object(raw.encode())
+        try:
+            return Callback(
+                transaction_ref=str(data["zp_trans_id"]),
+                order_number=str(data["app_trans_id"]).split("_", 1)[-1],
+                amount_cents=int(data["amount"]),
+                succeeded=True,
+                payload=data,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidCallback(f"missing or invalid field: {e}") from None
+
+    def ack(self) -> Response:
+        return JSONResponse({"return_code": 1, "return_message": "success"})
+
+    def reject(self, reason: str) -> Response:
+        return JSONResponse({"return_code": -1, "return_message": reason})
+
+
+class FakeGateway(Gateway):
+    """
+    Local stand-in for tests and development (app/payments/fake.py builds its callbacks):
+    JSON body signed with HMAC-SHA256(PAYMENT_FAKE_GATEWAY_SECRET) in X-Fake-Signature.
+    Enabled only when the secret is set.
+    """
+    name = "fake"
+    method = PaymentMethodEnum.card
+    header = "x-fake-signature"
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.PAYMENT_FAKE_GATEWAY_SECRET)
+
+    def parse(self, body: bytes, headers: Mapping[str, str]) -> Callback:
+        if not hmac.compare_digest(headers.get(self.header, ""), hmac_sha256(settings.PAYMENT_FAKE_GATEWAY_SECRET, body)):
+            raise InvalidCallback("invalid signature")
+        data = _json_object(body)
+        try:
+            return Callback(
+                transaction_ref=str(data["transaction_ref"]),
+                order_number=str(data["order_number"]),
+                amount_cents=int(data["amount_cents"]),
+                succeeded=bool(data.get("succeeded", True)),
+                payload=data,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise InvalidCallback(f"missing or invalid field: {e}") from None
+
+
+GATEWAYS: dict[str, Gateway] = {g.name: g for g in (MomoGateway(), ZaloPayGateway(), FakeGateway())}
+
+
+def get_gateway(name: str) -> Gateway | None:
+    """The gateway for a callback URL, if it exists and is configured."""
+    gw = GATEWAYS.get(name)
+    return gw if gw is not None and gw.enabled else None
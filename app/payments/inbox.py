@@ -0,0 +1,47 @@
+# app/payments/inbox.py
+from __future__ import annotations
+import logging
+from typing import Mapping
+
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from app.payments.gateways import InvalidCallback, get_gateway
+from app.repositories.payment_callback_repo import PaymentCallbackRepository
+from app.exceptions import NotFound
+
+log = logging.getLogger(__name__)
+
+
+class PaymentInbox:
+    """
+    Webhook front door: verify, store, acknowledge. Nothing else runs in the request; the
+    processor applies stored callbacks in batches. Retries of a stored callback are
+    acknowledged again without a second row.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self.callbacks = PaymentCallbackRepository(db)
+
+    def receive(self, provider: str, body: bytes, headers: Mapping[str, str]) -> Response:
+        gateway = get_gateway(provider)
+        if gateway is None:
+            raise NotFound("Unknown payment provider")
+        try:
+            cb = gateway.parse(body, headers)
+        except InvalidCallback as e:
+            log.warning("rejected %s callback: %s", provider, e)
+            return gateway.reject(str(e))
+
+        created = self.callbacks.add({
+            "provider": gateway.name,
+            "transaction_ref": cb.transaction_ref[:255],
+            "order_number": cb.order_number[:50],
+            "amount_cents": cb.amount_cents,
+            "succeeded": cb.succeeded,
+            "payload": cb.payload,
+        })
+        self.db.commit()
+        if not created:
+            log.info("duplicate %s callback %s acknowledged", provider, cb.transaction_ref)
+        return gateway.ack()
@@ -0,0 +1,119 @@
+# app/payments/processor.py
+from __future__ import annotations
+import logging
+from datetime import datetime, timezone
+from typing import Any, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.enums import OrderStatusEnum, PaymentStatusEnum, PaymentCallbackStatusEnum
+from app.models.payment import PaymentCallback
+from app.payments.gateways import GATEWAYS
+from app.repositories.order_repo import OrderRepository
+from app.repositories.payment_repo import PaymentRepository
+from app.repositories.payment_callback_repo import PaymentCallbackRepository
+from app.repositories.outbox_repo import OutboxRepository
+from app.outbox import events
+
+log = logging.getLogger(__name__)
+
+# callback id -> (final status, note)
+_Outcome = dict[int, tuple[PaymentCallbackStatusEnum, "str | None"]]
+
+
+class PaymentCallbackProcessor:
+    """
+    Applies stored gateway callbacks a batch at a time: one locking lookup of the orders,
+    one executemany for the payments, one UPDATE for the orders and their order.paid events.
+
+    Rules (same as OrderService.pay): a successful callback pays a pending order whose total
+    matches. A transaction ref that is already paid is ignored. Anything else is marked failed
+    with the reason, e.g. unknown order, amount drift, or money captured for an order that is
+    no longer pending; those need a human. Unsuccessful callbacks are recorded as failed
+    payments. If the batch raises, callbacks are retried one by one, and one that keeps
+    failing is given up after PAYMENT_CALLBACK_MAX_ATTEMPTS.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self.callbacks = PaymentCallbackRepository(db)
+        self.orders = OrderRepository(db)
+        self.payments = PaymentRepository(db)
+        self.outbox = OutboxRepository(db)
+
+    def process_batch(self, limit: int = 500) -> int:
+        """Process one batch. Returns the number of callbacks claimed (0 = inbox empty)."""
+        batch = self.callbacks.claim_pending(limit)
+        if not batch:
+            return 0
+        now = datetime.now(timezone.utc)
+        try:
+            with self.db.begin_nested():
+                outcomes = self._apply(batch, now)
+        except Exception:
+            log.exception("payment callback batch failed; retrying callbacks one by one")
+            outcomes = {}
+            for cb in batch:
+                try:
+                    with self.db.begin_nested():
+                        outcomes |= self._apply([cb], now)
+                except Exception as e:
+                    cb.attempts += 1
+                    cb.last_error = f"{type(e).__name__}: {e}"[:2000]
+                    if cb.attempts >= settings.PAYMENT_CALLBACK_MAX_ATTEMPTS:
+                        cb.status = PaymentCallbackStatusEnum.failed
+                        cb.processed_at = now
+                        log.error("payment callback %s failed after %d attempts: %s", cb.id, cb.attempts, e)
+        for cb in batch:
+            if cb.id in outcomes:
+                cb.attempts += 1
+                cb.status, cb.last_error = outcomes[cb.id]
+                cb.processed_at = now
+        self.db.commit()
+        return len(batch)
+
+    def _apply(self, batch: Sequence[PaymentCallback], now: datetime) -> _Outcome:
+        orders = {r.order_number: r for r in self.orders.lock_by_numbers(cb.order_number for cb in batch)}
+        status = {number: r.status for number, r in orders.items()}  # advances as the batch pays orders
+        # refs are unique per gateway only: (provider, ref) pairs already paid
+        paid_refs = {
+            (provider, ref)
+            for provider in {cb.provider for cb in batch}
+            for ref in self.payments.paid_refs(
+                (cb.transaction_ref for cb in batch if cb.provider == provider), method=GATEWAYS[provider].method
+            )
+        }
+        outcomes: _Outcome = {}
+        payments: list[dict[str, Any]] = []
+        to_pay: list[int] = []
+        for cb in batch:
+            order = orders.get(cb.order_number)
+            if order is None:
+                outcomes[cb.id] = (PaymentCallbackStatusEnum.failed, "unknown order")
+                continue
+            method = GATEWAYS[cb.provider].method
+            if not cb.succeeded:
+                payments.append({"order_id": order.id, "amount_cents": cb.amount_cents, "status": PaymentStatusEnum.failed,
+                                 "method": method, "transaction_ref": cb.transaction_ref})
+                outcomes[cb.id] = (PaymentCallbackStatusEnum.processed, None)
+            elif (cb.provider, cb.transaction_ref) in paid_refs:
+                outcomes[cb.id] = (PaymentCallbackStatusEnum.ignored, "transaction already recorded")
+            elif status[cb.order_number] != OrderStatusEnum.pending:
+                outcomes[cb.id] = (PaymentCallbackStatusEnum.failed, f"order is {status[cb.order_number].value}; review the capture")
+            elif cb.amount_cents != order.total_cents:
+                outcomes[cb.id] = (PaymentCallbackStatusEnum.failed, f"amount {cb.amount_cents} != order total {order.total_cents}")
+            else:
+                payments.append({"order_id": order.id, "amount_cents": cb.amount_cents, "status": PaymentStatusEnum.paid,
+                                 "method": method, "transaction_ref": cb.transaction_ref})
+                to_pay.append(order.id)
+                status[cb.order_number] = OrderStatusEnum.paid
+                paid_refs.add((cb.provider, cb.transaction_ref))
+                outcomes[cb.id] = (PaymentCallbackStatusEnum.processed, None)
+
+        self.payments.create_many(payments)
+        if to_pay:
+            self.orders.set_status_many(to_pay, {"status": OrderStatusEnum.paid, "paid_at": now})
+            self.outbox.add_many([
+                (events.ORDER, o.id, events.ORDER_PAID, events.order_payload(o)) for o in self.orders.load_many(to_pay)
+            ])
+        return outcomes
@@ -0,0 +1,294 @@
+# app/payments/reconciliation.py
+from __future__ import annotations
+import csv
+import json
+import logging
+import shutil
+import uuid
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional, Union
+
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.enums import ImportStatusEnum, OrderStatusEnum, PaymentMethodEnum, PaymentStatusEnum, ReconcileMismatchEnum
+from app.db.locks import try_advisory_lock
+from app.db.session import SessionLocal
+from app.models.reconciliation import PaymentReconciliation
+from app.payments.gateways import GATEWAYS
+from app.repositories.order_repo import OrderRepository
+from app.repositories.payment_repo import PaymentRepository
+from app.repositories.reconciliation_repo import ReconciliationRepository
+from app.repositories.outbox_repo import OutboxRepository
+from app.outbox import events
+from app.schemas.page import Page
+from app.schemas.reconciliation import SettlementRow, ReconciliationItemOut
+from app.exceptions import NotFound, BadRequest, Conflict
+
+log = logging.getLogger(__name__)
+
+SETTLEMENT_FORMATS = ("csv", "jsonl")
+
+# (row_number, raw record) or (row_number, parse error message)
+_Item = tuple[int, Union[dict[str, Any], str]]
+
+
+def _read_rows(path: str, fmt: str) -> Iterator[_Item]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if fmt == "csv":
+            yield from enumerate(csv.DictReader(f), start=1)
+            return
+        for n, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except ValueError as e:
+                yield n, f"invalid JSON: {e}"
+                continue
+            yield n, rec if isinstance(rec, dict) else "expected a JSON object"
+
+
+def _item(kind: ReconcileMismatchEnum, n: int | None = None, **fields: Any) -> dict[str, Any]:
+    return {
+        "kind": kind, "row_number": n, "transaction_ref": None, "order_number": None, "payment_id": None,
+        "order_id": None, "expected_cents": None, "settled_cents": None, "note": None, **fields,
+    }
+
+
+class ReconciliationService:
+    """
+    Matches a gateway settlement file against `payments`. The file is streamed in chunks of
+    RECONCILE_CHUNK_SIZE rows; each chunk costs one indexed lookup by transaction_ref, and
+    mismatches are written as they are found, so memory stays flat whatever the file size.
+    Refs already seen live in a temp table: it catches repeated rows and, for runs with a
+    period, the paid payments the gateway never settled (one INSERT ... SELECT).
+
+    With apply_fixes, the only fix applied is the safe one: a settled ref with no paid payment,
+    for a still-pending order whose total equals the settled amount. It gets the payment and
+    the paid transition (as a webhook would). Everything else is left for review.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self.recs = ReconciliationRepository(db)
+        self.payments = PaymentRepository(db)
+        self.orders = OrderRepository(db)
+        self.outbox = OutboxRepository(db)
+
+    # ---------- Runs ----------
+    def create_from_upload(self, file: BinaryIO, filename: str, **kwargs: Any) -> PaymentReconciliation:
+        """Store an uploaded settlement file under IMPORT_DIR and register a pending run for it."""
+        fmt = self._resolve_format(filename, kwargs.pop("fmt", None))
+        target_dir = Path(settings.IMPORT_DIR)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / f"settlement-{uuid.uuid4().hex}.{fmt}"
+        with target.open("wb") as out:
+            shutil.copyfileobj(file, out)
+        return self.create(path=str(target), filename=filename, fmt=fmt, **kwargs)
+
+    def create(
+        self,
+        *,
+        path: str,
+        provider: str,
+        filename: str | None = None,
+        fmt: str | None = None,
+        period_from: datetime | None = None,
+        period_to: datetime | None = None,
+        apply_fixes: bool = False,
+    ) -> PaymentReconciliation:
+        if provider not in GATEWAYS:
+            raise BadRequest(f"Unknown payment provider: {provider}")
+        if not Path(path).is_file():
+            raise BadRequest(f"File not found: {path}")
+        if (period_from is None) != (period_to is None) or (period_from and period_to and period_from >= period_to):
+            raise BadRequest("Give both period_from and period_to, with period_from < period_to")
+        fmt = self._resolve_format(filename or path, fmt)
+        row = self.recs.create({
+            "provider": provider, "filename": (filename or Path(path).name)[:255], "path": path, "format": fmt,
+            "period_from": period_from, "period_to": period_to, "apply_fixes": apply_fixes,
+        })
+        self.db.commit()
+        self.db.refresh(row)
+        return row
+
+    @staticmethod
+    def _resolve_format(filename: str, fmt: str | None) -> str:
+        fmt = (fmt or Path(filename).suffix.lstrip(".")).lower()
+        if fmt == "ndjson":
+            fmt = "jsonl"
+        if fmt not in SETTLEMENT_FORMATS:
+            raise BadRequest("Settlement format must be 'csv' or 'jsonl'")
+        return fmt
+
+    def get(self, reconciliation_id: int) -> PaymentReconciliation:
+        row = self.recs.get(reconciliation_id)
+        if not row:
+            raise NotFound("Reconciliation not found")
+        return row
+
+    def list_items_page(
+        self, reconciliation_id: int, *, kind: list[str] | None, limit: int, offset: int
+    ) -> Page[ReconciliationItemOut]:
+        self.get(reconciliation_id)
+        items, total = self.recs.list_items_paged(reconciliation_id, kind=kind, limit=limit, offset=offset)
+        dto = [ReconciliationItemOut.model_validate(i, from_attributes=True) for i in items]
+        return Page[ReconciliationItemOut].from_parts(dto, total, limit, offset)
+
+    def run(self, reconciliation_id: int, *, chunk_size: int | None = None) -> PaymentReconciliation:
+        """
+        Scan the file (one transaction: the items appear together), then apply fixes in
+        committed chunks. A failed run can simply be run again; it starts over.
+        """
+        size = chunk_size or settings.RECONCILE_CHUNK_SIZE
+        with try_advisory_lock(f"payment_reconciliation:{reconciliation_id}") as acquired:
+            if not acquired:
+                raise Conflict("Reconciliation is already running")
+            rec = self.get(reconciliation_id)
+            if rec.status == ImportStatusEnum.completed:
+                return rec
+            rec.status = ImportStatusEnum.running
+            rec.started_at = datetime.now(timezone.utc)
+            rec.finished_at = None
+            rec.last_error = None
+            self.recs.save(rec)
+            self.db.commit()
+
+            try:
+                self._scan(rec, size)
+                self.db.commit()
+                if rec.apply_fixes:
+                    self._apply_fixes(rec, size)
+            except Exception as e:
+                self.db.rollback()
+                log.exception("payment reconciliation %s failed", reconciliation_id)
+                rec.status = ImportStatusEnum.failed
+                rec.last_error = str(e)[:1000]
+            else:
+                rec.status = ImportStatusEnum.completed
+            rec.finished_at = datetime.now(timezone.utc)
+            self.recs.save(rec)
+            self.db.commit()
+            self.db.refresh(rec)
+            return rec
+
+    # ---------- Scan ----------
+    def _scan(self, rec: PaymentReconciliation, size: int) -> None:
+        self.recs.clear_items(rec.id)
+        self.recs.create_seen_table()
+        rec.rows_processed = rec.matched = rec.mismatched = rec.fixed = 0
+        method = GATEWAYS[rec.provider].method
+        rows = _read_rows(rec.path, rec.format)
+        while chunk := list(islice(rows, size)):
+            items, matched = self._check_chunk(chunk, method)
+            self.recs.add_items(rec.id, items)
+            rec.rows_processed = chunk[-1][0]
+            rec.matched += matched
+            rec.mismatched += len(items)
+        if rec.period_from and rec.period_to:
+            rec.mismatched += self.recs.add_unsettled(rec.id, method, rec.period_from, rec.period_to)
+        self.recs.save(rec)
+
+    def _check_chunk(self, chunk: list[_Item], method: PaymentMethodEnum) -> tuple[list[dict[str, Any]], int]:
+        items: list[dict[str, Any]] = []
+        first: dict[str, tuple[int, SettlementRow]] = {}
+        for n, raw in chunk:
+            if isinstance(raw, str):
+                items.append(_item(ReconcileMismatchEnum.invalid_row, n, note=raw[:1000]))
+                continue
+            try:
+                row = SettlementRow.model_validate(raw)
+            except ValidationError as e:
+                note = "; ".join(f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in e.errors())
+                items.append(_item(ReconcileMismatchEnum.invalid_row, n, note=note[:1000]))
+                continue
+            if row.transaction_ref in first:
+                items.append(_item(ReconcileMismatchEnum.duplicate_row, n, transaction_ref=row.transaction_ref,
+                                   settled_cents=row.amount_cents, note=f"first in row {first[row.transaction_ref][0]}"))
+            else:
+                first[row.transaction_ref] = (n, row)
+
+        new = self.recs.mark_seen(first)
+        found: dict[str, list[Any]] = {}
+        for p in self.payments.by_refs(new, method=method):
+            found.setdefault(p.transaction_ref, []).append(p)
+
+        matched = 0
+        for ref, (n, row) in first.items():
+            base = {"transaction_ref": ref, "settled_cents": row.amount_cents, "order_number": row.order_number}
+            if ref not in new:
+                items.append(_item(ReconcileMismatchEnum.duplicate_row, n, **base, note="ref seen in an earlier chunk"))
+                continue
+            payments = found.get(ref, [])
+            paid = [p for p in payments if p.status == PaymentStatusEnum.paid]
+            if not paid:
+                p = payments[0] if payments else None
+                items.append(_item(
+                    ReconcileMismatchEnum.missing_payment, n, **{
+                        **base,
+                        "order_number": p.order_number if p else row.order_number,
+                        "payment_id": p.id if p else None,
+                        "order_id": p.order_id if p else None,
+                    },
+                    note=f"payment is {p.status.value}" if p else None,
+                ))
+            elif len(paid) > 1:
+                items.append(_item(
+                    ReconcileMismatchEnum.duplicate_payment, n, **{**base, "order_number": paid[0].order_number},
+                    payment_id=paid[0].id, order_id=paid[0].order_id,
+                    expected_cents=sum(p.amount_cents for p in paid), note=f"{len(paid)} paid payments",
+                ))
+            elif paid[0].amount_cents != row.amount_cents:
+                items.append(_item(
+                    ReconcileMismatchEnum.amount_drift, n, **{**base, "order_number": paid[0].order_number},
+                    payment_id=paid[0].id, order_id=paid[0].order_id, expected_cents=paid[0].amount_cents,
+                ))
+            else:
+                matched += 1
+        return items, matched
+
+    # ---------- Safe fixes ----------
+    def _apply_fixes(self, rec: PaymentReconciliation, size: int) -> None:
+        method = GATEWAYS[rec.provider].method
+        after = 0
+        while batch := self.recs.fix_candidates(rec.id, after_id=after, limit=size):
+            after = batch[-1].id
+            orders = {r.order_number: r for r in self.orders.lock_by_numbers(i.order_number for i in batch)}
+            status = {number: r.status for number, r in orders.items()}
+            paid_refs = self.payments.paid_refs((i.transaction_ref for i in batch), method=method)
+            fixed, payments, to_pay = [], [], []
+            for item in batch:
+                o = orders.get(item.order_number)
+                if (
+                    o is None or status[o.order_number] != OrderStatusEnum.pending
+                    or o.total_cents != item.settled_cents or item.transaction_ref in paid_refs
+                ):
+                    continue
+                payments.append({"order_id": o.id, "amount_cents": item.settled_cents, "status": PaymentStatusEnum.paid,
+                                 "method": method, "transaction_ref": item.transaction_ref})
+                to_pay.append(o.id)
+                status[o.order_number] = OrderStatusEnum.paid
+                fixed.append(item.id)
+            if fixed:
+                now = datetime.now(timezone.utc)
+                self.payments.create_many(payments)
+                self.orders.set_status_many(to_pay, {"status": OrderStatusEnum.paid, "paid_at": now})
+                self.outbox.add_many([
+                    (events.ORDER, o.id, events.ORDER_PAID, events.order_payload(o)) for o in self.orders.load_many(to_pay)
+                ])
+                self.recs.mark_fixed(fixed, "payment recorded from settlement; order marked paid")
+                rec.fixed += len(fixed)
+            self.recs.save(rec)
+            self.db.commit()
+
+
+def run_reconciliation(reconciliation_id: int, chunk_size: Optional[int] = None) -> None:
+    """BackgroundTasks / CLI entry point: runs a reconciliation on its own session."""
+    with SessionLocal() as db:
+        try:
+            ReconciliationService(db).run(reconciliation_id, chunk_size=chunk_size)
+        except Conflict:
+            log.warning("payment reconciliation %s is already running; skipped", reconciliation_id)
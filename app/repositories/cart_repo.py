@@ -1,6 +1,7 @@
 from __future__ import annotations
+from datetime import datetime
 from typing import Optional, Sequence
-from sqlalchemy import select
+from sqlalchemy import select, update, exists
 from sqlalchemy.orm import Session
 
 from app.models.cart import Cart, CartItem
@@ -17,7 +18,6 @@ class CartRepository:
         stmt = select(Cart).where(
             Cart.user_id == user_id,
             Cart.status == CartStatusEnum.open,
-            Cart.deleted_at.is_(None),
         )
         return self.db.execute(stmt).scalar_one_or_none()
 
@@ -28,12 +28,37 @@ class CartRepository:
     # --- cart writes (no commits) ---
     def create_for_user(self, user_id: int) -> Cart:
         row = Cart(user_id=user_id, status=CartStatusEnum.open)
-        self.db.add(row); return row
+        self.db.add(row)
+        self.db.flush()  # items need cart.id
+        return row
 
     def set_checked_out(self, cart: Cart) -> None:
         cart.status = CartStatusEnum.checked_out
         self.db.add(cart)
 
+    def abandon_idle(self, idle_since: datetime, limit: int) -> list[int]:
+        """Mark up to `limit` open carts with no activity since `idle_since` as abandoned; returns their ids."""
+        recent_item = exists().where(CartItem.cart_id == Cart.id, CartItem.updated_at >= idle_since)
+        due = (
+            select(Cart.id)
+            .where(
+                Cart.status == CartStatusEnum.open,
+                Cart.deleted_at.is_(None),
+                Cart.updated_at < idle_since,
+                ~recent_item,
+            )
+            .order_by(Cart.updated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(Cart)
+            .where(Cart.id.in_(due))
+            .values(status=CartStatusEnum.abandoned)
+            .returning(Cart.id)
+        )
+        return list(self.db.execute(stmt, execution_options={"synchronize_session": False}).scalars())
+
     # --- items ---
     def get_item(self, item_id: int) -> Optional[CartItem]:
         return self.db.get(CartItem, item_id)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+from typing import Any, Optional, Sequence, Tuple
+from sqlalchemy import select, insert
+from sqlalchemy.orm import Session
+
+from app.common.listing import paginate
+from app.models.catalog_import import CatalogImport, CatalogImportError
+
+
+class CatalogImportRepository:
+    """Import runs and their rejected rows. No commits here."""
+    def __init__(self, db: Session): self.db = db
+
+    def get(self, import_id: int) -> Optional[CatalogImport]:
+        return self.db.get(CatalogImport, import_id)
+
+    def create(self, data: dict) -> CatalogImport:
+        row = CatalogImport(**data)
+        self.db.add(row)
+        return row
+
+    def save(self, row: CatalogImport) -> None:
+        self.db.add(row)
+
+    def add_errors(self, import_id: int, errors: Sequence[dict[str, Any]]) -> None:
+        if errors:
+            self.db.execute(insert(CatalogImportError), [{"import_id": import_id, **e} for e in errors])
+
+    def list_errors_paged(self, import_id: int, *, limit: int, offset: int) -> Tuple[list[CatalogImportError], int]:
+        stmt = (
+            select(CatalogImportError)
+            .where(CatalogImportError.import_id == import_id)
+            .order_by(CatalogImportError.row_number, CatalogImportError.id)
+        )
+        return paginate(self.db, stmt, limit, offset)
@@ -1,11 +1,14 @@
 from __future__ import annotations
-from typing import List, Tuple, Sequence
+from typing import Iterable, List, Tuple, Sequence
 from sqlalchemy import select, and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import Select
 
 from app.common.listing import paginate, safe_order_by, ilike_any, Col
+from app.db.soft_delete import WITH_DELETED
 from app.models.catalog import Brand, Category
+from app.utils.strings import slugify
 
 ALLOWED_BRAND_SORT: dict[str, Col] = {
     "id": Brand.id, "name": Brand.name, "slug": Brand.slug, "created_at": Brand.created_at,
@@ -24,7 +27,7 @@ class CatalogRepository:
 
     # ---- Brands (read) ----
     def list_brands(self, *, q: str | None, sort: List[str], limit: int, offset: int) -> Tuple[List[Brand], int]:
-        stmt: Select[tuple[Brand]] = select(Brand).where(Brand.deleted_at.is_(None))
+        stmt: Select[tuple[Brand]] = select(Brand)
         if q:
             stmt = stmt.where(ilike_any([Brand.name, Brand.slug], q))
         stmt = stmt.order_by(*safe_order_by(sort, ALLOWED_BRAND_SORT, DEFAULT_SORT_BRAND))
@@ -48,7 +51,7 @@ class CatalogRepository:
     def list_categories(
         self, *, q: str | None, parent_id: int | None, sort: List[str], limit: int, offset: int
     ) -> Tuple[List[Category], int]:
-        stmt: Select[tuple[Category]] = select(Category).where(Category.deleted_at.is_(None))
+        stmt: Select[tuple[Category]] = select(Category)
         conds = []
         if q: conds.append(ilike_any([Category.name, Category.slug], q))
         if parent_id is not None: conds.append(Category.parent_id == parent_id)
@@ -61,7 +64,7 @@ class CatalogRepository:
 
     def all_categories(self) -> Sequence[Category]:
         return self.db.execute(
-            select(Category).where(Category.deleted_at.is_(None)).order_by(Category.parent_id.nullsfirst(), Category.name)
+            select(Category).order_by(Category.parent_id.nullsfirst(), Category.name)
         ).scalars().all()
 
     def has_children(self, category_id: int) -> bool:
@@ -78,3 +81,30 @@ class CatalogRepository:
 
     def delete_category(self, row: Category) -> None:
         self.db.delete(row)
+
+    # ---- Bulk (imports) ----
+    def ensure_brands(self, names: Iterable[str]) -> dict[str, int]:
+        """Map brand names (case-insensitive, lowercased keys) to ids, inserting missing ones."""
+        wanted = {n.lower(): n for n in names}
+        if not wanted:
+            return {}
+
+        def lookup() -> dict[str, int]:
+            stmt = select(Brand.id, Brand.name).where(func.lower(Brand.name).in_(list(wanted)))
+            # deleted brands too: names are unique, so ON CONFLICT below skips them
+            return {name.lower(): bid for bid, name in self.db.execute(stmt, execution_options=WITH_DELETED).all()}
+
+        found = lookup()
+        missing = [name for key, name in wanted.items() if key not in found]
+        if missing:
+            rows = [{"name": n, "slug": slugify(n)} for n in missing]
+            self.db.execute(pg_insert(Brand).values(rows).on_conflict_do_nothing())
+            found = lookup()
+        return found
+
+    def category_ids_by_slug(self, slugs: Iterable[str]) -> dict[str, int]:
+        wanted = list(set(slugs))
+        if not wanted:
+            return {}
+        stmt = select(Category.slug, Category.id).where(Category.slug.in_(wanted))
+        return {slug: cid for slug, cid in self.db.execute(stmt).all()}
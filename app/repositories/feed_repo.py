@@ -0,0 +1,125 @@
+from __future__ import annotations
+from datetime import date
+from typing import Literal, Optional
+from sqlalchemy import select, delete, func, literal, Integer, String
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, Select, Subquery
+
+from app.db.enums import FeedKindEnum
+from app.models.catalog import Product, ProductCategory
+from app.models.feed import ProductFeed
+from app.models.report import ProductSalesDaily
+from app.models.review import Review
+
+FeedScope = Literal["global", "category", "brand"]
+SCOPES: tuple[FeedScope, ...] = ("global", "category", "brand")
+
+_VISIBLE = (Product.deleted_at.is_(None), Product.is_active.is_(True), Product.is_archived.is_(False))
+
+
+class FeedRepository:
+    """Precomputed product feeds. Each refresh is one INSERT ... SELECT per scope. No commits here."""
+    def __init__(self, db: Session): self.db = db
+
+    def get(self, kind: FeedKindEnum, scope: FeedScope, scope_id: int) -> Optional[ProductFeed]:
+        return self.db.get(ProductFeed, (kind, scope, scope_id))
+
+    # ---------- per-product scores: (product_id, score, tiebreak) ----------
+    def bestseller_scores(self, since: date) -> Subquery:
+        """Net units per product from the product_sales_daily rollup (not raw order items)."""
+        psd = ProductSalesDaily
+        return (
+            select(
+                psd.product_id.label("product_id"),
+                func.sum(psd.units_sold - psd.units_refunded).label("score"),
+                func.sum(psd.revenue_cents - psd.refunded_cents).label("tiebreak"),
+            )
+            .where(psd.day >= since, psd.product_id.is_not(None))
+            .group_by(psd.product_id)
+            .having(func.sum(psd.units_sold - psd.units_refunded) > 0)
+            .subquery("scores")
+        )
+
+    def new_arrival_scores(self) -> Subquery:
+        return (
+            select(
+                Product.id.label("product_id"),
+                func.extract("epoch", Product.created_at).label("score"),
+                Product.id.label("tiebreak"),
+            )
+            .where(*_VISIBLE)
+            .subquery("scores")
+        )
+
+    def top_rated_scores(self, min_reviews: int) -> Subquery:
+        return (
+            select(
+                Review.product_id.label("product_id"),
+                func.avg(Review.rating).label("score"),
+                func.count().label("tiebreak"),
+            )
+            .where(Review.deleted_at.is_(None), Review.is_published.is_(True))
+            .group_by(Review.product_id)
+            .having(func.count() >= min_reviews)
+            .subquery("scores")
+        )
+
+    # ---------- store ----------
+    def store(self, kind: FeedKindEnum, scope: FeedScope, scores: Subquery, *, size: int) -> int:
+        """
+        Rank visible products by (score, tiebreak) within each scope id, keep the top `size`
+        as one int[] per scope id, and drop lists of this kind/scope that got no products.
+        Returns the number of lists written.
+        """
+        scope_id: ColumnElement[int]
+        if scope == "category":
+            scope_id = ProductCategory.category_id
+        elif scope == "brand":
+            scope_id = Product.brand_id
+        else:
+            scope_id = literal(0, Integer)
+        src: Select = (
+            select(scope_id.label("scope_id"), scores.c.product_id, scores.c.score, scores.c.tiebreak)
+            .join(Product, Product.id == scores.c.product_id)
+            .where(*_VISIBLE)
+        )
+        if scope == "category":
+            src = src.join(ProductCategory, ProductCategory.product_id == scores.c.product_id)
+        elif scope == "brand":
+            src = src.where(Product.brand_id.is_not(None))
+
+        sq = src.subquery("src")
+        ranked = select(
+            sq.c.scope_id,
+            sq.c.product_id,
+            func.row_number().over(
+                partition_by=sq.c.scope_id,
+                order_by=(sq.c.score.desc(), sq.c.tiebreak.desc(), sq.c.product_id.desc()),
+            ).label("rank"),
+        ).subquery("ranked")
+        lists = (
+            select(
+                literal(kind.name, String),
+                literal(scope, String),
+                ranked.c.scope_id,
+                func.array_agg(aggregate_order_by(ranked.c.product_id, ranked.c.rank)),
+                func.now(),
+            )
+            .where(ranked.c.rank <= size)
+            .group_by(ranked.c.scope_id)
+        )
+        ins = pg_insert(ProductFeed).from_select(["kind", "scope", "scope_id", "product_ids", "computed_at"], lists)
+        ins = ins.on_conflict_do_update(
+            index_elements=[ProductFeed.kind, ProductFeed.scope, ProductFeed.scope_id],
+            set_={"product_ids": ins.excluded.product_ids, "computed_at": ins.excluded.computed_at},
+        ).returning(ProductFeed.scope_id)
+        written = len(self.db.execute(ins).all())
+        # lists written above carry this transaction's now(); older ones lost all their products
+        self.db.execute(
+            delete(ProductFeed).where(
+                ProductFeed.kind == kind, ProductFeed.scope == scope, ProductFeed.computed_at < func.now(),
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        return written
@@ -1,13 +1,21 @@
 from __future__ import annotations
-from typing import Optional, Sequence, Tuple, List
-from sqlalchemy import select, and_
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, List
+from datetime import datetime
+from sqlalchemy import select, update, and_, insert, bindparam, func, literal, literal_column, true, Integer, Row
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import Select
 
+from app.common.export import stream_rows
 from app.common.listing import paginate, safe_order_by, Col
-from app.models.inventory import InventoryMovement
+from app.models.inventory import InventoryMovement, InventorySnapshot
 from app.models.catalog import ProductVariant
 from app.db.enums import InventoryMovementType
+from app.db.soft_delete import WITH_DELETED
+from app.repositories.outbox_repo import OutboxRepository
+from app.repositories.product_repo import queue_product_stock
+from app.outbox import events
 
 ALLOWED_SORT: dict[str, Col] = {
     "id": InventoryMovement.id,
@@ -19,12 +27,43 @@ ALLOWED_SORT: dict[str, Col] = {
 }
 DEFAULT_SORT = ["-created_at"]
 
+EXPORT_COLUMNS: dict[str, Col] = {
+    "id": InventoryMovement.id,
+    "variant_id": InventoryMovement.variant_id,
+    "order_id": InventoryMovement.order_id,
+    "qty_delta": InventoryMovement.qty_delta,
+    "reason": InventoryMovement.reason,
+    "note": InventoryMovement.note,
+    "created_at": InventoryMovement.created_at,
+}
+
 class InventoryRepository:
+    """
+    Stock levels and the movement ledger. Set-based variant reads include soft-deleted
+    variants (WITH_DELETED): their stock and history still have to balance. No commits here.
+    """
     def __init__(self, db: Session): self.db = db
 
     # --- variant reads/writes ---
-    def load_variant(self, variant_id: int) -> Optional[ProductVariant]:
-        return self.db.get(ProductVariant, variant_id)
+    def load_variant(self, variant_id: int, *, include_deleted: bool = False) -> Optional[ProductVariant]:
+        """include_deleted for restocks and ledger views; carts only see sellable (live) variants."""
+        return self.db.get(ProductVariant, variant_id, execution_options=WITH_DELETED if include_deleted else {})
+
+    def lock_variants(self, variant_ids: Iterable[int]) -> dict[int, ProductVariant]:
+        """SELECT ... FOR UPDATE in id order (deadlock-free), refreshing identity-map copies."""
+        stmt = (
+            select(ProductVariant)
+            .where(ProductVariant.id.in_(set(variant_ids)))
+            .order_by(ProductVariant.id)
+            .with_for_update()
+            .execution_options(populate_existing=True, **WITH_DELETED)
+        )
+        return {v.id: v for v in self.db.execute(stmt).scalars()}
+
+    def available_qty(self, variant_ids: Iterable[int]) -> dict[int, int]:
+        """Available-to-sell (stock_qty - reserved_qty) for many variants, one PK-index query."""
+        stmt = select(ProductVariant.id, ProductVariant.available_qty).where(ProductVariant.id.in_(set(variant_ids)))
+        return {vid: int(qty) for vid, qty in self.db.execute(stmt, execution_options=WITH_DELETED).all()}
 
     def change_stock(
         self,
@@ -42,24 +81,310 @@ class InventoryRepository:
             variant_id=variant.id, order_id=order_id, qty_delta=qty_delta, reason=reason, note=note
         )
         self.db.add(mov)
+        if variant.deleted_at is None:
+            queue_product_stock(self.db, variant.product_id, qty_delta)
+        OutboxRepository(self.db).add(events.VARIANT, variant.id, events.STOCK_CHANGED, {
+            "product_id": variant.product_id,
+            "qty_delta": qty_delta,
+            "stock_qty": variant.stock_qty,
+            "reason": reason.value,
+            "order_id": order_id,
+        })
         return mov
 
+    def record_movements(self, rows: list[dict[str, Any]]) -> None:
+        """Bulk-append ledger rows (executemany) for stock already applied by the caller."""
+        if rows:
+            self.db.execute(insert(InventoryMovement), rows)
+
+    # --- set-based stock changes ---
+    def stock_levels(
+        self,
+        *,
+        variant_ids: Iterable[int] | None = None,
+        skus: Iterable[str] | None = None,
+        for_update: bool = False,
+    ) -> Sequence[Row[Any]]:
+        """(id, sku, product_id, stock_qty, reserved_qty) by id or SKU in one query; optionally locked in id order."""
+        stmt = select(
+            ProductVariant.id, ProductVariant.sku, ProductVariant.product_id,
+            ProductVariant.stock_qty, ProductVariant.reserved_qty,
+        ).order_by(ProductVariant.id)
+        if variant_ids is not None:
+            stmt = stmt.where(ProductVariant.id.in_(set(variant_ids)))
+        if skus is not None:
+            stmt = stmt.where(ProductVariant.sku.in_(set(skus)))
+        if for_update:
+            stmt = stmt.with_for_update(of=ProductVariant)
+        return self.db.execute(stmt, execution_options=WITH_DELETED).all()
+
+    def bulk_change_stock(
+        self,
+        deltas: Mapping[int, int],
+        reason: InventoryMovementType,
+        *,
+        order_id: int | None = None,
+        note: str | None = None,
+    ) -> list[tuple[int, int, int]]:
+        """
+        Set-based change_stock: one UPDATE ... FROM (VALUES ...) for all variants, one
+        executemany for the ledger rows and one for the stock events. Callers lock the
+        rows first (stock_levels(for_update=True)) and reject negative results; loaded
+        ProductVariant instances are not refreshed. Returns (id, product_id, stock_qty).
+        """
+        deltas = {vid: d for vid, d in deltas.items() if d}
+        if not deltas:
+            return []
+        updated = self._update_stock(deltas)
+        self.record_movements([
+            {"variant_id": vid, "order_id": order_id, "qty_delta": deltas[vid], "reason": reason, "note": note}
+            for vid, _, _ in updated
+        ])
+        OutboxRepository(self.db).add_many([
+            (events.VARIANT, vid, events.STOCK_CHANGED, {
+                "product_id": product_id,
+                "qty_delta": deltas[vid],
+                "stock_qty": stock_qty,
+                "reason": reason.value,
+                "order_id": order_id,
+            })
+            for vid, product_id, stock_qty in updated
+        ])
+        return updated
+
+    def bulk_change_stock_by_order(
+        self,
+        lines: Iterable[tuple[int, int, int]],
+        reason: InventoryMovementType,
+        *,
+        note: str | None = None,
+    ) -> list[tuple[int, int, int]]:
+        """
+        bulk_change_stock for many orders at once: `lines` are (order_id, variant_id, qty_delta).
+        Stock is updated once per variant; ledger rows and stock events stay one per line,
+        each event carrying the running stock level after its line.
+        """
+        lines = [(oid, vid, d) for oid, vid, d in lines if d]
+        deltas: dict[int, int] = {}
+        for _, vid, d in lines:
+            deltas[vid] = deltas.get(vid, 0) + d
+        if not deltas:
+            return []
+        updated = self._update_stock(deltas)
+        product_of = {vid: product_id for vid, product_id, _ in updated}
+        running = {vid: stock_qty - deltas[vid] for vid, _, stock_qty in updated}
+        movements, stock_events = [], []
+        for oid, vid, d in lines:
+            if vid not in running:  # variant deleted since the order was placed
+                continue
+            running[vid] += d
+            movements.append({"variant_id": vid, "order_id": oid, "qty_delta": d, "reason": reason, "note": note})
+            stock_events.append((events.VARIANT, vid, events.STOCK_CHANGED, {
+                "product_id": product_of[vid],
+                "qty_delta": d,
+                "stock_qty": running[vid],
+                "reason": reason.value,
+                "order_id": oid,
+            }))
+        self.record_movements(movements)
+        OutboxRepository(self.db).add_many(stock_events)
+        return updated
+
+    def _update_stock(self, deltas: Mapping[int, int]) -> list[tuple[int, int, int]]:
+        """One UPDATE ... FROM unnest(ids, deltas); queues the product totals. Returns (id, product_id, stock_qty)."""
+        # two array parameters rather than a VALUES row per variant: a stock-take of any size
+        # stays far below Postgres's 65535 bind-parameter limit
+        d = func.unnest(
+            bindparam("ids", list(deltas), type_=ARRAY(Integer)),
+            bindparam("deltas", list(deltas.values()), type_=ARRAY(Integer)),
+        ).table_valued("id", "delta").render_derived(name="d")
+        stmt = (
+            update(ProductVariant)
+            .where(ProductVariant.id == d.c.id)
+            .values(stock_qty=ProductVariant.stock_qty + d.c.delta)
+            .returning(ProductVariant.id, ProductVariant.product_id, ProductVariant.stock_qty, ProductVariant.deleted_at)
+        )
+        rows = self.db.execute(stmt, execution_options={"synchronize_session": False}).all()
+        for vid, product_id, _, deleted_at in rows:
+            if deleted_at is None:
+                queue_product_stock(self.db, product_id, deltas[vid])
+        return [(vid, product_id, stock_qty) for vid, product_id, stock_qty, _ in rows]
+
+    # --- snapshots / point-in-time ---
+    @staticmethod
+    def _ledger_laterals(variant_id: Any, at: datetime | None):
+        """
+        LATERAL pair for one variant: its latest snapshot at/before `at` (None = now) and the
+        sum of movements after that snapshot. Both are index range reads (PK / variant+created).
+        """
+        snap = select(InventorySnapshot.as_of, InventorySnapshot.balance).where(InventorySnapshot.variant_id == variant_id)
+        if at is not None:
+            snap = snap.where(InventorySnapshot.as_of <= at)
+        snap_l = snap.order_by(InventorySnapshot.as_of.desc()).limit(1).lateral("snap")
+
+        tail = select(
+            func.coalesce(func.sum(InventoryMovement.qty_delta), 0).label("delta"),
+            func.count().label("movements"),
+        ).where(
+            InventoryMovement.variant_id == variant_id,
+            InventoryMovement.created_at >= func.coalesce(snap_l.c.as_of, literal_column("'-infinity'::timestamptz")),
+        )
+        if at is not None:
+            tail = tail.where(InventoryMovement.created_at < at)
+        return snap_l, tail.lateral("tail")
+
+    def write_snapshots(self, as_of: datetime, *, after_variant_id: int, limit: int) -> tuple[int, int]:
+        """
+        Snapshot the next `limit` variants (id order after `after_variant_id`) as of `as_of`,
+        skipping variants without movements since their previous snapshot.
+        Returns (variants scanned, last variant id).
+        """
+        ids = self.db.execute(
+            select(ProductVariant.id).where(ProductVariant.id > after_variant_id).order_by(ProductVariant.id).limit(limit),
+            execution_options=WITH_DELETED,
+        ).scalars().all()
+        if not ids:
+            return 0, after_variant_id
+        snap, tail = self._ledger_laterals(ProductVariant.id, as_of)
+        rows = (
+            select(ProductVariant.id, literal(as_of), func.coalesce(snap.c.balance, 0) + tail.c.delta)
+            .select_from(ProductVariant)
+            .outerjoin(snap, true())
+            .join(tail, true())
+            .where(ProductVariant.id >= ids[0], ProductVariant.id <= ids[-1], tail.c.movements > 0)
+        )
+        self.db.execute(
+            pg_insert(InventorySnapshot)
+            .from_select(["variant_id", "as_of", "balance"], rows)
+            .on_conflict_do_nothing()
+        )
+        return len(ids), ids[-1]
+
+    def balance_at(self, variant_id: int, at: datetime | None = None) -> tuple[int, datetime | None, int]:
+        """(balance, snapshot_as_of, movements_applied) of one variant's ledger at `at` (None = now)."""
+        snap_q = select(InventorySnapshot.as_of, InventorySnapshot.balance).where(InventorySnapshot.variant_id == variant_id)
+        if at is not None:
+            snap_q = snap_q.where(InventorySnapshot.as_of <= at)
+        snap = self.db.execute(snap_q.order_by(InventorySnapshot.as_of.desc()).limit(1)).first()
+
+        tail_q = select(func.coalesce(func.sum(InventoryMovement.qty_delta), 0), func.count()).where(
+            InventoryMovement.variant_id == variant_id
+        )
+        if snap is not None:
+            tail_q = tail_q.where(InventoryMovement.created_at >= snap.as_of)
+        if at is not None:
+            tail_q = tail_q.where(InventoryMovement.created_at < at)
+        delta, n = self.db.execute(tail_q).one()
+        return (snap.balance if snap else 0) + int(delta), (snap.as_of if snap else None), int(n)
+
+    def ledger_drift(self, *, after_variant_id: int, limit: int, product_id: int | None = None) -> tuple[Sequence[Row[Any]], int | None]:
+        """
+        Scan the next `limit` variants and return those whose stock_qty differs from the
+        ledger (nearest snapshot + later movements), plus the cursor for the next page.
+        Ledger and stock are read in one statement, so in-flight changes can't show as drift.
+        """
+        page = select(ProductVariant.id).where(ProductVariant.id > after_variant_id)
+        if product_id is not None:
+            page = page.where(ProductVariant.product_id == product_id)
+        ids = self.db.execute(page.order_by(ProductVariant.id).limit(limit), execution_options=WITH_DELETED).scalars().all()
+        if not ids:
+            return [], None
+
+        snap, tail = self._ledger_laterals(ProductVariant.id, None)
+        ledger_qty = (func.coalesce(snap.c.balance, 0) + tail.c.delta).label("ledger_qty")
+        stmt = (
+            select(
+                ProductVariant.id.label("variant_id"),
+                ProductVariant.sku,
+                ProductVariant.product_id,
+                ProductVariant.stock_qty,
+                ledger_qty,
+                (ProductVariant.stock_qty - ledger_qty).label("drift"),
+                snap.c.as_of.label("snapshot_as_of"),
+            )
+            .select_from(ProductVariant)
+            .outerjoin(snap, true())
+            .join(tail, true())
+            .where(ProductVariant.id.in_(ids), ProductVariant.stock_qty != ledger_qty)
+            .order_by(ProductVariant.id)
+        )
+        next_after = ids[-1] if len(ids) == limit else None
+        return self.db.execute(stmt, execution_options=WITH_DELETED).all(), next_after
+
+    def snapshots_cover(self, start: datetime, end: datetime) -> bool:
+        """
+        True when every movement in [start, end) is folded into a later snapshot of its
+        variant, so archiving them leaves current balances unchanged. A variant that went
+        quiet is covered by the snapshot taken after its last movement; it needs none past `end`.
+        """
+        uncovered = (
+            select(InventoryMovement.variant_id)
+            .where(
+                InventoryMovement.created_at >= start,
+                InventoryMovement.created_at < end,
+                ~select(InventorySnapshot.variant_id)
+                .where(
+                    InventorySnapshot.variant_id == InventoryMovement.variant_id,
+                    InventorySnapshot.as_of > InventoryMovement.created_at,
+                )
+                .exists(),
+            )
+            .exists()
+        )
+        return not self.db.execute(select(uncovered)).scalar()
+
     # --- movement listing ---
-    def list_movements_paged(
+    def _filtered_movements(
         self,
         *,
         variant_id: int | None,
         order_id: int | None,
         reason: InventoryMovementType | None,
+        created_from: datetime | None,
+        created_to: datetime | None,
         sort: List[str],
-        limit: int,
-        offset: int,
-    ) -> Tuple[Sequence[InventoryMovement], int]:
+    ) -> Select[tuple[InventoryMovement]]:
         stmt: Select[tuple[InventoryMovement]] = select(InventoryMovement)
         conds = []
         if variant_id is not None: conds.append(InventoryMovement.variant_id == variant_id)
         if order_id is not None:   conds.append(InventoryMovement.order_id == order_id)
         if reason is not None:     conds.append(InventoryMovement.reason == reason)
+        # created_at is the partition key: a range here prunes monthly partitions
+        if created_from is not None: conds.append(InventoryMovement.created_at >= created_from)
+        if created_to is not None:   conds.append(InventoryMovement.created_at < created_to)
         if conds: stmt = stmt.where(and_(*conds))
-        stmt = stmt.order_by(*safe_order_by(sort, ALLOWED_SORT, DEFAULT_SORT))
+        return stmt.order_by(*safe_order_by(sort, ALLOWED_SORT, DEFAULT_SORT))
+
+    def list_movements_paged(
+        self,
+        *,
+        variant_id: int | None,
+        order_id: int | None,
+        reason: InventoryMovementType | None,
+        created_from: datetime | None,
+        created_to: datetime | None,
+        sort: List[str],
+        limit: int,
+        offset: int,
+    ) -> Tuple[Sequence[InventoryMovement], int]:
+        stmt = self._filtered_movements(
+            variant_id=variant_id, order_id=order_id, reason=reason,
+            created_from=created_from, created_to=created_to, sort=sort,
+        )
         return paginate(self.db, stmt, limit, offset)
+
+    def iter_movements_export(
+        self,
+        *,
+        variant_id: int | None,
+        order_id: int | None,
+        reason: InventoryMovementType | None,
+        created_from: datetime | None,
+        created_to: datetime | None,
+        sort: List[str],
+    ) -> Iterator[Row[Any]]:
+        stmt = self._filtered_movements(
+            variant_id=variant_id, order_id=order_id, reason=reason,
+            created_from=created_from, created_to=created_to, sort=sort,
+        )
+        return stream_rows(self.db, stmt, EXPORT_COLUMNS)
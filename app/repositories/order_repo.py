@@ -1,11 +1,14 @@
 from __future__ import annotations
-from typing import Optional, List, Tuple
-from sqlalchemy import select, and_
-from sqlalchemy.orm import Session
+from typing import Any, Iterable, Iterator, Optional, List, Sequence, Tuple
+from sqlalchemy import select, update, and_, Row
+from sqlalchemy.orm import Session, selectinload, raiseload
+from sqlalchemy.orm.interfaces import LoaderOption
 from sqlalchemy.sql import Select
 
+from app.common.export import stream_rows
 from app.common.listing import paginate, safe_order_by, Col
 from app.models.order import Order, OrderItem
+from app.models.returns import ReturnRequest
 
 ALLOWED_SORT: dict[str, Col] = {
     "id": Order.id,
@@ -18,6 +21,42 @@ ALLOWED_SORT: dict[str, Col] = {
 }
 DEFAULT_SORT = ["-created_at"]
 
+EXPORT_COLUMNS: dict[str, Col] = {
+    "id": Order.id,
+    "order_number": Order.order_number,
+    "user_id": Order.user_id,
+    "status": Order.status,
+    "subtotal_cents": Order.subtotal_cents,
+    "shipping_fee_cents": Order.shipping_fee_cents,
+    "discount_cents": Order.discount_cents,
+    "total_cents": Order.total_cents,
+    "currency": Order.currency,
+    "created_at": Order.created_at,
+    "paid_at": Order.paid_at,
+    "cancelled_at": Order.cancelled_at,
+    "fulfilled_at": Order.fulfilled_at,
+    "ship_full_name": Order.ship_full_name,
+    "ship_mobile_num": Order.ship_mobile_num,
+    "ship_detail_address": Order.ship_detail_address,
+    "ship_province_name": Order.ship_province_name,
+    "ship_district_name": Order.ship_district_name,
+    "ship_ward_name": Order.ship_ward_name,
+    "ship_zip_code": Order.ship_zip_code,
+}
+
+# Eager-load profiles for order reads (?include=): one SELECT ... IN per relationship,
+# whatever the page size. Anything not included raises instead of lazy-loading per row.
+INCLUDES: dict[str, LoaderOption] = {
+    "items": selectinload(Order.items),
+    "payments": selectinload(Order.payments),
+    "shipment": selectinload(Order.shipment),
+    "returns": selectinload(Order.returns).selectinload(ReturnRequest.items),
+}
+
+
+def include_options(include: Iterable[str]) -> list[LoaderOption]:
+    return [*(INCLUDES[name] for name in dict.fromkeys(include)), raiseload("*")]
+
 
 class OrderRepository:
     """Role-agnostic persistence for orders & items. No commits here."""
@@ -28,11 +67,21 @@ class OrderRepository:
     def get(self, order_id: int) -> Optional[Order]:
         return self.db.get(Order, order_id)
 
+    def get_with(self, order_id: int, include: Iterable[str]) -> Optional[Order]:
+        """One order with the INCLUDES profiles loaded (a fresh read, like load_many)."""
+        stmt = (
+            select(Order)
+            .where(Order.id == order_id)
+            .options(*include_options(include))
+            .execution_options(populate_existing=True)
+        )
+        return self.db.execute(stmt).scalar_one_or_none()
+
     def get_by_number(self, order_number: str) -> Optional[Order]:
         stmt = select(Order).where(Order.order_number == order_number)
         return self.db.execute(stmt).scalar_one_or_none()
 
-    def list_paged(
+    def _filtered(
         self,
         *,
         user_id: int | None,
@@ -42,23 +91,110 @@ class OrderRepository:
         min_total: int | None,
         max_total: int | None,
         sort: List[str],
-        limit: int,
-        offset: int,
-    ) -> Tuple[List[Order], int]:
-        stmt: Select[tuple[Order]] = select(Order).where(Order.deleted_at.is_(None))
+    ) -> Select[tuple[Order]]:
+        stmt: Select[tuple[Order]] = select(Order)
         conds = []
         if user_id is not None: conds.append(Order.user_id == user_id)
-        if status: conds.append(Order.status.in_(status))
+        # a single status as `=` lets (status, created_at, id) return rows already in order
+        if status: conds.append(Order.status == status[0] if len(status) == 1 else Order.status.in_(status))
         if created_from is not None: conds.append(Order.created_at >= created_from)
         if created_to   is not None: conds.append(Order.created_at <= created_to)
         if min_total    is not None: conds.append(Order.total_cents >= min_total)
         if max_total    is not None: conds.append(Order.total_cents <= max_total)
 
         if conds: stmt = stmt.where(and_(*conds))
-        stmt = stmt.order_by(*safe_order_by(sort, ALLOWED_SORT, DEFAULT_SORT))
+        return stmt.order_by(*safe_order_by(sort, ALLOWED_SORT, DEFAULT_SORT))
+
+    def list_paged(
+        self,
+        *,
+        user_id: int | None,
+        status: List[str] | None,
+        created_from = None,
+        created_to = None,
+        min_total: int | None,
+        max_total: int | None,
+        sort: List[str],
+        limit: int,
+        offset: int,
+        include: Sequence[str] = (),
+    ) -> Tuple[List[Order], int]:
+        stmt = self._filtered(
+            user_id=user_id, status=status, created_from=created_from, created_to=created_to,
+            min_total=min_total, max_total=max_total, sort=sort,
+        )
+        if include:
+            stmt = stmt.options(*include_options(include))
         return paginate(self.db, stmt, limit, offset)
 
+    def iter_export(
+        self,
+        *,
+        user_id: int | None,
+        status: List[str] | None,
+        created_from = None,
+        created_to = None,
+        min_total: int | None,
+        max_total: int | None,
+        sort: List[str],
+    ) -> Iterator[Row[Any]]:
+        """Same filters/sort as list_paged, streamed as EXPORT_COLUMNS rows."""
+        stmt = self._filtered(
+            user_id=user_id, status=status, created_from=created_from, created_to=created_to,
+            min_total=min_total, max_total=max_total, sort=sort,
+        )
+        return stream_rows(self.db, stmt, EXPORT_COLUMNS)
+
+    def lock_many(self, order_ids: Iterable[int]) -> Sequence[Row[Any]]:
+        """(id, status, total_cents) of live orders, locked FOR UPDATE in id order (deadlock-free)."""
+        stmt = (
+            select(Order.id, Order.status, Order.total_cents)
+            .where(Order.id.in_(set(order_ids)))
+            .order_by(Order.id)
+            .with_for_update(of=Order)
+        )
+        return self.db.execute(stmt).all()
+
+    def lock_by_numbers(self, numbers: Iterable[str]) -> Sequence[Row[Any]]:
+        """(id, order_number, status, total_cents) of live orders by number, locked FOR UPDATE in id order."""
+        stmt = (
+            select(Order.id, Order.order_number, Order.status, Order.total_cents)
+            .where(Order.order_number.in_(set(numbers)))
+            .order_by(Order.id)
+            .with_for_update(of=Order)
+        )
+        return self.db.execute(stmt).all()
+
+    def item_lines(self, order_ids: Iterable[int]) -> Sequence[Row[Any]]:
+        """(order_id, variant_id, qty) of every item still linked to a variant."""
+        stmt = (
+            select(OrderItem.order_id, OrderItem.variant_id, OrderItem.qty)
+            .where(OrderItem.order_id.in_(set(order_ids)), OrderItem.variant_id.is_not(None))
+            .order_by(OrderItem.order_id, OrderItem.id)
+        )
+        return self.db.execute(stmt).all()
+
+    def load_many(self, order_ids: Iterable[int]) -> Sequence[Order]:
+        """Orders with items, re-read from the DB (e.g. after set_status_many)."""
+        stmt = (
+            select(Order)
+            .where(Order.id.in_(set(order_ids)))
+            .options(selectinload(Order.items))
+            .order_by(Order.id)
+            .execution_options(populate_existing=True)
+        )
+        return self.db.execute(stmt).scalars().all()
+
     # ---------- Writes ----------
+    def set_status_many(self, order_ids: Iterable[int], data: dict) -> None:
+        """One UPDATE for all orders; callers lock and validate the rows first (lock_many)."""
+        ids = set(order_ids)
+        if ids:
+            self.db.execute(
+                update(Order).where(Order.id.in_(ids)).values(**data),
+                execution_options={"synchronize_session": False},
+            )
+
     def create(self, data: dict) -> Order:
         row = Order(**data)
         self.db.add(row)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Sequence
+from sqlalchemy import select, delete, insert, and_, tuple_
+from sqlalchemy.orm import Session, aliased
+
+from app.models.outbox import OutboxEvent
+from app.db.enums import OutboxStatusEnum
+
+
+class OutboxRepository:
+    """Outbox writes ride on the caller's transaction. No commits here."""
+    def __init__(self, db: Session): self.db = db
+
+    def add(self, aggregate_type: str, aggregate_id: int, event_type: str, payload: dict[str, Any]) -> OutboxEvent:
+        row = OutboxEvent(
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            event_type=event_type,
+            payload=payload,
+        )
+        self.db.add(row)
+        return row
+
+    def add_many(self, events: Sequence[tuple[str, int, str, dict[str, Any]]]) -> None:
+        """Bulk add (executemany) of (aggregate_type, aggregate_id, event_type, payload)."""
+        if events:
+            self.db.execute(insert(OutboxEvent), [
+                {"aggregate_type": t, "aggregate_id": i, "event_type": e, "payload": p}
+                for t, i, e, p in events
+            ])
+
+    def claim_batch(self, now: datetime, limit: int) -> Sequence[OutboxEvent]:
+        """
+        Lock up to `limit` due events, in id order. First the head (oldest pending event) of
+        each aggregate is locked with SKIP LOCKED; later events stay unclaimable by other
+        relays until that head is delivered, so concurrent relays never reorder an
+        aggregate's stream. Then, for the heads we hold, the run of due events behind them
+        (up to the first one still backing off) fills the rest of the batch, so a busy
+        aggregate drains a batch per tick instead of one event.
+        """
+        older = aliased(OutboxEvent)
+        same_aggregate = and_(
+            older.aggregate_type == OutboxEvent.aggregate_type,
+            older.aggregate_id == OutboxEvent.aggregate_id,
+            older.status == OutboxStatusEnum.pending,
+            older.id < OutboxEvent.id,
+        )
+        heads_stmt = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.status == OutboxStatusEnum.pending,
+                OutboxEvent.available_at <= now,
+                ~select(older.id).where(same_aggregate).exists(),
+            )
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        heads = list(self.db.execute(heads_stmt).scalars().all())
+        room = limit - len(heads)
+        if not heads or room <= 0:
+            return heads
+
+        run_stmt = (
+            select(OutboxEvent)
+            .where(
+                tuple_(OutboxEvent.aggregate_type, OutboxEvent.aggregate_id).in_(
+                    {(h.aggregate_type, h.aggregate_id) for h in heads}
+                ),
+                OutboxEvent.id.notin_([h.id for h in heads]),
+                OutboxEvent.status == OutboxStatusEnum.pending,
+                OutboxEvent.available_at <= now,
+                ~select(older.id).where(same_aggregate, older.available_at > now).exists(),
+            )
+            .order_by(OutboxEvent.id)
+            .limit(room)
+            .with_for_update()
+        )
+        run = self.db.execute(run_stmt).scalars().all()
+        return sorted([*heads, *run], key=lambda e: e.id)
+
+    def purge_processed(self, before: datetime, limit: int) -> int:
+        due = (
+            select(OutboxEvent.id)
+            .where(OutboxEvent.status == OutboxStatusEnum.done, OutboxEvent.processed_at < before)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        res = self.db.execute(
+            delete(OutboxEvent).where(OutboxEvent.id.in_(due)),
+            execution_options={"synchronize_session": False},
+        )
+        return res.rowcount or 0
@@ -0,0 +1,34 @@
+from __future__ import annotations
+from typing import Any, Sequence
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.enums import PaymentCallbackStatusEnum
+from app.models.payment import PaymentCallback
+
+
+class PaymentCallbackRepository:
+    """Gateway callback inbox. No commits here."""
+    def __init__(self, db: Session): self.db = db
+
+    def add(self, data: dict[str, Any]) -> bool:
+        """Store a callback unless (provider, transaction_ref) is already in; True if it is new."""
+        stmt = (
+            pg_insert(PaymentCallback)
+            .values(**data)
+            .on_conflict_do_nothing(index_elements=[PaymentCallback.provider, PaymentCallback.transaction_ref])
+            .returning(PaymentCallback.id)
+        )
+        return self.db.execute(stmt).scalar() is not None
+
+    def claim_pending(self, limit: int) -> Sequence[PaymentCallback]:
+        """Lock up to `limit` pending callbacks, oldest first; concurrent processors skip them."""
+        stmt = (
+            select(PaymentCallback)
+            .where(PaymentCallback.status == PaymentCallbackStatusEnum.pending)
+            .order_by(PaymentCallback.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return self.db.execute(stmt).scalars().all()
@@ -1,10 +1,11 @@
 from __future__ import annotations
-from typing import Optional, Sequence, Tuple, List
-from sqlalchemy import select, func, and_
+from typing import Any, Iterable, Optional, Sequence, Tuple, List
+from sqlalchemy import select, func, and_, insert, Row
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import Select
 
 from app.common.listing import paginate, safe_order_by, Col
+from app.models.order import Order
 from app.models.payment import Payment
 from app.db.enums import PaymentStatusEnum, PaymentMethodEnum
 
@@ -35,6 +36,35 @@ class PaymentRepository:
         )
         return int(self.db.execute(stmt).scalar_one())
 
+    def by_refs(self, refs: Iterable[str], *, method: PaymentMethodEnum) -> Sequence[Row[Any]]:
+        """
+        (id, order_id, order_number, transaction_ref, amount_cents, status) of every `method`
+        payment carrying one of the refs (refs are only unique per gateway).
+        """
+        refs = set(refs)
+        if not refs:
+            return []
+        stmt = (
+            select(
+                Payment.id, Payment.order_id, Order.order_number, Payment.transaction_ref,
+                Payment.amount_cents, Payment.status,
+            )
+            .join(Order, Order.id == Payment.order_id)
+            .where(Payment.method == method, Payment.transaction_ref.in_(refs))
+            .order_by(Payment.id)
+        )
+        return self.db.execute(stmt).all()
+
+    def paid_refs(self, refs: Iterable[str], *, method: PaymentMethodEnum) -> set[str]:
+        """The given transaction refs of gateway `method` that already have a paid payment."""
+        refs = set(refs)
+        if not refs:
+            return set()
+        stmt = select(Payment.transaction_ref).where(
+            Payment.method == method, Payment.transaction_ref.in_(refs), Payment.status == PaymentStatusEnum.paid
+        )
+        return set(self.db.execute(stmt).scalars().all())
+
     def list_paged(
         self,
         *,
@@ -59,5 +89,10 @@ class PaymentRepository:
         row = Payment(order_id=order_id, amount_cents=amount_cents, status=status, method=method, transaction_ref=transaction_ref)
         self.db.add(row); return row
 
+    def create_many(self, rows: list[dict]) -> None:
+        """Bulk insert (executemany) of payment rows."""
+        if rows:
+            self.db.execute(insert(Payment), rows)
+
     def save(self, row: Payment) -> None:
         self.db.add(row)
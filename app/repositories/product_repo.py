@@ -1,10 +1,12 @@
 from __future__ import annotations
-from typing import Optional, List, Sequence, Tuple
-from sqlalchemy import select, and_
+from typing import Any, Iterable, Optional, List, Sequence, Tuple
+from sqlalchemy import select, and_, or_, event, func, literal_column, tuple_, update, values, column, Integer, Row
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import Select
 
 from app.common.listing import paginate, safe_order_by, ilike_any, Col
+from app.db.soft_delete import WITH_DELETED
 from app.models.catalog import (
     Product, ProductVariant, ProductImage, ProductCategory
 )
@@ -13,7 +15,10 @@ ALLOWED_SORT: dict[str, Col] = {
     "id": Product.id,
     "name": Product.name,
     "slug": Product.slug,
-    "price": Product.base_price_cents,
+    "price": Product.min_price_cents,       # effective "from" price
+    "max_price": Product.max_price_cents,
+    "base_price": Product.base_price_cents,
+    "total_stock": Product.total_stock,
     "created_at": Product.created_at,
     "updated_at": Product.updated_at,
     "is_active": Product.is_active,
@@ -21,6 +26,78 @@ ALLOWED_SORT: dict[str, Col] = {
 }
 DEFAULT_SORT = ["-created_at"]
 
+_PENDING_STOCK = "pending_product_stock"
+
+# Postgres takes at most 65535 bind parameters per statement; multi-row VALUES are split below it
+MAX_BIND_PARAMS = 65535
+
+
+def _chunks(rows: list[dict[str, Any]]) -> Iterable[list[dict[str, Any]]]:
+    size = MAX_BIND_PARAMS // len(rows[0])
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def queue_product_stock(db: Session, product_id: int, qty_delta: int) -> None:
+    """
+    Defer a products.total_stock change to commit. All deltas of a transaction are then
+    applied in one statement, in product-id order, so concurrent checkouts touching the
+    same products in different orders cannot deadlock on the product rows. A zero net delta
+    (reservation change) only re-evaluates in_stock and writes the row only if it flips.
+
+    Deltas are kept per (sub)transaction: a released SAVEPOINT hands its deltas to the
+    enclosing transaction, a rolled-back one drops them.
+    """
+    tx = db.get_nested_transaction() or db.get_transaction()
+    pending = db.info.setdefault(_PENDING_STOCK, {}).setdefault(tx, {})
+    pending[product_id] = pending.get(product_id, 0) + qty_delta
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_pending_stock(session: Session) -> None:
+    by_tx = session.info.get(_PENDING_STOCK)
+    if not by_tx:
+        return
+    tx = session.get_nested_transaction() or session.get_transaction()
+    if tx is not None and tx.nested:
+        # savepoint release: the deltas now belong to the enclosing transaction
+        own = by_tx.pop(tx, None)
+        if own:
+            parent = by_tx.setdefault(tx.parent, {})
+            for pid, d in own.items():
+                parent[pid] = parent.get(pid, 0) + d
+        return
+    session.info.pop(_PENDING_STOCK, None)
+    total: dict[int, int] = {}
+    for deltas in by_tx.values():
+        for pid, d in deltas.items():
+            total[pid] = total.get(pid, 0) + d
+    ProductRepository(session).apply_stock_deltas(total)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_pending_stock(session: Session, transaction) -> None:
+    # whatever is still queued for an ended transaction was rolled back (commits drained it)
+    by_tx = session.info.get(_PENDING_STOCK)
+    if by_tx is None:
+        return
+    by_tx.pop(transaction, None)
+    if transaction.parent is None or not by_tx:
+        session.info.pop(_PENDING_STOCK, None)
+
+
+def _has_available():
+    """in_stock: some live variant has stock that is not reserved (stock_qty > reserved_qty)."""
+    return (
+        select(ProductVariant.id)
+        .where(
+            ProductVariant.product_id == Product.id,
+            ProductVariant.deleted_at.is_(None),
+            ProductVariant.stock_qty > ProductVariant.reserved_qty,
+        )
+        .exists()
+    )
+
 
 class ProductRepository:
     """Role-agnostic persistence utilities for products/variants/images. No commits here."""
@@ -31,9 +108,18 @@ class ProductRepository:
     def get(self, product_id: int) -> Optional[Product]:
         return self.db.get(Product, product_id)
 
+    def visible_by_ids(self, product_ids: Iterable[int]) -> Sequence[Product]:
+        """Storefront-visible products among `product_ids` (one IN query; order not kept)."""
+        ids = set(product_ids)
+        if not ids:
+            return []
+        stmt = select(Product).where(Product.id.in_(ids), Product.is_active.is_(True), Product.is_archived.is_(False))
+        return self.db.execute(stmt).scalars().all()
+
     def get_by_slug(self, slug: str) -> Optional[Product]:
-        stmt = select(Product).where(Product.slug == slug, Product.deleted_at.is_(None))
-        return self.db.execute(stmt).scalar_one_or_none()
+        """Deleted rows included: slugs are unique across the whole table."""
+        stmt = select(Product).where(Product.slug == slug)
+        return self.db.execute(stmt, execution_options=WITH_DELETED).scalar_one_or_none()
 
     def list_paged(
         self,
@@ -46,10 +132,11 @@ class ProductRepository:
         price_min: int | None,
         price_max: int | None,
         sort: List[str],
+        in_stock: bool | None = None,
         limit: int,
         offset: int,
     ) -> Tuple[List[Product], int]:
-        stmt: Select[tuple[Product]] = select(Product).where(Product.deleted_at.is_(None))
+        stmt: Select[tuple[Product]] = select(Product)
 
         conds = []
         if q:
@@ -64,10 +151,13 @@ class ProductRepository:
             conds.append(Product.is_active == is_active)
         if is_archived is not None:
             conds.append(Product.is_archived == is_archived)
+        # price filters match products whose variant price range overlaps [price_min, price_max]
         if price_min is not None:
-            conds.append(Product.base_price_cents >= price_min)
+            conds.append(Product.max_price_cents >= price_min)
         if price_max is not None:
-            conds.append(Product.base_price_cents <= price_max)
+            conds.append(Product.min_price_cents <= price_max)
+        if in_stock is not None:
+            conds.append(Product.in_stock == in_stock)
 
         if conds:
             stmt = stmt.where(and_(*conds))
@@ -90,17 +180,104 @@ class ProductRepository:
     def delete(self, row: Product) -> None:
         self.db.delete(row)
 
+    # ---------- Listing denormalization (no commit) ----------
+    def refresh_listing(self, product_ids: Iterable[int]) -> None:
+        """Recompute min/max effective price and total stock of products from their live variants."""
+        ids = sorted(set(product_ids))
+        if not ids:
+            return
+        self.db.flush()
+        for pending in (self.db.info.get(_PENDING_STOCK) or {}).values():
+            for pid in ids:
+                pending.pop(pid, None)  # the recompute already includes them
+
+        live = and_(ProductVariant.product_id == Product.id, ProductVariant.deleted_at.is_(None))
+        price = func.coalesce(ProductVariant.price_cents, Product.base_price_cents)
+
+        def agg(expr):
+            return select(expr).where(live).scalar_subquery()
+
+        self.db.execute(
+            update(Product)
+            .where(Product.id.in_(ids))
+            .values(
+                min_price_cents=func.coalesce(agg(func.min(price)), Product.base_price_cents),
+                max_price_cents=func.coalesce(agg(func.max(price)), Product.base_price_cents),
+                total_stock=func.coalesce(agg(func.sum(ProductVariant.stock_qty)), 0),
+                in_stock=_has_available(),
+            ),
+            execution_options={"synchronize_session": False},
+        )
+
+    def apply_stock_deltas(self, deltas: dict[int, int]) -> None:
+        """
+        Add stock deltas to products.total_stock and re-evaluate in_stock (rows locked in id
+        order first). Products with a zero net delta are written only when in_stock flips, so
+        a reservation commit does not lock its product row for nothing.
+        """
+        moved = {pid: d for pid, d in deltas.items() if d}
+        unchanged = [pid for pid, d in deltas.items() if not d]
+        if unchanged:
+            flipped = self.db.execute(
+                select(Product.id).where(Product.id.in_(unchanged), Product.in_stock.is_distinct_from(_has_available())),
+                execution_options=WITH_DELETED,
+            ).scalars()
+            moved.update(dict.fromkeys(flipped, 0))
+        items = sorted(moved.items())
+        if not items:
+            return
+        # lock before the UPDATE so its in_stock subquery sees variants committed by whoever
+        # held the product rows before us (READ COMMITTED takes a new snapshot per statement)
+        self.db.execute(
+            select(Product.id).where(Product.id.in_([pid for pid, _ in items])).order_by(Product.id).with_for_update()
+        )
+        d = values(column("id", Integer), column("delta", Integer), name="d").data(items)
+        self.db.execute(
+            update(Product)
+            .where(Product.id == d.c.id)
+            # stock movement is not a product edit: keep updated_at
+            .values(total_stock=Product.total_stock + d.c.delta, in_stock=_has_available(), updated_at=Product.updated_at),
+            execution_options={"synchronize_session": False},
+        )
+
     # ---------- Variants ----------
     def get_variant(self, variant_id: int) -> Optional[ProductVariant]:
         return self.db.get(ProductVariant, variant_id)
 
     def list_variants(self, product_id: int) -> Sequence[ProductVariant]:
-        stmt = select(ProductVariant).where(
-            ProductVariant.product_id == product_id,
-            ProductVariant.deleted_at.is_(None)
-        ).order_by(ProductVariant.created_at.desc())
+        """Live variants of a live product; joining Product lets the soft-delete filter hide both."""
+        stmt = (
+            select(ProductVariant)
+            .join(Product, Product.id == ProductVariant.product_id)
+            .where(ProductVariant.product_id == product_id)
+            .order_by(ProductVariant.created_at.desc())
+        )
         return self.db.execute(stmt).scalars().all()
 
+    def variant_availability(self, *, variant_ids: Iterable[int] = (), skus: Iterable[str] = ()) -> Sequence[Row[Any]]:
+        """
+        (id, sku, product_id, stock_qty, reserved_qty, price_cents) of sellable variants by id
+        or SKU: one query over the pk and unique sku indexes, no ORM entities.
+        """
+        ids, skus = set(variant_ids), set(skus)
+        conds = []
+        if ids:
+            conds.append(ProductVariant.id.in_(ids))
+        if skus:
+            conds.append(ProductVariant.sku.in_(skus))
+        if not conds:
+            return []
+        stmt = (
+            select(
+                ProductVariant.id, ProductVariant.sku, ProductVariant.product_id,
+                ProductVariant.stock_qty, ProductVariant.reserved_qty,
+                func.coalesce(ProductVariant.price_cents, Product.base_price_cents).label("price_cents"),
+            )
+            .join(Product, Product.id == ProductVariant.product_id)
+            .where(or_(*conds), Product.is_active.is_(True), Product.is_archived.is_(False))
+        )
+        return self.db.execute(stmt).all()
+
     def create_variant(self, product_id: int, data: dict) -> ProductVariant:
         row = ProductVariant(product_id=product_id, **data)
         self.db.add(row)
@@ -138,3 +315,101 @@ class ProductRepository:
 
     def delete_image(self, row: ProductImage) -> None:
         self.db.delete(row)
+
+    # ---------- Bulk upserts (imports; no commit) ----------
+    def upsert_products(self, rows: list[dict[str, Any]]) -> dict[str, int]:
+        """
+        INSERT ... ON CONFLICT (slug) DO UPDATE for many products. Returns slug -> id.
+        Soft-deleted products are left alone and their slugs are missing from the result.
+        """
+        if not rows:
+            return {}
+        ins = pg_insert(Product).values(rows)
+        updatable = [k for k in rows[0] if k != "slug"]
+        stmt = ins.on_conflict_do_update(
+            index_elements=[Product.slug],
+            set_={**{k: ins.excluded[k] for k in updatable}, "updated_at": func.now()},
+            where=Product.deleted_at.is_(None),
+        ).returning(Product.slug, Product.id)
+        return {slug: pid for slug, pid in self.db.execute(stmt).all()}
+
+    def conflicting_variant_skus(self, keys: Iterable[tuple[int, str, str, str]]) -> dict[tuple[int, str, str], str]:
+        """
+        For (product_id, color, size, sku) keys, find existing variants holding the same
+        (product_id, color, size) under a different SKU. Returns (product_id, color, size) -> that SKU.
+        """
+        keys = [k for k in keys if k[1] is not None and k[2] is not None]
+        if not keys:
+            return {}
+        stmt = select(ProductVariant.product_id, ProductVariant.color, ProductVariant.size, ProductVariant.sku).where(
+            tuple_(ProductVariant.product_id, ProductVariant.color, ProductVariant.size).in_([k[:3] for k in keys])
+        )
+        wanted = {k[:3]: k[3] for k in keys}
+        return {
+            (pid, color, size): sku
+            for pid, color, size, sku in self.db.execute(stmt, execution_options=WITH_DELETED).all()  # constraint spans deleted rows
+            if wanted.get((pid, color, size)) != sku
+        }
+
+    def upsert_variants(self, rows: list[dict[str, Any]]) -> Sequence[Row[Any]]:
+        """
+        INSERT ... ON CONFLICT (sku) DO UPDATE. Stock is only set for new SKUs (existing stock
+        moves through the ledger) and a SKU never moves between products. Returns
+        (id, sku, stock_qty, inserted) per row written; SKUs of another product or
+        soft-deleted ones are skipped (see `variant_owners`).
+        """
+        if not rows:
+            return []
+        ins = pg_insert(ProductVariant).values(rows)
+        updatable = [k for k in rows[0] if k not in {"sku", "stock_qty", "product_id"}]
+        stmt = ins.on_conflict_do_update(
+            index_elements=[ProductVariant.sku],
+            set_={**{k: ins.excluded[k] for k in updatable}, "updated_at": func.now()},
+            where=and_(
+                ProductVariant.product_id == ins.excluded.product_id,
+                ProductVariant.deleted_at.is_(None),
+            ),
+        ).returning(
+            ProductVariant.id,
+            ProductVariant.sku,
+            ProductVariant.stock_qty,
+            literal_column("(xmax = 0)").label("inserted"),
+        )
+        return self.db.execute(stmt).all()
+
+    def variant_owners(self, skus: Iterable[str]) -> dict[str, tuple[int, bool]]:
+        """sku -> (product_id, is_deleted) for existing variants, soft-deleted ones included."""
+        skus = set(skus)
+        if not skus:
+            return {}
+        stmt = select(ProductVariant.sku, ProductVariant.product_id, ProductVariant.deleted_at.is_not(None)).where(
+            ProductVariant.sku.in_(skus)
+        )
+        return {sku: (pid, deleted) for sku, pid, deleted in self.db.execute(stmt, execution_options=WITH_DELETED).all()}
+
+    def upsert_images(self, rows: list[dict[str, Any]]) -> None:
+        """Upsert (product_id, url) images; a new primary demotes the product's previous one."""
+        if not rows:
+            return
+        with_primary = {r["product_id"] for r in rows if r["is_primary"]}
+        if with_primary:
+            self.db.execute(
+                update(ProductImage)
+                .where(ProductImage.product_id.in_(with_primary), ProductImage.is_primary.is_(True))
+                .values(is_primary=False),
+                execution_options={"synchronize_session": False},
+            )
+        for chunk in _chunks(rows):  # a row can carry many images
+            ins = pg_insert(ProductImage).values(chunk)
+            self.db.execute(
+                ins.on_conflict_do_update(
+                    constraint="uq_product_image_url",
+                    set_={"is_primary": ins.excluded.is_primary, "sort_order": ins.excluded.sort_order, "updated_at": func.now()},
+                )
+            )
+
+    def add_categories(self, pairs: Iterable[tuple[int, int]]) -> None:
+        rows = [{"product_id": p, "category_id": c} for p, c in set(pairs)]
+        if rows:
+            for chunk in _chunks(rows):
+                self.db.execute(pg_insert(ProductCategory).values(chunk).on_conflict_do_nothing())
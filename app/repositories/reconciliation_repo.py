@@ -0,0 +1,114 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Iterable, Optional, Sequence, Tuple
+from sqlalchemy import select, insert, update, delete, func, literal, bindparam, text, table, column, String, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.common.listing import paginate
+from app.db.enums import PaymentStatusEnum, PaymentMethodEnum, ReconcileMismatchEnum
+from app.models.payment import Payment
+from app.models.reconciliation import PaymentReconciliation, PaymentReconciliationItem
+
+# refs of the file being reconciled; a temp table lives only in the scanning transaction
+_SEEN = table("settlement_refs", column("transaction_ref", String))
+
+
+class ReconciliationRepository:
+    """Settlement reconciliation runs and their mismatches. No commits here."""
+    def __init__(self, db: Session): self.db = db
+
+    def get(self, reconciliation_id: int) -> Optional[PaymentReconciliation]:
+        return self.db.get(PaymentReconciliation, reconciliation_id)
+
+    def create(self, data: dict) -> PaymentReconciliation:
+        row = PaymentReconciliation(**data)
+        self.db.add(row)
+        return row
+
+    def save(self, row: PaymentReconciliation) -> None:
+        self.db.add(row)
+
+    def add_items(self, reconciliation_id: int, items: Sequence[dict[str, Any]]) -> None:
+        if items:
+            self.db.execute(insert(PaymentReconciliationItem), [{"reconciliation_id": reconciliation_id, **i} for i in items])
+
+    def clear_items(self, reconciliation_id: int) -> None:
+        self.db.execute(delete(PaymentReconciliationItem).where(PaymentReconciliationItem.reconciliation_id == reconciliation_id))
+
+    def list_items_paged(
+        self, reconciliation_id: int, *, kind: list[str] | None, limit: int, offset: int
+    ) -> Tuple[list[PaymentReconciliationItem], int]:
+        stmt = select(PaymentReconciliationItem).where(PaymentReconciliationItem.reconciliation_id == reconciliation_id)
+        if kind:
+            stmt = stmt.where(PaymentReconciliationItem.kind.in_(kind))
+        return paginate(self.db, stmt.order_by(PaymentReconciliationItem.kind, PaymentReconciliationItem.id), limit, offset)
+
+    def fix_candidates(self, reconciliation_id: int, *, after_id: int, limit: int) -> Sequence[PaymentReconciliationItem]:
+        """Unfixed missing_payment items that name an order, in id order (keyset batches)."""
+        stmt = (
+            select(PaymentReconciliationItem)
+            .where(
+                PaymentReconciliationItem.reconciliation_id == reconciliation_id,
+                PaymentReconciliationItem.kind == ReconcileMismatchEnum.missing_payment,
+                PaymentReconciliationItem.fixed.is_(False),
+                PaymentReconciliationItem.order_number.is_not(None),
+                PaymentReconciliationItem.id > after_id,
+            )
+            .order_by(PaymentReconciliationItem.id)
+            .limit(limit)
+        )
+        return self.db.execute(stmt).scalars().all()
+
+    def mark_fixed(self, item_ids: Iterable[int], note: str) -> None:
+        ids = set(item_ids)
+        if ids:
+            self.db.execute(
+                update(PaymentReconciliationItem).where(PaymentReconciliationItem.id.in_(ids)).values(fixed=True, note=note),
+                execution_options={"synchronize_session": False},
+            )
+
+    # --- file refs seen so far (duplicate rows / unsettled payments) ---
+    def create_seen_table(self) -> None:
+        self.db.execute(text(
+            "CREATE TEMP TABLE IF NOT EXISTS settlement_refs (transaction_ref varchar(255) PRIMARY KEY) ON COMMIT DROP"
+        ))
+
+    def mark_seen(self, refs: Iterable[str]) -> set[str]:
+        """Record refs; returns those not seen before (the rest are duplicates)."""
+        refs = list(set(refs))
+        if not refs:
+            return set()
+        # one array parameter instead of a VALUES row per ref keeps the statement cacheable
+        stmt = (
+            pg_insert(_SEEN)
+            .from_select(["transaction_ref"], select(func.unnest(bindparam("refs", type_=ARRAY(String)))))
+            .on_conflict_do_nothing()
+            .returning(_SEEN.c.transaction_ref)
+        )
+        return set(self.db.execute(stmt, {"refs": refs}).scalars().all())
+
+    def add_unsettled(
+        self, reconciliation_id: int, method: PaymentMethodEnum, period_from: datetime, period_to: datetime
+    ) -> int:
+        """One INSERT ... SELECT: paid payments of `method` in the period whose ref the file lacks."""
+        src = (
+            select(
+                literal(reconciliation_id, Integer), literal(ReconcileMismatchEnum.unsettled.value, String),
+                Payment.transaction_ref, Payment.id, Payment.order_id, Payment.amount_cents,
+            )
+            .where(
+                Payment.method == method,
+                Payment.status == PaymentStatusEnum.paid,
+                Payment.created_at >= period_from,
+                Payment.created_at < period_to,
+                ~select(_SEEN.c.transaction_ref).where(_SEEN.c.transaction_ref == Payment.transaction_ref).exists(),
+            )
+        )
+        res = self.db.execute(
+            insert(PaymentReconciliationItem).from_select(
+                ["reconciliation_id", "kind", "transaction_ref", "payment_id", "order_id", "expected_cents"], src,
+            )
+        )
+        return res.rowcount or 0
@@ -0,0 +1,101 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Iterator, Optional, Sequence
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.enums import OrderStatusEnum
+from app.models.catalog import Product, ProductCategory
+from app.models.order import Order, OrderItem
+from app.models.recommendation import ProductRelated, RecentlyViewed
+
+_VISIBLE = (Product.deleted_at.is_(None), Product.is_active.is_(True), Product.is_archived.is_(False))
+_PURCHASED = (OrderStatusEnum.paid, OrderStatusEnum.fulfilled)
+
+
+class RelatedRepository:
+    """Related-product lists (written by the products.related job) and recently viewed products. No commits here."""
+    def __init__(self, db: Session): self.db = db
+
+    def get(self, product_id: int) -> Optional[ProductRelated]:
+        return self.db.get(ProductRelated, product_id)
+
+    # ---------- job inputs ----------
+    def purchase_rows(self, since: datetime, *, chunk: int) -> Iterator[Sequence[Any]]:
+        """Distinct (order_id, product_id) of paid/fulfilled orders since `since`, ordered by order, streamed in chunks."""
+        stmt = (
+            select(OrderItem.order_id, OrderItem.product_id)
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(Order.status.in_(_PURCHASED), Order.created_at >= since, OrderItem.product_id.is_not(None))
+            .distinct()
+            .order_by(OrderItem.order_id, OrderItem.product_id)
+        )
+        yield from self.db.execute(stmt, execution_options={"yield_per": chunk}).partitions()
+
+    def visible_features(self) -> Sequence[Any]:
+        """(id, brand_id, listing price) of every visible product."""
+        stmt = select(
+            Product.id, Product.brand_id, func.coalesce(Product.min_price_cents, Product.base_price_cents),
+        ).where(*_VISIBLE)
+        return self.db.execute(stmt).all()
+
+    def visible_categories(self) -> Sequence[Any]:
+        """(product_id, category_id) links of visible products."""
+        stmt = (
+            select(ProductCategory.product_id, ProductCategory.category_id)
+            .join(Product, Product.id == ProductCategory.product_id)
+            .where(*_VISIBLE)
+        )
+        return self.db.execute(stmt).all()
+
+    # ---------- job outputs ----------
+    def upsert_many(self, rows: Sequence[dict[str, Any]]) -> None:
+        """rows: {product_id, also_bought_ids, similar_ids, computed_at}."""
+        if not rows:
+            return
+        ins = pg_insert(ProductRelated)
+        ins = ins.on_conflict_do_update(
+            index_elements=[ProductRelated.product_id],
+            set_={"also_bought_ids": ins.excluded.also_bought_ids, "similar_ids": ins.excluded.similar_ids,
+                  "computed_at": ins.excluded.computed_at},
+        )
+        self.db.execute(ins, list(rows))
+
+    def drop_stale(self, before: datetime) -> int:
+        """Delete lists the last run did not rewrite (products that are hidden or lost all neighbours)."""
+        res = self.db.execute(
+            delete(ProductRelated).where(ProductRelated.computed_at < before),
+            execution_options={"synchronize_session": False},
+        )
+        return res.rowcount or 0
+
+    # ---------- recently viewed ----------
+    def record_view(self, user_id: int, product_id: int, *, keep: int) -> None:
+        ins = pg_insert(RecentlyViewed).values(user_id=user_id, product_id=product_id, viewed_at=func.now())
+        self.db.execute(ins.on_conflict_do_update(
+            index_elements=[RecentlyViewed.user_id, RecentlyViewed.product_id],
+            set_={"viewed_at": ins.excluded.viewed_at},
+        ))
+        # trim past `keep`; the (user_id, viewed_at) index serves both the offset scan and the reads
+        cutoff = (
+            select(RecentlyViewed.viewed_at)
+            .where(RecentlyViewed.user_id == user_id)
+            .order_by(RecentlyViewed.viewed_at.desc())
+            .offset(keep - 1)
+            .limit(1)
+            .scalar_subquery()
+        )
+        self.db.execute(
+            delete(RecentlyViewed).where(RecentlyViewed.user_id == user_id, RecentlyViewed.viewed_at < cutoff),
+            execution_options={"synchronize_session": False},
+        )
+
+    def recent_ids(self, user_id: int, limit: int) -> list[int]:
+        stmt = (
+            select(RecentlyViewed.product_id)
+            .where(RecentlyViewed.user_id == user_id)
+            .order_by(RecentlyViewed.viewed_at.desc())
+            .limit(limit)
+        )
+        return list(self.db.execute(stmt).scalars().all())
@@ -0,0 +1,210 @@
+from __future__ import annotations
+from datetime import date, datetime
+from typing import Any, Iterable, Literal, Sequence
+from sqlalchemy import select, delete, insert, func, literal, union_all, Row
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.catalog import Brand, Category, Product, ProductCategory
+from app.models.order import Order, OrderItem
+from app.models.payment import Payment
+from app.models.report import SalesHourly, SalesDaily, ProductSalesDaily, SalesRollupDirty
+from app.db.enums import PaymentStatusEnum
+from app.db.soft_delete import WITH_DELETED
+from app.utils.dates import day_window
+
+BreakdownBy = Literal["product", "variant", "brand", "category"]
+
+_TOTALS = (
+    "orders_placed", "orders_paid", "orders_cancelled", "orders_refunded",
+    "gross_cents", "revenue_cents", "refunded_cents", "units_sold",
+)
+_PRODUCT_MEASURES = ("units_sold", "revenue_cents", "units_refunded", "refunded_cents")
+
+
+class SalesReportRepository:
+    """Sales rollup tables: refresh from orders/payments and range reads. No commits here."""
+    def __init__(self, db: Session): self.db = db
+
+    # ---------- dirty queue ----------
+    def mark_dirty(self, days: Iterable[date]) -> None:
+        rows = [{"day": d} for d in set(days)]
+        if rows:
+            self.db.execute(pg_insert(SalesRollupDirty).values(rows).on_conflict_do_nothing())
+
+    def pop_dirty(self, limit: int) -> list[date]:
+        due = (
+            select(SalesRollupDirty.day)
+            .order_by(SalesRollupDirty.day)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = delete(SalesRollupDirty).where(SalesRollupDirty.day.in_(due)).returning(SalesRollupDirty.day)
+        return list(self.db.execute(stmt, execution_options={"synchronize_session": False}).scalars())
+
+    # ---------- refresh ----------
+    def refresh_day(self, day: date) -> None:
+        """Recompute hourly, daily and per-SKU rows of one reporting day from the source tables."""
+        start, end = day_window(day)
+        self._refresh_hourly(start, end)
+        self._refresh_daily(day, start, end)
+        self._refresh_products(day, start, end)
+
+    def _refresh_hourly(self, start: datetime, end: datetime) -> None:
+        tz = settings.REPORTS_TIMEZONE
+        units = (
+            select(func.coalesce(func.sum(OrderItem.qty), 0))
+            .where(OrderItem.order_id == Order.id)
+            .scalar_subquery()
+        )
+
+        def leg(ts: Any, **measures: Any):
+            # one row per transition; unspecified measures are 0
+            return select(ts.label("ts"), *[
+                (measures[n] if n in measures else literal(0)).label(n) for n in _TOTALS
+            ])
+
+        placed = leg(Order.created_at, orders_placed=literal(1), gross_cents=Order.total_cents).where(
+            Order.created_at >= start, Order.created_at < end
+        )
+        paid = leg(Order.paid_at, orders_paid=literal(1), revenue_cents=Order.total_cents, units_sold=units).where(
+            Order.paid_at >= start, Order.paid_at < end
+        )
+        cancelled = leg(Order.cancelled_at, orders_cancelled=literal(1)).where(
+            Order.cancelled_at >= start, Order.cancelled_at < end
+        )
+        # one row per refunded order (at its first refund in the window), however many refund payments it has
+        refunded = (
+            leg(func.min(Payment.created_at), orders_refunded=literal(1), refunded_cents=func.sum(Payment.amount_cents))
+            .where(
+                Payment.status == PaymentStatusEnum.refunded,
+                Payment.created_at >= start, Payment.created_at < end,
+            )
+            .group_by(Payment.order_id)
+        )
+        ev = union_all(placed, paid, cancelled, refunded).subquery("ev")
+        bucket = func.timezone(tz, func.date_trunc("hour", func.timezone(tz, ev.c.ts))).label("bucket_start")
+        per_hour = select(bucket, *[func.sum(ev.c[n]).label(n) for n in _TOTALS]).group_by(bucket)
+
+        self.db.execute(delete(SalesHourly).where(SalesHourly.bucket_start >= start, SalesHourly.bucket_start < end))
+        self.db.execute(insert(SalesHourly).from_select(["bucket_start", *_TOTALS], per_hour))
+
+    def _refresh_daily(self, day: date, start: datetime, end: datetime) -> None:
+        totals = (
+            select(literal(day).label("day"), *[func.sum(getattr(SalesHourly, n)) for n in _TOTALS])
+            .where(SalesHourly.bucket_start >= start, SalesHourly.bucket_start < end)
+            .having(func.count() > 0)
+        )
+        self.db.execute(delete(SalesDaily).where(SalesDaily.day == day))
+        self.db.execute(insert(SalesDaily).from_select(["day", *_TOTALS], totals))
+
+    def _refresh_products(self, day: date, start: datetime, end: datetime) -> None:
+        def leg(**measures: Any):
+            return select(
+                OrderItem.sku.label("sku"),
+                OrderItem.variant_id.label("variant_id"),
+                OrderItem.product_id.label("product_id"),
+                *[(measures[n] if n in measures else literal(0)).label(n) for n in _PRODUCT_MEASURES],
+            )
+
+        sold = (
+            leg(units_sold=OrderItem.qty, revenue_cents=OrderItem.line_total_cents)
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(Order.paid_at >= start, Order.paid_at < end)
+        )
+        # EXISTS, not a join: an order with several refund payments still refunds each line once
+        refunded_in_window = (
+            select(Payment.id)
+            .where(
+                Payment.order_id == OrderItem.order_id,
+                Payment.status == PaymentStatusEnum.refunded,
+                Payment.created_at >= start, Payment.created_at < end,
+            )
+            .exists()
+        )
+        refunds = leg(units_refunded=OrderItem.qty, refunded_cents=OrderItem.line_total_cents).where(refunded_in_window)
+        u = union_all(sold, refunds).subquery("u")
+        per_sku = (
+            select(
+                u.c.sku,
+                func.max(u.c.variant_id).label("variant_id"),
+                func.max(u.c.product_id).label("product_id"),
+                *[func.sum(u.c[n]).label(n) for n in _PRODUCT_MEASURES],
+            )
+            .group_by(u.c.sku)
+            .subquery("per_sku")
+        )
+        rows = (
+            select(
+                literal(day), per_sku.c.sku, per_sku.c.variant_id, per_sku.c.product_id, Product.brand_id,
+                *[per_sku.c[n] for n in _PRODUCT_MEASURES],
+            )
+            .outerjoin(Product, Product.id == per_sku.c.product_id)
+        )
+        self.db.execute(delete(ProductSalesDaily).where(ProductSalesDaily.day == day))
+        self.db.execute(
+            insert(ProductSalesDaily).from_select(
+                ["day", "sku", "variant_id", "product_id", "brand_id", *_PRODUCT_MEASURES], rows
+            )
+        )
+
+    # ---------- reads ----------
+    def totals(self, day_from: date, day_to: date) -> dict[str, int]:
+        stmt = select(*[func.coalesce(func.sum(getattr(SalesDaily, n)), 0).label(n) for n in _TOTALS]).where(
+            SalesDaily.day >= day_from, SalesDaily.day <= day_to
+        )
+        return {k: int(v) for k, v in self.db.execute(stmt).one()._mapping.items()}
+
+    def daily_series(self, day_from: date, day_to: date) -> Sequence[SalesDaily]:
+        stmt = (
+            select(SalesDaily)
+            .where(SalesDaily.day >= day_from, SalesDaily.day <= day_to)
+            .order_by(SalesDaily.day)
+        )
+        return self.db.execute(stmt).scalars().all()
+
+    def hourly_series(self, day_from: date, day_to: date) -> Sequence[SalesHourly]:
+        start, end = day_window(day_from, day_to)
+        stmt = (
+            select(SalesHourly)
+            .where(SalesHourly.bucket_start >= start, SalesHourly.bucket_start < end)
+            .order_by(SalesHourly.bucket_start)
+        )
+        return self.db.execute(stmt).scalars().all()
+
+    def breakdown(self, by: BreakdownBy, day_from: date, day_to: date, *, limit: int) -> Sequence[Row[Any]]:
+        """Top keys by revenue. Category totals count a product once in each of its categories."""
+        psd = ProductSalesDaily
+        sums = [func.sum(getattr(psd, n)).label(n) for n in _PRODUCT_MEASURES]
+        in_range = (psd.day >= day_from, psd.day <= day_to)
+
+        if by == "variant":
+            agg = select(psd.sku.label("key"), psd.sku.label("label"), *sums).where(*in_range).group_by(psd.sku)
+            label_src = None
+        elif by == "product":
+            agg = select(psd.product_id.label("key"), *sums).where(*in_range).group_by(psd.product_id)
+            label_src = (Product, Product.id, Product.name)
+        elif by == "brand":
+            agg = select(psd.brand_id.label("key"), *sums).where(*in_range).group_by(psd.brand_id)
+            label_src = (Brand, Brand.id, Brand.name)
+        else:
+            agg = (
+                select(ProductCategory.category_id.label("key"), *sums)
+                .join(ProductCategory, ProductCategory.product_id == psd.product_id)
+                .where(*in_range)
+                .group_by(ProductCategory.category_id)
+            )
+            label_src = (Category, Category.id, Category.name)
+
+        sub = agg.subquery("agg")
+        if label_src is None:
+            stmt = select(sub)
+        else:
+            model, id_col, name_col = label_src
+            stmt = select(sub.c.key, name_col.label("label"), *[sub.c[n] for n in _PRODUCT_MEASURES]).outerjoin(
+                model, id_col == sub.c.key
+            )
+        stmt = stmt.order_by(sub.c.revenue_cents.desc(), sub.c.key).limit(limit)
+        # past sales keep the names of products/brands/categories deleted since
+        return self.db.execute(stmt, execution_options=WITH_DELETED).all()
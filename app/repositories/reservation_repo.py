@@ -0,0 +1,105 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.orm import Session
+
+from app.models.cart import CartItem
+from app.models.catalog import ProductVariant
+from app.models.inventory import StockReservation
+from app.repositories.product_repo import queue_product_stock
+
+
+class ReservationRepository:
+    """
+    Cart-line stock holds; keeps ProductVariant.reserved_qty in step and queues the products
+    for an in_stock re-check at commit. No commits here.
+    """
+    def __init__(self, db: Session): self.db = db
+
+    # --- reads ---
+    def get_for_item(self, cart_item_id: int) -> Optional[StockReservation]:
+        stmt = select(StockReservation).where(StockReservation.cart_item_id == cart_item_id)
+        return self.db.execute(stmt).scalar_one_or_none()
+
+    # --- writes (no commits) ---
+    def _bump_reserved(self, variant_id: int, delta: int) -> bool:
+        # single conditional UPDATE: an increase only lands if enough stock is still free
+        stmt = update(ProductVariant).where(ProductVariant.id == variant_id)
+        if delta > 0:
+            stmt = stmt.where(ProductVariant.available_qty >= delta)
+        stmt = stmt.values(reserved_qty=func.greatest(ProductVariant.reserved_qty + delta, 0))
+        res = self.db.execute(stmt.returning(ProductVariant.product_id), execution_options={"synchronize_session": "fetch"})
+        product_id = res.scalar()
+        if product_id is None:
+            return False
+        queue_product_stock(self.db, product_id, 0)
+        return True
+
+    def hold(self, item: CartItem, qty: int, expires_at: datetime) -> bool:
+        """Reserve `qty` for the cart line (replacing its previous hold). False if stock is short."""
+        row = self.get_for_item(item.id)
+        delta = qty - (row.qty if row else 0)
+        if delta and not self._bump_reserved(item.variant_id, delta):
+            return False
+        if row:
+            row.qty = qty
+            row.expires_at = expires_at
+        else:
+            row = StockReservation(
+                cart_item_id=item.id, cart_id=item.cart_id, variant_id=item.variant_id,
+                qty=qty, expires_at=expires_at,
+            )
+        self.db.add(row)
+        return True
+
+    def release_item(self, cart_item_id: int) -> None:
+        row = self.get_for_item(cart_item_id)
+        if row:
+            self._bump_reserved(row.variant_id, -row.qty)
+            self.db.delete(row)
+
+    def release_cart(self, cart_id: int) -> int:
+        return self._release(StockReservation.cart_id == cart_id)
+
+    def release_carts(self, cart_ids: list[int]) -> int:
+        if not cart_ids:
+            return 0
+        return self._release(StockReservation.cart_id.in_(cart_ids))
+
+    def expire_batch(self, now: datetime, limit: int) -> int:
+        """Release up to `limit` expired holds. SKIP LOCKED keeps concurrent sweepers/checkouts apart."""
+        due = (
+            select(StockReservation.id)
+            .where(StockReservation.expires_at < now)
+            .order_by(StockReservation.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return self._release(StockReservation.id.in_(due))
+
+    def _release(self, *where: Any) -> int:
+        """Delete matching holds and give their qty back to the variants in one statement."""
+        res_t = StockReservation.__table__
+        var_t = ProductVariant.__table__
+        released = delete(res_t).where(*where).returning(res_t.c.variant_id, res_t.c.qty).cte("released")
+        per_variant = (
+            select(
+                released.c.variant_id,
+                func.sum(released.c.qty).label("qty"),
+                func.count().label("n"),
+            )
+            .group_by(released.c.variant_id)
+            .subquery("per_variant")
+        )
+        stmt = (
+            update(var_t)
+            .where(var_t.c.id == per_variant.c.variant_id)
+            .values(reserved_qty=func.greatest(var_t.c.reserved_qty - per_variant.c.qty, 0))
+            .returning(var_t.c.product_id, per_variant.c.n)
+        )
+        released_n = 0
+        for product_id, n in self.db.execute(stmt):
+            queue_product_stock(self.db, product_id, 0)
+            released_n += int(n)
+        return released_n
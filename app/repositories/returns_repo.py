@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import Optional, Sequence, Tuple, List
-from sqlalchemy import select, and_
+from typing import Any, Iterator, Optional, Sequence, Tuple, List
+from sqlalchemy import select, and_, Row
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import Select
 
+from app.common.export import stream_rows
 from app.common.listing import paginate, safe_order_by, Col
 from app.models.returns import ReturnRequest, ReturnItem
 
@@ -15,6 +16,15 @@ ALLOWED_SORT: dict[str, Col] = {
 }
 DEFAULT_SORT = ["-created_at"]
 
+EXPORT_COLUMNS: dict[str, Col] = {
+    "id": ReturnRequest.id,
+    "order_id": ReturnRequest.order_id,
+    "status": ReturnRequest.status,
+    "reason": ReturnRequest.reason,
+    "created_at": ReturnRequest.created_at,
+    "updated_at": ReturnRequest.updated_at,
+}
+
 class ReturnsRepository:
     def __init__(self, db: Session): self.db = db
 
@@ -22,6 +32,14 @@ class ReturnsRepository:
     def get(self, return_id: int) -> Optional[ReturnRequest]:
         return self.db.get(ReturnRequest, return_id)
 
+    def _filtered(self, *, order_id: int | None, status: list[str] | None, sort: List[str]) -> Select[tuple[ReturnRequest]]:
+        stmt: Select[tuple[ReturnRequest]] = select(ReturnRequest)
+        conds = []
+        if order_id is not None: conds.append(ReturnRequest.order_id == order_id)
+        if status: conds.append(ReturnRequest.status.in_(status))
+        if conds: stmt = stmt.where(and_(*conds))
+        return stmt.order_by(*safe_order_by(sort, ALLOWED_SORT, DEFAULT_SORT))
+
     def list_paged(
         self,
         *,
@@ -31,13 +49,10 @@ class ReturnsRepository:
         limit: int,
         offset: int,
     ) -> Tuple[Sequence[ReturnRequest], int]:
-        stmt: Select[tuple[ReturnRequest]] = select(ReturnRequest)
-        conds = []
-        if order_id is not None: conds.append(ReturnRequest.order_id == order_id)
-        if status: conds.append(ReturnRequest.status.in_(status))
-        if conds: stmt = stmt.where(and_(*conds))
-        stmt = stmt.order_by(*safe_order_by(sort, ALLOWED_SORT, DEFAULT_SORT))
-        return paginate(self.db, stmt, limit, offset)
+        return paginate(self.db, self._filtered(order_id=order_id, status=status, sort=sort), limit, offset)
+
+    def iter_export(self, *, order_id: int | None, status: list[str] | None, sort: List[str]) -> Iterator[Row[Any]]:
+        return stream_rows(self.db, self._filtered(order_id=order_id, status=status, sort=sort), EXPORT_COLUMNS)
 
     def list_items(self, return_id: int) -> Sequence[ReturnItem]:
         stmt = select(ReturnItem).where(ReturnItem.return_id == return_id).order_by(ReturnItem.id.asc())
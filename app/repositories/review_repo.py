@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.sql import Select
 
 from app.common.listing import paginate, safe_order_by, Col, ilike_any
+from app.db.soft_delete import WITH_DELETED
 from app.models.review import Review
 
 ALLOWED_SORT: dict[str, Col] = {
@@ -22,14 +23,13 @@ class ReviewRepository:
         self.db = db
 
     # ----- Reads -----
-    def get(self, review_id: int) -> Optional[Review]:
-        return self.db.get(Review, review_id)
+    def get(self, review_id: int, *, include_deleted: bool = False) -> Optional[Review]:
+        return self.db.get(Review, review_id, execution_options=WITH_DELETED if include_deleted else {})
 
     def get_by_user_and_product(self, user_id: int, product_id: int) -> Optional[Review]:
         stmt: Select[tuple[Review]] = select(Review).where(
             Review.user_id == user_id,
             Review.product_id == product_id,
-            Review.deleted_at.is_(None),
         )
         return self.db.execute(stmt).scalar_one_or_none()
 
@@ -46,7 +46,6 @@ class ReviewRepository:
         stmt: Select[tuple[Review]] = select(Review).where(
             Review.product_id == product_id,
             Review.is_published.is_(True),
-            Review.deleted_at.is_(None),
         )
         if rating_min is not None:
             stmt = stmt.where(Review.rating >= rating_min)
@@ -65,10 +64,7 @@ class ReviewRepository:
         limit: int,
         offset: int,
     ) -> Tuple[List[Review], int]:
-        stmt: Select[tuple[Review]] = select(Review).where(
-            Review.user_id == user_id,
-            Review.deleted_at.is_(None),
-        )
+        stmt: Select[tuple[Review]] = select(Review).where(Review.user_id == user_id)
         if product_id is not None:
             stmt = stmt.where(Review.product_id == product_id)
         stmt = stmt.order_by(*safe_order_by(sort, ALLOWED_SORT, DEFAULT_SORT))
@@ -1,10 +1,12 @@
 from __future__ import annotations
-from typing import Optional, Sequence, Tuple, List
-from sqlalchemy import select, and_
+from typing import Any, Iterable, Optional, Sequence, Tuple, List
+from sqlalchemy import select, update, and_, case, func, tuple_, values, column, Integer, String, DateTime, Row
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import Select
 
 from app.common.listing import paginate, safe_order_by, Col
+from app.db.enums import ShipmentStatusEnum
 from app.models.shipment import Shipment
 
 ALLOWED_SORT: dict[str, Col] = {
@@ -17,6 +19,19 @@ ALLOWED_SORT: dict[str, Col] = {
 }
 DEFAULT_SORT = ["-created_at"]
 
+# Shipments only move forward; delivered and cancelled are final.
+STATUS_RANK = {
+    ShipmentStatusEnum.pending: 0,
+    ShipmentStatusEnum.packed: 1,
+    ShipmentStatusEnum.in_transit: 2,
+    ShipmentStatusEnum.delivered: 3,
+    ShipmentStatusEnum.cancelled: 3,
+}
+
+
+def _rank(status: Any):
+    return case(STATUS_RANK, value=status, else_=0)
+
 class ShipmentRepository:
     def __init__(self, db: Session): self.db = db
 
@@ -27,6 +42,57 @@ class ShipmentRepository:
         stmt = select(Shipment).where(Shipment.order_id == order_id)
         return self.db.execute(stmt).scalar_one_or_none()
 
+    def tracking_owners(self, pairs: Iterable[tuple[str, str]]) -> dict[tuple[str, str], int]:
+        """(carrier, tracking_number) -> order_id for the pairs already taken."""
+        pairs = set(pairs)
+        if not pairs:
+            return {}
+        stmt = select(Shipment.carrier, Shipment.tracking_number, Shipment.order_id).where(
+            tuple_(Shipment.carrier, Shipment.tracking_number).in_(pairs)
+        )
+        return {(c, t): oid for c, t, oid in self.db.execute(stmt).all()}
+
+    def lock_by_tracking(self, pairs: Iterable[tuple[str, str]]) -> Sequence[Row[Any]]:
+        """
+        (id, order_id, carrier, tracking_number, status, shipped_at, delivered_at) for the
+        given (carrier, tracking_number) pairs, locked FOR UPDATE in id order.
+        """
+        pairs = set(pairs)
+        if not pairs:
+            return []
+        stmt = (
+            select(
+                Shipment.id, Shipment.order_id, Shipment.carrier, Shipment.tracking_number,
+                Shipment.status, Shipment.shipped_at, Shipment.delivered_at,
+            )
+            .where(tuple_(Shipment.carrier, Shipment.tracking_number).in_(pairs))
+            .order_by(Shipment.id)
+            .with_for_update(of=Shipment)
+        )
+        return self.db.execute(stmt).all()
+
+    def apply_tracking(self, rows: Sequence[tuple[int, str, Any, Any]]) -> None:
+        """
+        One UPDATE ... FROM (VALUES (id, status, shipped_at, delivered_at)) for many shipments.
+        Timestamps already set are kept (callers keep delivered_at >= shipped_at).
+        """
+        if not rows:
+            return
+        v = values(
+            column("id", Integer), column("status", String), column("shipped_at", DateTime(timezone=True)),
+            column("delivered_at", DateTime(timezone=True)), name="v",
+        ).data(list(rows))
+        self.db.execute(
+            update(Shipment)
+            .where(Shipment.id == v.c.id)
+            .values(
+                status=v.c.status,
+                shipped_at=func.coalesce(Shipment.shipped_at, v.c.shipped_at),
+                delivered_at=func.coalesce(Shipment.delivered_at, v.c.delivered_at),
+            ),
+            execution_options={"synchronize_session": False},
+        )
+
     def list_paged(
         self,
         *,
@@ -48,6 +114,29 @@ class ShipmentRepository:
     def create(self, order_id: int, data: dict) -> Shipment:
         row = Shipment(order_id=order_id, **data); self.db.add(row); return row
 
+    def upsert_many(self, rows: list[dict]) -> None:
+        """
+        One INSERT ... ON CONFLICT (order_id) for many orders: carrier and tracking are
+        overwritten; status only moves forward (STATUS_RANK), so re-posting a manifest never
+        sends a shipment in transit back to packed. Timestamps are kept once set and only
+        filled in when the status advances.
+        """
+        if not rows:
+            return
+        ins = pg_insert(Shipment).values(rows)
+        advances = _rank(ins.excluded.status) > _rank(Shipment.status)
+        self.db.execute(ins.on_conflict_do_update(
+            index_elements=[Shipment.order_id],
+            set_={
+                "carrier": ins.excluded.carrier,
+                "tracking_number": ins.excluded.tracking_number,
+                "status": case((advances, ins.excluded.status), else_=Shipment.status),
+                "shipped_at": func.coalesce(Shipment.shipped_at, case((advances, ins.excluded.shipped_at))),
+                "delivered_at": func.coalesce(Shipment.delivered_at, case((advances, ins.excluded.delivered_at))),
+                "updated_at": func.now(),
+            },
+        ))
+
     def update(self, row: Shipment, data: dict) -> Shipment:
         for k, v in data.items(): setattr(row, k, v)
         self.db.add(row); return row
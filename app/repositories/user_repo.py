@@ -1,10 +1,12 @@
 from __future__ import annotations
-from typing import Optional, List, Tuple
-from sqlalchemy import select, and_
+from typing import Any, Iterator, Optional, List, Tuple
+from sqlalchemy import select, and_, Row
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import Select
 
+from app.common.export import stream_rows
 from app.common.listing import paginate, safe_order_by, ilike_any, Col
+from app.db.soft_delete import WITH_DELETED
 from app.models.auth import User
 
 ALLOWED_SORT: dict[str, Col] = {
@@ -17,6 +19,17 @@ ALLOWED_SORT: dict[str, Col] = {
 }
 DEFAULT_SORT = ["-created_at"]
 
+EXPORT_COLUMNS: dict[str, Col] = {
+    "id": User.id,
+    "email": User.email,
+    "full_name": User.full_name,
+    "phone": User.phone,
+    "role": User.role,
+    "is_active": User.is_active,
+    "created_at": User.created_at,
+    "deleted_at": User.deleted_at,
+}
+
 
 class UserRepository:
     """Role-agnostic user persistence (auth policies live in services). No commits here."""
@@ -24,14 +37,15 @@ class UserRepository:
         self.db = db
 
     # Reads
-    def get(self, user_id: int) -> Optional[User]:
-        return self.db.get(User, user_id)
+    def get(self, user_id: int, *, include_deleted: bool = False) -> Optional[User]:
+        return self.db.get(User, user_id, execution_options=WITH_DELETED if include_deleted else {})
 
     def get_by_email(self, email: str) -> Optional[User]:
+        """Deleted users included: emails are unique across the whole table (callers check deleted_at)."""
         stmt = select(User).where(User.email == email)
-        return self.db.execute(stmt).scalar_one_or_none()
+        return self.db.execute(stmt, execution_options=WITH_DELETED).scalar_one_or_none()
 
-    def list_paged(
+    def _filtered(
         self,
         *,
         q: str | None,
@@ -39,13 +53,11 @@ class UserRepository:
         is_active: bool | None,
         include_deleted: bool = False,
         sort: List[str],
-        limit: int,
-        offset: int,
-    ) -> Tuple[List[User], int]:
+    ) -> Select[tuple[User]]:
         stmt: Select[tuple[User]] = select(User)
+        if include_deleted:
+            stmt = stmt.execution_options(**WITH_DELETED)
         conds = []
-        if not include_deleted:
-            conds.append(User.deleted_at.is_(None))
         if q:
             conds.append(ilike_any([User.email, User.full_name, User.phone], q))
         if role:
@@ -55,9 +67,35 @@ class UserRepository:
 
         if conds:
             stmt = stmt.where(and_(*conds))
-        stmt = stmt.order_by(*safe_order_by(sort, ALLOWED_SORT, DEFAULT_SORT))
+        return stmt.order_by(*safe_order_by(sort, ALLOWED_SORT, DEFAULT_SORT))
+
+    def list_paged(
+        self,
+        *,
+        q: str | None,
+        role: str | None,
+        is_active: bool | None,
+        include_deleted: bool = False,
+        sort: List[str],
+        limit: int,
+        offset: int,
+    ) -> Tuple[List[User], int]:
+        stmt = self._filtered(q=q, role=role, is_active=is_active, include_deleted=include_deleted, sort=sort)
         return paginate(self.db, stmt, limit, offset)
 
+    def iter_export(
+        self,
+        *,
+        q: str | None,
+        role: str | None,
+        is_active: bool | None,
+        include_deleted: bool = False,
+        sort: List[str],
+    ) -> Iterator[Row[Any]]:
+        """Same filters/sort as list_paged, streamed as EXPORT_COLUMNS rows (never the password hash)."""
+        stmt = self._filtered(q=q, role=role, is_active=is_active, include_deleted=include_deleted, sort=sort)
+        return stream_rows(self.db, stmt, EXPORT_COLUMNS)
+
     # Writes (no commit)
     def save(self, row: User) -> None:
         self.db.add(row)
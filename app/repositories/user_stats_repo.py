@@ -0,0 +1,84 @@
+from __future__ import annotations
+from typing import Iterable, Optional, Sequence
+from sqlalchemy import select, delete, func, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.enums import OrderStatusEnum
+from app.models.auth import User
+from app.models.order import Order
+from app.models.review import Review
+from app.models.user_stats import UserStats
+
+_SPEND_STATUSES = (OrderStatusEnum.paid, OrderStatusEnum.fulfilled)
+
+
+class UserStatsRepository:
+    """Per-user counters (user_stats), recomputed from orders/reviews. No commits here."""
+    def __init__(self, db: Session): self.db = db
+
+    def get(self, user_id: int) -> Optional[UserStats]:
+        return self.db.get(UserStats, user_id)
+
+    def get_many(self, user_ids: Iterable[int]) -> dict[int, UserStats]:
+        ids = set(user_ids)
+        if not ids:
+            return {}
+        rows = self.db.execute(select(UserStats).where(UserStats.user_id.in_(ids))).scalars()
+        return {r.user_id: r for r in rows}
+
+    def refresh(self, user_ids: Iterable[int | None]) -> None:
+        """
+        Recompute the rows of `user_ids` with one INSERT ... SELECT ... ON CONFLICT: two grouped
+        aggregates over the users' live orders and reviews. Users without live orders or reviews
+        get no row (and lose the one they had). Idempotent; unknown ids are skipped.
+        """
+        ids = {i for i in user_ids if i is not None}
+        if not ids:
+            return
+        o = (
+            select(
+                Order.user_id,
+                func.count().label("orders_total"),
+                *(func.count().filter(Order.status == s).label(f"orders_{s.value}") for s in OrderStatusEnum),
+                func.sum(Order.total_cents).filter(Order.status.in_(_SPEND_STATUSES)).label("lifetime_spend_cents"),
+            )
+            .where(Order.user_id.in_(ids), Order.deleted_at.is_(None))
+            .group_by(Order.user_id)
+            .subquery()
+        )
+        r = (
+            select(Review.user_id, func.count().label("reviews_count"))
+            .where(Review.user_id.in_(ids), Review.deleted_at.is_(None))
+            .group_by(Review.user_id)
+            .subquery()
+        )
+        counters = ["orders_total", *(f"orders_{s.value}" for s in OrderStatusEnum), "lifetime_spend_cents"]
+        src = (
+            select(
+                User.id,
+                *(func.coalesce(o.c[name], 0) for name in counters),
+                func.coalesce(r.c.reviews_count, 0),
+                func.now(),
+            )
+            .outerjoin(o, o.c.user_id == User.id)
+            .outerjoin(r, r.c.user_id == User.id)
+            .where(User.id.in_(ids), or_(o.c.user_id.is_not(None), r.c.user_id.is_not(None)))
+            .order_by(User.id)  # lock rows in id order
+        )
+        cols = ["user_id", *counters, "reviews_count", "refreshed_at"]
+        stmt = pg_insert(UserStats).from_select(cols, src)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserStats.user_id], set_={c: stmt.excluded[c] for c in cols[1:]},
+        )
+        active = set(self.db.execute(stmt.returning(UserStats.user_id)).scalars())
+        if ids - active:
+            self.db.execute(
+                delete(UserStats).where(UserStats.user_id.in_(ids - active)),
+                execution_options={"synchronize_session": False},
+            )
+
+    def user_ids_after(self, after_user_id: int, limit: int) -> Sequence[int]:
+        """Keyset page of user ids (deleted users included) for the rebuild job."""
+        stmt = select(User.id).where(User.id > after_user_id).order_by(User.id).limit(limit)
+        return self.db.execute(stmt).scalars().all()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Optional
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
+from app.schemas.user import UserStatsOut
 
 # I/O models
 class RegisterIn(BaseModel):
@@ -22,6 +23,7 @@ class MeOut(BaseModel):
     id: int
     email: EmailStr
     full_name: Optional[str] = None
+    stats: Optional[UserStatsOut] = None         # ?expand=stats
     model_config = ConfigDict(from_attributes=True)
 
 class ChangePasswordIn(BaseModel):
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+
+from app.db.enums import ImportStatusEnum
+
+
+class CatalogImportRow(BaseModel):
+    """
+    One input row = one variant. Product fields repeat on every variant row of the product;
+    rows are grouped by `product_slug` (or the slug of `product_name`).
+    List fields accept a JSON list or a "|"-separated string (CSV).
+    """
+    product_name: str = Field(min_length=1, max_length=255)
+    product_slug: Optional[str] = Field(default=None, max_length=255)
+    brand: Optional[str] = Field(default=None, max_length=120)
+    description: Optional[str] = None
+    base_price_cents: int = Field(ge=0)
+    currency: str = Field(default="VND", min_length=3, max_length=3)
+    is_active: bool = True
+    category_slugs: List[str] = []
+
+    sku: str = Field(min_length=1, max_length=64)
+    color: Optional[str] = Field(default=None, max_length=64)
+    size: Optional[str] = Field(default=None, max_length=32)
+    stock_qty: int = Field(default=0, ge=0)        # applied to new SKUs only
+    price_cents: Optional[int] = Field(default=None, ge=0)
+    variant_image_url: Optional[str] = Field(default=None, max_length=500)
+
+    image_urls: List[str] = []                      # product images; first is primary
+
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _blank_is_missing(cls, data: Any) -> Any:
+        if isinstance(data, dict):
+            # CSV rows with surplus cells carry a None key; empty cells mean "not given"
+            return {k: v for k, v in data.items() if isinstance(k, str) and v is not None and v != ""}
+        return data
+
+    @field_validator("category_slugs", "image_urls", mode="before")
+    @classmethod
+    def _split_pipes(cls, v: Any) -> Any:
+        if isinstance(v, str):
+            return [p.strip() for p in v.split("|") if p.strip()]
+        return v
+
+
+class CatalogImportOut(BaseModel):
+    id: int
+    filename: str
+    format: str
+    status: ImportStatusEnum
+    rows_processed: int
+    rows_ok: int
+    rows_failed: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class CatalogImportErrorOut(BaseModel):
+    row_number: int
+    sku: Optional[str] = None
+    message: str
+    model_config = ConfigDict(from_attributes=True)
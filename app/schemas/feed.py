@@ -0,0 +1,15 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.db.enums import FeedKindEnum
+from app.schemas.product import ProductOut
+
+
+class FeedOut(BaseModel):
+    kind: FeedKindEnum
+    scope: str
+    scope_id: Optional[int] = None
+    computed_at: Optional[datetime] = None      # None: not computed yet (empty feed)
+    items: List[ProductOut]
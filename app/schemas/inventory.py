@@ -18,3 +18,63 @@ class InventoryMovementOut(BaseModel):
     reason: InventoryMovementType
     note: str | None = None
     created_at: datetime
+
+
+# ---- bulk adjust / stock-take ----
+class BulkAdjustLineIn(BaseModel):
+    variant_id: int
+    qty_delta: int
+
+class BulkAdjustIn(BaseModel):
+    items: list[BulkAdjustLineIn] = Field(..., min_length=1, max_length=10_000)
+    note: str | None = Field(None, max_length=255)
+    dry_run: bool = False
+
+class StockCountIn(BaseModel):
+    sku: str = Field(..., min_length=1, max_length=64)
+    counted_qty: int = Field(..., ge=0)
+
+class StockTakeIn(BaseModel):
+    counts: list[StockCountIn] = Field(..., min_length=1, max_length=50_000)
+    note: str | None = Field(None, max_length=255)
+    dry_run: bool = False
+
+class StockChangeLineOut(BaseModel):
+    variant_id: int
+    sku: str
+    stock_before: int
+    qty_delta: int
+    stock_after: int
+
+class StockChangeReportOut(BaseModel):
+    dry_run: bool
+    applied: bool
+    lines: list[StockChangeLineOut]           # variants whose stock changes (or would)
+    unchanged: int = 0                        # matched but already at the target
+    unknown_skus: list[str] = []              # stock-take only
+    below_reserved_skus: list[str] = []       # result would be < reserved_qty, not applied
+    total_delta: int
+
+
+# ---- ledger: point-in-time / reconciliation ----
+class StockAtOut(BaseModel):
+    variant_id: int
+    at: datetime | None = None                # None = now
+    stock_qty: int                            # ledger balance at `at`
+    snapshot_as_of: datetime | None = None    # snapshot the balance started from
+    movements_applied: int                    # ledger rows summed on top of it
+
+class StockDriftOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    variant_id: int
+    sku: str
+    product_id: int
+    stock_qty: int
+    ledger_qty: int
+    drift: int                                # stock_qty - ledger_qty
+    snapshot_as_of: datetime | None = None
+
+class ReconcileOut(BaseModel):
+    items: list[StockDriftOut]
+    next_after_id: int | None = None          # pass as after_id to scan the next page
@@ -0,0 +1,24 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class JobStatusOut(BaseModel):
+    name: str
+    interval_seconds: float
+    timeout_seconds: float
+    runs: int
+    failures: int
+    timeouts: int
+    skipped_not_leader: int
+    total_processed: int
+    last_started_at: Optional[datetime] = None
+    last_duration_ms: Optional[float] = None
+    last_processed: Optional[int] = None
+    last_error: Optional[str] = None
+
+
+class JobRunOut(BaseModel):
+    ran: bool  # False when another node currently holds the job's lock
+    job: JobStatusOut
@@ -1,7 +1,12 @@
 from __future__ import annotations
-from typing import Optional, List
+from datetime import datetime
+from typing import Any, Iterable, Literal, Optional, List
 from pydantic import BaseModel, Field, ConfigDict
-from app.db.enums import PaymentMethodEnum
+from app.db.enums import PaymentMethodEnum, ShipmentStatusEnum
+from app.schemas.returns import ReturnOut
+
+# eager-load profiles of order reads (OrderRepository.INCLUDES)
+OrderInclude = Literal["items", "payments", "shipment", "returns"]
 
 # --- Checkout ---
 class ShippingIn(BaseModel):
@@ -43,6 +48,68 @@ class OrderItemOut(BaseModel):
     line_total_cents: int
     model_config = ConfigDict(from_attributes=True)
 
+class OrderPaymentOut(BaseModel):
+    id: int
+    amount_cents: int
+    status: str
+    method: str
+    transaction_ref: Optional[str]
+    created_at: datetime
+    model_config = ConfigDict(from_attributes=True)
+
+class OrderShipmentOut(BaseModel):
+    id: int
+    carrier: Optional[str]
+    tracking_number: Optional[str]
+    status: str
+    shipped_at: Optional[datetime]
+    delivered_at: Optional[datetime]
+    model_config = ConfigDict(from_attributes=True)
+
 class OrderDetailOut(OrderOut):
+    # only the included relationships are set; serve with response_model_exclude_unset
     items: List[OrderItemOut] = []
+    payments: List[OrderPaymentOut] = []
+    shipment: Optional[OrderShipmentOut] = None
+    returns: List[ReturnOut] = []
     model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def from_order(cls, o: Any, include: Iterable[str]) -> "OrderDetailOut":
+        """Reads only the included relationships of `o`, so nothing else is loaded."""
+        data = OrderOut.model_validate(o, from_attributes=True).model_dump()
+        data.update({name: getattr(o, name) for name in include})
+        return cls.model_validate(data, from_attributes=True)
+
+# --- Admin bulk actions ---
+class BulkOrderIdsIn(BaseModel):
+    order_ids: List[int] = Field(..., min_length=1, max_length=10_000)
+    model_config = ConfigDict(extra="forbid")
+
+class BulkMarkPaidIn(BulkOrderIdsIn):
+    method: PaymentMethodEnum = PaymentMethodEnum.momo
+
+class BulkRefundIn(BulkOrderIdsIn):
+    reason: Optional[str] = Field(default=None, max_length=255)
+
+class BulkShipLineIn(BaseModel):
+    order_id: int
+    carrier: Optional[str] = Field(default=None, max_length=120)
+    tracking_number: Optional[str] = Field(default=None, max_length=120)
+
+class BulkShipIn(BaseModel):
+    items: List[BulkShipLineIn] = Field(..., min_length=1, max_length=10_000)
+    status: ShipmentStatusEnum = ShipmentStatusEnum.packed   # delivered also fulfills paid orders
+    model_config = ConfigDict(extra="forbid")
+
+class BulkOrderResultOut(BaseModel):
+    order_id: int
+    ok: bool
+    status: Optional[str] = None                # order status after the action (None if not found)
+    error: Optional[str] = None
+
+class BulkOrdersOut(BaseModel):
+    processed: int
+    succeeded: int
+    failed: int
+    results: List[BulkOrderResultOut]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import Optional, List
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 
 # ---------- Product ----------
 class ProductBase(BaseModel):
@@ -30,6 +30,9 @@ class ProductUpdate(BaseModel):
 
 class ProductOut(ProductBase):
     id: int
+    min_price_cents: Optional[int] = None   # effective price range over live variants
+    max_price_cents: Optional[int] = None
+    in_stock: bool = False
     model_config = ConfigDict(from_attributes=True)
 
 # ---------- Variants ----------
@@ -57,10 +60,44 @@ class VariantOut(BaseModel):
     color: Optional[str]
     size: Optional[str]
     stock_qty: int
+    reserved_qty: int = 0
+    available_qty: int = 0   # stock_qty - reserved_qty
     price_cents: Optional[int]
     image_url: Optional[str]
     model_config = ConfigDict(from_attributes=True)
 
+# ---------- Availability ----------
+AVAILABILITY_MAX_ITEMS = 500
+
+class VariantAvailabilityIn(BaseModel):
+    """SKUs and/or variant ids, at most AVAILABILITY_MAX_ITEMS in total."""
+    skus: List[str] = Field(default_factory=list, max_length=AVAILABILITY_MAX_ITEMS)
+    variant_ids: List[int] = Field(default_factory=list, max_length=AVAILABILITY_MAX_ITEMS)
+    model_config = ConfigDict(extra="forbid")
+
+    @model_validator(mode="after")
+    def _within_limit(self) -> "VariantAvailabilityIn":
+        n = len(self.skus) + len(self.variant_ids)
+        if not n:
+            raise ValueError("give at least one sku or variant_id")
+        if n > AVAILABILITY_MAX_ITEMS:
+            raise ValueError(f"at most {AVAILABILITY_MAX_ITEMS} skus and variant_ids in total")
+        return self
+
+class VariantAvailabilityOut(BaseModel):
+    variant_id: int
+    sku: str
+    product_id: int
+    stock_qty: int
+    reserved_qty: int
+    available_qty: int       # stock_qty - reserved_qty
+    price_cents: int         # variant price, else the product base price
+
+class VariantAvailabilityListOut(BaseModel):
+    items: List[VariantAvailabilityOut]
+    missing_skus: List[str] = []             # unknown, deleted or not for sale
+    missing_variant_ids: List[int] = []
+
 # ---------- Images ----------
 class ImageCreate(BaseModel):
     url: str = Field(max_length=500)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, Optional
+from pydantic import AliasChoices, BaseModel, Field, ConfigDict, model_validator
+
+from app.db.enums import ImportStatusEnum, ReconcileMismatchEnum
+
+
+class SettlementRow(BaseModel):
+    """One settled transaction of a gateway settlement file (CSV or JSONL)."""
+    transaction_ref: str = Field(min_length=1, max_length=255)
+    amount_cents: int = Field(ge=0, validation_alias=AliasChoices("amount_cents", "amount"))
+    order_number: Optional[str] = Field(default=None, max_length=50)
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _blank_is_missing(cls, data: Any) -> Any:
+        if isinstance(data, dict):
+            return {k: v for k, v in data.items() if isinstance(k, str) and v is not None and v != ""}
+        return data
+
+
+class ReconciliationOut(BaseModel):
+    id: int
+    provider: str
+    filename: str
+    format: str
+    period_from: Optional[datetime] = None
+    period_to: Optional[datetime] = None
+    apply_fixes: bool
+    status: ImportStatusEnum
+    rows_processed: int
+    matched: int
+    mismatched: int
+    fixed: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReconciliationItemOut(BaseModel):
+    id: int
+    kind: ReconcileMismatchEnum
+    row_number: Optional[int] = None
+    transaction_ref: Optional[str] = None
+    order_number: Optional[str] = None
+    payment_id: Optional[int] = None
+    order_id: Optional[int] = None
+    expected_cents: Optional[int] = None
+    settled_cents: Optional[int] = None
+    fixed: bool
+    note: Optional[str] = None
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,13 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.schemas.product import ProductOut
+
+
+class RelatedOut(BaseModel):
+    product_id: int
+    computed_at: Optional[datetime] = None      # None: not computed yet for this product
+    also_bought: List[ProductOut]
+    similar: List[ProductOut]
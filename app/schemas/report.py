@@ -0,0 +1,44 @@
+from __future__ import annotations
+from datetime import date, datetime
+from pydantic import BaseModel
+
+
+class SalesTotals(BaseModel):
+    orders_placed: int
+    orders_paid: int
+    orders_cancelled: int
+    orders_refunded: int
+    gross_cents: int
+    revenue_cents: int
+    refunded_cents: int
+    units_sold: int
+
+
+class SalesSummaryOut(SalesTotals):
+    date_from: date
+    date_to: date
+    cancellation_rate: float   # cancelled / placed
+    refund_rate: float         # refunded / paid
+    average_order_cents: int
+
+
+class SalesPointOut(SalesTotals):
+    bucket_start: datetime | date
+
+
+class SalesBreakdownOut(BaseModel):
+    key: int | str | None      # product/brand/category id, or SKU for variants
+    label: str | None = None
+    units_sold: int
+    revenue_cents: int
+    units_refunded: int
+    refunded_cents: int
+
+
+class BackfillIn(BaseModel):
+    date_from: date
+    date_to: date
+
+
+class BackfillOut(BaseModel):
+    days_queued: int
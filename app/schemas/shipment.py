@@ -0,0 +1,44 @@
+from __future__ import annotations
+from datetime import datetime
+from typing import Any, List, Optional
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+
+from app.db.enums import ShipmentStatusEnum
+
+
+class ShipmentEventIn(BaseModel):
+    """One carrier tracking event; a file row or an item of a webhook batch."""
+    carrier: str = Field(min_length=1, max_length=120)
+    tracking_number: str = Field(min_length=1, max_length=120)
+    status: ShipmentStatusEnum
+    occurred_at: datetime
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _blank_is_missing(cls, data: Any) -> Any:
+        if isinstance(data, dict):
+            return {k: v for k, v in data.items() if isinstance(k, str) and v is not None and v != ""}
+        return data
+
+
+class ShipmentEventsIn(BaseModel):
+    events: List[ShipmentEventIn] = Field(..., min_length=1, max_length=50_000)
+    model_config = ConfigDict(extra="forbid")
+
+
+class ShipmentEventErrorOut(BaseModel):
+    row_number: int
+    message: str
+
+
+class ShipmentIngestOut(BaseModel):
+    received: int                     # events read (valid or not)
+    invalid: int = 0
+    duplicates: int = 0               # identical events dropped
+    shipments_updated: int = 0
+    stale: int = 0                    # shipments whose newest event would move status backwards
+    unknown: int = 0                  # (carrier, tracking_number) pairs with no shipment
+    orders_fulfilled: int = 0
+    unknown_tracking: List[str] = []  # "carrier:tracking", capped
+    errors: List[ShipmentEventErrorOut] = []  # capped
@@ -1,9 +1,25 @@
-from pydantic import BaseModel, EmailStr
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
 
+class UserStatsOut(BaseModel):
+    """user_stats row; all zeros for users without orders or reviews."""
+    orders_total: int = 0
+    orders_pending: int = 0
+    orders_paid: int = 0
+    orders_fulfilled: int = 0
+    orders_cancelled: int = 0
+    orders_refunded: int = 0
+    lifetime_spend_cents: int = 0
+    reviews_count: int = 0
+    refreshed_at: Optional[datetime] = None
+    model_config = ConfigDict(from_attributes=True)
+
 class UserOut(BaseModel):
     id: int
-    email: EmailStr
\ No newline at end of file
+    email: EmailStr
+    stats: Optional[UserStatsOut] = None
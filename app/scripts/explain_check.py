@@ -0,0 +1,201 @@
+"""
+Plan check for the repository list queries:
+
+    python -m app.scripts.explain_check [--seed 50000] [--min-rows 10000] [-v]
+
+Runs each list query the services issue (default sort, common filter combinations),
+captures the page SELECT it sends and EXPLAINs it. Fails (exit 1) when a plan
+sequentially scans a table with at least --min-rows rows. With --seed, synthetic
+products/users/orders/reviews are inserted and ANALYZEd first in one transaction that
+is rolled back. ANALYZE's row estimates (pg_class.reltuples) are not transactional,
+so the tables are ANALYZEd again after the rollback; still, seed a scratch database,
+not a shared one, since planner statistics are skewed while the check runs.
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+from typing import Any, Callable, Iterator
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.db.session import SessionLocal
+from app.repositories.order_repo import OrderRepository
+from app.repositories.product_repo import ProductRepository
+from app.repositories.review_repo import ReviewRepository
+from app.repositories.user_repo import UserRepository
+
+PAGE = {"limit": 50, "offset": 0}
+_PRODUCT = {"q": None, "brand_id": None, "category_id": None, "is_active": None, "is_archived": None,
+            "price_min": None, "price_max": None, "sort": []}
+_ORDER = {"user_id": None, "status": None, "min_total": None, "max_total": None, "sort": []}
+_USER = {"q": None, "role": None, "is_active": None, "include_deleted": True, "sort": []}  # admin endpoint defaults
+
+# (name, call) — mirrors what the list endpoints pass down
+CASES: list[tuple[str, Callable[[Session, dict[str, int]], Any]]] = [
+    ("products: admin default", lambda db, k: ProductRepository(db).list_paged(**_PRODUCT, **PAGE)),
+    ("products: storefront", lambda db, k: ProductRepository(db).list_paged(
+        **{**_PRODUCT, "is_active": True, "is_archived": False}, **PAGE)),
+    ("products: by brand", lambda db, k: ProductRepository(db).list_paged(
+        **{**_PRODUCT, "brand_id": k["brand_id"]}, **PAGE)),
+    ("products: in stock", lambda db, k: ProductRepository(db).list_paged(**_PRODUCT, in_stock=True, **PAGE)),
+    ("reviews: public for product", lambda db, k: ReviewRepository(db).list_paged_public_for_product(
+        k["product_id"], rating_min=None, rating_max=None, sort=[], **PAGE)),
+    ("reviews: by user", lambda db, k: ReviewRepository(db).list_paged_for_user(
+        k["user_id"], product_id=None, sort=[], **PAGE)),
+    ("users: admin default", lambda db, k: UserRepository(db).list_paged(**_USER, **PAGE)),
+    ("users: by role", lambda db, k: UserRepository(db).list_paged(**{**_USER, "role": "admin"}, **PAGE)),
+    ("users: live only", lambda db, k: UserRepository(db).list_paged(**{**_USER, "include_deleted": False}, **PAGE)),
+    ("orders: admin default", lambda db, k: OrderRepository(db).list_paged(**_ORDER, **PAGE)),
+    ("orders: customer history", lambda db, k: OrderRepository(db).list_paged(
+        **{**_ORDER, "user_id": k["user_id"]}, **PAGE)),
+    ("orders: by status", lambda db, k: OrderRepository(db).list_paged(
+        **{**_ORDER, "status": ["pending"]}, **PAGE)),
+]
+
+_SEED_SQL = [
+    """
+    INSERT INTO brands (name, slug)
+    SELECT 'Explain ' || g, 'explain-' || g FROM generate_series(1, 100) g
+    """,
+    """
+    INSERT INTO users (email, hashed_password, role, is_active, created_at, deleted_at)
+    SELECT 'explain-' || g || '@example.invalid', 'x',
+           CASE WHEN g % 500 = 0 THEN 'admin' ELSE 'customer' END, true,
+           now() - g * interval '1 minute',
+           CASE WHEN g % 50 = 0 THEN now() END
+    FROM generate_series(1, :n) g
+    """,
+    """
+    INSERT INTO products (name, slug, brand_id, base_price_cents, currency, is_active, is_archived,
+                          min_price_cents, max_price_cents, total_stock, in_stock, created_at, deleted_at)
+    SELECT 'Explain ' || g, 'explain-' || g, b.id, 1000 + g % 9000, 'VND',
+           g % 10 <> 0, g % 25 = 0, 1000 + g % 9000, 1000 + g % 9000, g % 7, g % 7 > 0,
+           now() - g * interval '1 minute',
+           CASE WHEN g % 50 = 0 THEN now() END
+    FROM generate_series(1, :n) g
+    JOIN brands b ON b.slug = 'explain-' || (1 + g % 100)
+    """,
+    """
+    INSERT INTO orders (order_number, user_id, status, subtotal_cents, shipping_fee_cents, discount_cents,
+                        total_cents, currency, ship_full_name, ship_mobile_num, ship_detail_address, created_at)
+    SELECT 'EXPLAIN-' || g, u.id,
+           (ARRAY['pending', 'paid', 'fulfilled', 'cancelled'])[1 + g % 4],
+           1000, 0, 0, 1000, 'VND', 'x', 'x', 'x', now() - g * interval '1 minute'
+    FROM generate_series(1, :n) g
+    JOIN LATERAL (SELECT id FROM users WHERE email = 'explain-' || (1 + g % 1000) || '@example.invalid') u ON true
+    """,
+    """
+    INSERT INTO reviews (product_id, user_id, rating, is_published, created_at)
+    SELECT p.id, u.id, 1 + g % 5, g % 3 <> 0, now() - g * interval '1 minute'
+    FROM generate_series(1, :n) g
+    JOIN LATERAL (SELECT id FROM products WHERE slug = 'explain-' || (1 + g % 1000)) p ON true
+    JOIN LATERAL (SELECT id FROM users WHERE email = 'explain-' || (1 + g / 1000) || '@example.invalid') u ON true
+    """,
+]
+
+_ANALYZE = "ANALYZE brands, users, products, orders, reviews"
+
+
+def _seed(db: Session, n: int) -> None:
+    for sql in _SEED_SQL:
+        db.execute(text(sql), {"n": n})
+    # rows inserted by this transaction count as live for ANALYZE (see _reanalyze)
+    db.execute(text(_ANALYZE))
+
+
+def _reanalyze(db: Session) -> None:
+    """Restore statistics for the real rows once the seeded ones are rolled back."""
+    db.execute(text(_ANALYZE))
+    db.commit()
+
+
+def _sample_keys(db: Session) -> dict[str, int]:
+    """Filter values that hit populated rows (the most reviewed product, most active user...)."""
+    def one(sql: str) -> int:
+        return int(db.execute(text(sql)).scalar() or 0)
+    return {
+        "brand_id": one("SELECT brand_id FROM products WHERE brand_id IS NOT NULL GROUP BY 1 ORDER BY count(*) DESC LIMIT 1"),
+        "product_id": one("SELECT product_id FROM reviews GROUP BY 1 ORDER BY count(*) DESC LIMIT 1"),
+        "user_id": one("SELECT user_id FROM orders WHERE user_id IS NOT NULL GROUP BY 1 ORDER BY count(*) DESC LIMIT 1"),
+    }
+
+
+def _capture(db: Session, call: Callable[[], Any]) -> list[tuple[str, Any]]:
+    """Run `call` and return the SELECTs it sent that fetch a page (the COUNT is skipped)."""
+    seen: list[tuple[str, Any]] = []
+    conn = db.connection()
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "LIMIT" in statement.upper():
+            seen.append((statement, parameters))
+
+    event.listen(conn, "before_cursor_execute", before)
+    try:
+        call()
+    finally:
+        event.remove(conn, "before_cursor_execute", before)
+    return seen
+
+
+def _nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+def _row_counts(db: Session) -> dict[str, int]:
+    rows = db.execute(text(
+        "SELECT relname, reltuples::bigint FROM pg_class WHERE relkind IN ('r', 'p') "
+        "AND relnamespace = 'public'::regnamespace"
+    )).all()
+    return {name: int(n) for name, n in rows}
+
+
+def check(db: Session, *, min_rows: int, verbose: bool = False) -> list[str]:
+    """EXPLAIN every case; return one message per large-table sequential scan."""
+    sizes = _row_counts(db)
+    keys = _sample_keys(db)
+    failures: list[str] = []
+    for name, case in CASES:
+        for statement, params in _capture(db, lambda: case(db, keys)):
+            raw = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, params).scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            scans = [n for n in _nodes(plan) if n["Node Type"] == "Seq Scan"]
+            bad = [n["Relation Name"] for n in scans if sizes.get(n["Relation Name"], 0) >= min_rows]
+            status = "FAIL" if bad else "ok"
+            print(f"{status:4}  {name}: {plan['Node Type']} (cost {plan['Total Cost']:.0f})")
+            if verbose:
+                for n in _nodes(plan):
+                    print(f"        {n['Node Type']} {n.get('Index Name') or n.get('Relation Name') or ''}")
+            failures += [f"{name}: sequential scan on {rel} (~{sizes[rel]} rows)" for rel in bad]
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Fail on sequential scans in list query plans.")
+    parser.add_argument("--seed", type=int, default=0, metavar="N", help="insert N synthetic rows per table first")
+    parser.add_argument("--min-rows", type=int, default=10_000, help="tables smaller than this may be scanned")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every plan node")
+    args = parser.parse_args(argv)
+
+    setup_logging(settings.LOG_LEVEL)
+    with SessionLocal() as db:
+        try:
+            if args.seed:
+                _seed(db, args.seed)
+            failures = check(db, min_rows=args.min_rows, verbose=args.verbose)
+        finally:
+            db.rollback()
+            if args.seed:
+                _reanalyze(db)
+    for f in failures:
+        print(f, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
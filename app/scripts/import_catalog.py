@@ -0,0 +1,49 @@
+"""
+Bulk catalog import from the command line:
+
+    python -m app.scripts.import_catalog feed.csv [--format csv|jsonl] [--batch-size 1000]
+    python -m app.scripts.import_catalog --resume 42
+
+Runs synchronously against the configured database (same pipeline as
+POST /admin/catalog/imports) and prints the run summary.
+"""
+from __future__ import annotations
+import argparse
+import sys
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.db.enums import ImportStatusEnum
+from app.db.session import SessionLocal
+from app.services.admin.catalog_import_service import CatalogImportService
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk import products/variants/images from CSV or JSONL.")
+    parser.add_argument("path", nargs="?", help="CSV or JSONL file (one row per variant)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    parser.add_argument("--resume", type=int, metavar="IMPORT_ID", help="continue an earlier run")
+    args = parser.parse_args(argv)
+    if bool(args.path) == bool(args.resume):
+        parser.error("give either a file path or --resume IMPORT_ID")
+
+    setup_logging(settings.LOG_LEVEL)
+    with SessionLocal() as db:
+        svc = CatalogImportService(db)
+        if args.resume:
+            import_id = svc.prepare_resume(args.resume).id
+        else:
+            import_id = svc.create(path=str(Path(args.path).resolve()), fmt=args.format).id
+        imp = svc.run(import_id, batch_size=args.batch_size)
+        print(
+            f"import {imp.id}: {imp.status.value} — {imp.rows_processed} rows, "
+            f"{imp.rows_ok} ok, {imp.rows_failed} failed"
+            + (f" ({imp.last_error})" if imp.last_error else "")
+        )
+        return 0 if imp.status == ImportStatusEnum.completed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
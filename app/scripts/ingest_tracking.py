@@ -0,0 +1,34 @@
+"""
+Carrier tracking file ingestion from the command line:
+
+    python -m app.scripts.ingest_tracking events.csv [--format csv|jsonl] [--carrier GHN]
+
+Same pipeline as POST /admin/shipments/events/upload; prints the ingestion report.
+Columns: carrier (optional with --carrier), tracking_number, status, occurred_at.
+"""
+from __future__ import annotations
+import argparse
+import sys
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.db.session import SessionLocal
+from app.services.admin.shipment_tracking_service import ShipmentTrackingService
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a carrier tracking file to shipments.")
+    parser.add_argument("path", help="CSV or JSONL file, one tracking event per row")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    parser.add_argument("--carrier", help="carrier for rows that do not name one")
+    args = parser.parse_args(argv)
+
+    setup_logging(settings.LOG_LEVEL)
+    with SessionLocal() as db, open(args.path, "rb") as f:
+        report = ShipmentTrackingService(db).ingest_file(f, args.path, fmt=args.format, carrier=args.carrier)
+    print(report.model_dump_json(indent=2))
+    return 1 if report.invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
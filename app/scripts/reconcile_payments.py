@@ -0,0 +1,57 @@
+"""
+Payment reconciliation against a gateway settlement file:
+
+    python -m app.scripts.reconcile_payments settlement.csv --provider momo
+        [--format csv|jsonl] [--from 2026-10-01 --to 2026-10-02] [--apply-fixes] [--chunk-size 5000]
+
+Same engine as POST /admin/payments/reconciliations; prints the run summary. Columns:
+transaction_ref, amount (or amount_cents), optional order_number.
+"""
+from __future__ import annotations
+import argparse
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.db.enums import ImportStatusEnum
+from app.db.session import SessionLocal
+from app.payments.gateways import GATEWAYS
+from app.payments.reconciliation import ReconciliationService
+
+
+def _ts(value: str) -> datetime:
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Reconcile payments against a gateway settlement file.")
+    parser.add_argument("path", help="CSV or JSONL settlement file")
+    parser.add_argument("--provider", required=True, choices=sorted(GATEWAYS))
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+    parser.add_argument("--from", dest="period_from", type=_ts, help="report paid payments from here on missing in the file")
+    parser.add_argument("--to", dest="period_to", type=_ts, help="end of that period (exclusive)")
+    parser.add_argument("--apply-fixes", action="store_true", help="record settled payments of still-pending orders")
+    parser.add_argument("--chunk-size", type=int, default=settings.RECONCILE_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    setup_logging(settings.LOG_LEVEL)
+    with SessionLocal() as db:
+        svc = ReconciliationService(db)
+        rec = svc.create(
+            path=str(Path(args.path).resolve()), provider=args.provider, fmt=args.format,
+            period_from=args.period_from, period_to=args.period_to, apply_fixes=args.apply_fixes,
+        )
+        rec = svc.run(rec.id, chunk_size=args.chunk_size)
+        print(
+            f"reconciliation {rec.id}: {rec.status.value} — {rec.rows_processed} rows, {rec.matched} matched, "
+            f"{rec.mismatched} mismatches, {rec.fixed} fixed"
+            + (f" ({rec.last_error})" if rec.last_error else "")
+        )
+        return 0 if rec.status == ImportStatusEnum.completed and not rec.mismatched else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# app/server.py
+"""
+Production entry point: `python -m app.server [--workers N] [--port 8000]`.
+
+Runs uvicorn with N worker processes (default from CPUs), uvloop/httptools when installed,
+worker recycling after SERVER_LIMIT_MAX_REQUESTS and a graceful drain on SIGTERM. Each
+worker warms the ORM and DB pool in the app lifespan before it accepts connections, and
+disposes the engine on shutdown. Development keeps `uvicorn app.main:app --reload`.
+"""
+from __future__ import annotations
+import argparse
+import importlib.util
+import os
+
+import uvicorn
+
+from app.core.config import settings
+
+
+def default_workers() -> int:
+    """WEB_CONCURRENCY, else 2 * usable CPUs + 1 capped at SERVER_MAX_WORKERS."""
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    try:
+        cpus = len(os.sched_getaffinity(0))  # honours taskset / container cpusets
+    except AttributeError:  # pragma: no cover - not on Linux
+        cpus = os.cpu_count() or 1
+    return max(1, min(2 * cpus + 1, settings.SERVER_MAX_WORKERS))
+
+
+def _available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the API with production settings.")
+    parser.add_argument("--host", default=settings.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    args = parser.parse_args(argv)
+
+    # Fail fast in the supervisor (bad settings, import errors) instead of in every worker.
+    import app.main  # noqa: F401
+
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop="uvloop" if _available("uvloop") else "asyncio",
+        http="httptools" if _available("httptools") else "h11",
+        lifespan="on",
+        limit_max_requests=settings.SERVER_LIMIT_MAX_REQUESTS or None,
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        proxy_headers=True,
+        server_header=False,
+        log_level=settings.LOG_LEVEL.lower(),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+from __future__ import annotations
+import csv
+import json
+import logging
+import shutil
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator, Optional, Union
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.enums import ImportStatusEnum, InventoryMovementType
+from app.db.locks import try_advisory_lock
+from app.db.session import SessionLocal
+from app.models.catalog_import import CatalogImport
+from app.repositories.catalog_import_repo import CatalogImportRepository
+from app.repositories.catalog_repo import CatalogRepository
+from app.repositories.product_repo import ProductRepository, MAX_BIND_PARAMS
+from app.repositories.inventory_repo import InventoryRepository
+from app.repositories.outbox_repo import OutboxRepository
+from app.outbox import events
+from app.schemas.page import Page
+from app.schemas.catalog_import import CatalogImportRow, CatalogImportErrorOut
+from app.utils.strings import slugify
+from app.exceptions import NotFound, BadRequest, Conflict
+
+log = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Product and variant upserts bind 7 parameters per row in one statement
+MAX_BATCH_SIZE = MAX_BIND_PARAMS // 7
+
+# (row_number, raw record) or (row_number, parse error message)
+_Item = tuple[int, Union[dict[str, Any], str]]
+
+
+def _read_rows(path: str, fmt: str) -> Iterator[_Item]:
+    """Stream records with stable 1-based row numbers (CSV data row / JSONL line)."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if fmt == "csv":
+            for n, rec in enumerate(csv.DictReader(f), start=1):
+                yield n, rec
+            return
+        for n, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except ValueError as e:
+                yield n, f"invalid JSON: {e}"
+                continue
+            yield n, rec if isinstance(rec, dict) else "expected a JSON object"
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in e.errors())
+
+
+def _error(n: int, sku: Any, message: str) -> dict[str, Any]:
+    return {"row_number": n, "sku": str(sku)[:64] if sku else None, "message": message[:1000]}
+
+
+class CatalogImportService:
+    """
+    Bulk catalog import. Rows are validated and upserted a batch at a time with set-based
+    statements; each batch is committed together with the run's progress and its rejected
+    rows, so an interrupted run resumes after the last committed batch.
+
+    An import never revives soft-deleted rows: a row for a deleted product or SKU is
+    rejected (restore it first), as is a SKU that already belongs to another product.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self.imports = CatalogImportRepository(db)
+        self.catalog = CatalogRepository(db)
+        self.products = ProductRepository(db)
+        self.inv = InventoryRepository(db)
+        self.outbox = OutboxRepository(db)
+
+    # ---------- Runs ----------
+    def create_from_upload(self, file: BinaryIO, filename: str, fmt: str | None = None) -> CatalogImport:
+        """Store an uploaded file under IMPORT_DIR and register a pending run for it."""
+        fmt = self._resolve_format(filename, fmt)
+        target_dir = Path(settings.IMPORT_DIR)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / f"{uuid.uuid4().hex}.{fmt}"
+        with target.open("wb") as out:
+            shutil.copyfileobj(file, out)
+        return self.create(path=str(target), filename=filename, fmt=fmt)
+
+    def create(self, *, path: str, filename: str | None = None, fmt: str | None = None) -> CatalogImport:
+        if not Path(path).is_file():
+            raise BadRequest(f"File not found: {path}")
+        fmt = self._resolve_format(filename or path, fmt)
+        row = self.imports.create({"filename": (filename or Path(path).name)[:255], "path": path, "format": fmt})
+        self.db.commit()
+        self.db.refresh(row)
+        return row
+
+    @staticmethod
+    def _resolve_format(filename: str, fmt: str | None) -> str:
+        fmt = (fmt or Path(filename).suffix.lstrip(".")).lower()
+        if fmt == "ndjson":
+            fmt = "jsonl"
+        if fmt not in IMPORT_FORMATS:
+            raise BadRequest("Import format must be 'csv' or 'jsonl'")
+        return fmt
+
+    def get(self, import_id: int) -> CatalogImport:
+        row = self.imports.get(import_id)
+        if not row:
+            raise NotFound("Import not found")
+        return row
+
+    def list_errors_page(self, import_id: int, *, limit: int, offset: int) -> Page[CatalogImportErrorOut]:
+        self.get(import_id)
+        items, total = self.imports.list_errors_paged(import_id, limit=limit, offset=offset)
+        dto = [CatalogImportErrorOut.model_validate(e, from_attributes=True) for e in items]
+        return Page[CatalogImportErrorOut].from_parts(dto, total, limit, offset)
+
+    def prepare_resume(self, import_id: int) -> CatalogImport:
+        """
+        Validate that a run can be (re)started; the caller schedules `run`. A 'running' import
+        whose process died can be resumed: `run` itself refuses to overlap a live run.
+        """
+        row = self.get(import_id)
+        if row.status == ImportStatusEnum.completed:
+            raise BadRequest("Import already completed")
+        return row
+
+    def run(self, import_id: int, *, batch_size: int | None = None) -> CatalogImport:
+        """
+        Process the file from the first uncommitted row. Guarded by an advisory lock so a
+        resume never overlaps a run still in progress in another process.
+        """
+        batch_size = min(batch_size or settings.IMPORT_BATCH_SIZE, MAX_BATCH_SIZE)
+        with try_advisory_lock(f"catalog_import:{import_id}") as acquired:
+            if not acquired:
+                raise Conflict("Import is already running")
+            imp = self.get(import_id)
+            if imp.status == ImportStatusEnum.completed:
+                return imp
+
+            imp.status = ImportStatusEnum.running
+            imp.started_at = datetime.now(timezone.utc)
+            imp.finished_at = None
+            imp.last_error = None
+            self.imports.save(imp)
+            self.db.commit()
+
+            try:
+                batch: list[_Item] = []
+                for item in _read_rows(imp.path, imp.format):
+                    if item[0] <= imp.rows_processed:
+                        continue  # committed by an earlier attempt
+                    batch.append(item)
+                    if len(batch) >= batch_size:
+                        self._commit_batch(imp, batch)
+                        batch = []
+                if batch:
+                    self._commit_batch(imp, batch)
+            except Exception as e:
+                self.db.rollback()
+                log.exception("catalog import %s failed at row %s", import_id, imp.rows_processed + 1)
+                imp.status = ImportStatusEnum.failed
+                imp.last_error = str(e)[:1000]
+            else:
+                imp.status = ImportStatusEnum.completed
+            imp.finished_at = datetime.now(timezone.utc)
+            self.imports.save(imp)
+            self.db.commit()
+            self.db.refresh(imp)
+            return imp
+
+    def _commit_batch(self, imp: CatalogImport, batch: list[_Item]) -> None:
+        """Apply one batch and advance the run's counters in the same transaction."""
+        try:
+            with self.db.begin_nested():
+                errors = self._apply(batch)
+        except SQLAlchemyError:
+            # one bad row (e.g. a unique clash inside the batch) must not sink its neighbours
+            errors = []
+            for item in batch:
+                try:
+                    with self.db.begin_nested():
+                        errors.extend(self._apply([item]))
+                except SQLAlchemyError as e:
+                    raw = item[1]
+                    sku = raw.get("sku") if isinstance(raw, dict) else None
+                    errors.append(_error(item[0], sku, str(getattr(e, "orig", None) or e).splitlines()[0]))
+
+        failed = len({e["row_number"] for e in errors})
+        imp.rows_processed = batch[-1][0]
+        imp.rows_failed += failed
+        imp.rows_ok += len(batch) - failed
+        self.imports.add_errors(imp.id, errors)
+        self.imports.save(imp)
+        self.db.commit()
+
+    # ---------- Batch upsert ----------
+    def _apply(self, batch: list[_Item]) -> list[dict[str, Any]]:
+        """Validate and upsert a batch. Returns errors for the rows it skipped."""
+        errors: list[dict[str, Any]] = []
+        rows: list[tuple[int, CatalogImportRow, str]] = []
+        seen_skus: dict[str, int] = {}
+        for n, raw in batch:
+            if isinstance(raw, str):
+                errors.append(_error(n, None, raw))
+                continue
+            try:
+                r = CatalogImportRow.model_validate(raw)
+            except ValidationError as e:
+                errors.append(_error(n, raw.get("sku"), _validation_message(e)))
+                continue
+            slug = r.product_slug or slugify(r.product_name)
+            if not slug:
+                errors.append(_error(n, r.sku, "cannot derive a product slug"))
+            elif r.sku in seen_skus:
+                errors.append(_error(n, r.sku, f"duplicate SKU (first seen in row {seen_skus[r.sku]})"))
+            else:
+                seen_skus[r.sku] = n
+                rows.append((n, r, slug))
+
+        # Lookups: one query per batch each
+        category_ids = self.catalog.category_ids_by_slug(s for _, r, _ in rows for s in r.category_slugs)
+        kept = []
+        for n, r, slug in rows:
+            unknown = [s for s in r.category_slugs if s not in category_ids]
+            if unknown:
+                errors.append(_error(n, r.sku, f"unknown category: {', '.join(unknown)}"))
+            else:
+                kept.append((n, r, slug))
+        rows = kept
+        if not rows:
+            return errors
+        brand_ids = self.catalog.ensure_brands({r.brand for _, r, _ in rows if r.brand})
+
+        # Products: the first row of each slug carries the product fields
+        product_rows: dict[str, dict[str, Any]] = {}
+        for _, r, slug in rows:
+            product_rows.setdefault(slug, {
+                "slug": slug,
+                "name": r.product_name,
+                "brand_id": brand_ids.get(r.brand.lower()) if r.brand else None,
+                "description": r.description,
+                "base_price_cents": r.base_price_cents,
+                "currency": r.currency.upper(),
+                "is_active": r.is_active,
+            })
+        product_ids = self.products.upsert_products(list(product_rows.values()))
+        kept = []
+        for n, r, slug in rows:
+            if slug in product_ids:
+                kept.append((n, r, slug))
+            else:
+                errors.append(_error(n, r.sku, f"product {slug} is deleted"))
+        rows = kept
+        if not rows:
+            return errors
+
+        # Variants: refuse to steal (product, color, size) from another SKU
+        taken = self.products.conflicting_variant_skus(
+            (product_ids[slug], r.color, r.size, r.sku) for _, r, slug in rows
+        )
+        kept = []
+        for n, r, slug in rows:
+            other = taken.get((product_ids[slug], r.color, r.size))
+            if other:
+                errors.append(_error(n, r.sku, f"color/size already used by SKU {other}"))
+            else:
+                kept.append((n, r, slug))
+        rows = kept
+        if not rows:
+            self.products.refresh_listing(product_ids.values())
+            return errors
+
+        variants = self.products.upsert_variants([
+            {
+                "product_id": product_ids[slug],
+                "sku": r.sku,
+                "color": r.color,
+                "size": r.size,
+                "stock_qty": r.stock_qty,
+                "price_cents": r.price_cents,
+                "image_url": r.variant_image_url,
+            }
+            for _, r, slug in rows
+        ])
+        written = {v.sku for v in variants}
+        if len(written) < len(rows):
+            owners = self.products.variant_owners(r.sku for _, r, _ in rows if r.sku not in written)
+            kept = []
+            for n, r, slug in rows:
+                if r.sku in written:
+                    kept.append((n, r, slug))
+                elif owners.get(r.sku, (None, False))[1]:
+                    errors.append(_error(n, r.sku, "SKU is deleted"))
+                else:
+                    errors.append(_error(n, r.sku, "SKU belongs to another product"))
+            rows = kept
+        self.products.refresh_listing(product_ids.values())
+        # Opening stock of new SKUs goes through the ledger; existing stock is left alone.
+        product_by_sku = {r.sku: product_ids[slug] for _, r, slug in rows}
+        movements = []
+        for v in variants:
+            if v.inserted and v.stock_qty > 0:
+                movements.append({
+                    "variant_id": v.id,
+                    "order_id": None,
+                    "qty_delta": v.stock_qty,
+                    "reason": InventoryMovementType.stock_in,
+                    "note": "import",
+                })
+                self.outbox.add(events.VARIANT, v.id, events.STOCK_CHANGED, {
+                    "product_id": product_by_sku[v.sku],
+                    "qty_delta": v.stock_qty,
+                    "stock_qty": v.stock_qty,
+                    "reason": InventoryMovementType.stock_in.value,
+                    "order_id": None,
+                })
+        self.inv.record_movements(movements)
+
+        # Images: product gallery (first URL is primary), plus variant images
+        images: dict[tuple[int, str], dict[str, Any]] = {}
+        for _, r, slug in rows:
+            pid = product_ids[slug]
+            for i, url in enumerate(r.image_urls):
+                images.setdefault((pid, url), {"product_id": pid, "url": url, "is_primary": i == 0, "sort_order": i})
+            if r.variant_image_url:
+                images.setdefault(
+                    (pid, r.variant_image_url),
+                    {"product_id": pid, "url": r.variant_image_url, "is_primary": False, "sort_order": len(r.image_urls)},
+                )
+        self.products.upsert_images(list(images.values()))
+        self.products.add_categories(
+            (product_ids[slug], category_ids[s]) for _, r, slug in rows for s in r.category_slugs
+        )
+        return errors
+
+
+def run_catalog_import(import_id: int, batch_size: Optional[int] = None) -> None:
+    """BackgroundTasks / CLI entry point: runs an import on its own session."""
+    with SessionLocal() as db:
+        try:
+            CatalogImportService(db).run(import_id, batch_size=batch_size)
+        except Conflict:
+            log.warning("catalog import %s is already running; skipped", import_id)
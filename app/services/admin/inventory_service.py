@@ -1,13 +1,22 @@
 # app/services/admin/inventory_service.py
 from __future__ import annotations
-from typing import List, Tuple
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Iterator, List, Tuple
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from app.repositories.inventory_repo import InventoryRepository
+from app.core.config import settings
+from app.db import partitions
+from app.repositories.inventory_repo import InventoryRepository, EXPORT_COLUMNS
 from app.db.enums import InventoryMovementType
 from app.models.inventory import InventoryMovement
+from app.schemas.inventory import StockChangeLineOut, StockChangeReportOut, StockAtOut, StockDriftOut, ReconcileOut
 from app.exceptions import NotFound, BadRequest
 
+log = logging.getLogger(__name__)
+
 class AdminInventoryService:
     def __init__(self, db: Session):
         self.db = db
@@ -19,6 +28,8 @@ class AdminInventoryService:
         variant_id: int | None = None,
         order_id: int | None = None,
         reason: InventoryMovementType | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
         sort: List[str] | None = None,
         limit: int = 50,
         offset: int = 0,
@@ -27,16 +38,34 @@ class AdminInventoryService:
             variant_id=variant_id,
             order_id=order_id,
             reason=reason,
+            created_from=created_from,
+            created_to=created_to,
             sort=sort or ["-created_at"],
             limit=limit,
             offset=offset,
         )
         return list(items_seq), total, limit, offset
 
+    def export_movements(
+        self,
+        *,
+        variant_id: int | None = None,
+        order_id: int | None = None,
+        reason: InventoryMovementType | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        sort: List[str] | None = None,
+    ) -> tuple[list[str], Iterator[Any]]:
+        rows = self.inv.iter_movements_export(
+            variant_id=variant_id, order_id=order_id, reason=reason,
+            created_from=created_from, created_to=created_to, sort=sort or ["-created_at"],
+        )
+        return list(EXPORT_COLUMNS), rows
+
     def manual_adjust(self, *, variant_id: int, qty_delta: int, note: str | None = None) -> InventoryMovement:
         if qty_delta == 0:
             raise BadRequest("qty_delta cannot be 0")
-        v = self.inv.load_variant(variant_id)
+        v = self.inv.load_variant(variant_id, include_deleted=True)
         if not v:
             raise NotFound("Variant not found")
         mov = self.inv.change_stock(
@@ -49,3 +78,131 @@ class AdminInventoryService:
         self.db.commit()
         self.db.refresh(mov)
         return mov
+
+    # ---------- Bulk ----------
+    def bulk_adjust(self, items: list[tuple[int, int]], *, note: str | None = None, dry_run: bool = False) -> StockChangeReportOut:
+        """
+        Apply many (variant_id, qty_delta) adjustments in one transaction; deltas for the
+        same variant are summed. All-or-nothing: unknown variants or a negative result
+        reject the whole request. A decrease that would leave stock below the reserved
+        quantity is skipped and reported (below_reserved_skus), as in stock_take.
+        """
+        deltas: dict[int, int] = defaultdict(int)
+        for variant_id, qty_delta in items:
+            deltas[variant_id] += qty_delta
+
+        levels = {r.id: r for r in self.inv.stock_levels(variant_ids=deltas, for_update=not dry_run)}
+        missing = sorted(set(deltas) - set(levels))
+        if missing:
+            raise NotFound("Variant not found", errors={"variant_id": missing})
+        negative = sorted(vid for vid, d in deltas.items() if levels[vid].stock_qty + d < 0)
+        if negative:
+            raise BadRequest("Adjustment would make stock negative", errors={"variant_id": negative})
+        short = {vid for vid, d in deltas.items() if d < 0 and levels[vid].stock_qty + d < levels[vid].reserved_qty}
+
+        report = self._apply_deltas(
+            [r for vid, r in levels.items() if vid not in short],
+            {vid: d for vid, d in deltas.items() if vid not in short},
+            note=note or "bulk adjust", dry_run=dry_run,
+        )
+        report.below_reserved_skus = sorted(levels[vid].sku for vid in short)
+        return report
+
+    def stock_take(self, counts: list[tuple[str, int]], *, note: str | None = None, dry_run: bool = False) -> StockChangeReportOut:
+        """
+        Reconcile absolute counts keyed by SKU: delta = counted - stock_qty, computed against
+        rows locked in one query and written as manual_adjust ledger rows. SKUs not in the
+        catalog, and counts below the variant's reserved quantity (stock promised to carts and
+        orders), are reported and skipped, not fatal. With dry_run nothing is written (diff only).
+        """
+        counted: dict[str, int] = {}
+        for sku, qty in counts:
+            if sku in counted:
+                raise BadRequest("Duplicate SKU in stock-take", errors={"sku": [sku]})
+            counted[sku] = qty
+
+        rows = self.inv.stock_levels(skus=counted, for_update=not dry_run)
+        unknown = sorted(set(counted) - {r.sku for r in rows})
+        below_reserved = sorted(r.sku for r in rows if counted[r.sku] < r.reserved_qty)
+        levels = [r for r in rows if counted[r.sku] >= r.reserved_qty]
+        deltas = {r.id: counted[r.sku] - r.stock_qty for r in levels}
+
+        report = self._apply_deltas(levels, deltas, note=note or "stock-take", dry_run=dry_run)
+        report.unknown_skus = unknown
+        report.below_reserved_skus = below_reserved
+        return report
+
+    def _apply_deltas(self, levels, deltas: dict[int, int], *, note: str, dry_run: bool) -> StockChangeReportOut:
+        lines = [
+            StockChangeLineOut(
+                variant_id=r.id, sku=r.sku, stock_before=r.stock_qty,
+                qty_delta=deltas[r.id], stock_after=r.stock_qty + deltas[r.id],
+            )
+            for r in levels if deltas.get(r.id)
+        ]
+        applied = False
+        if not dry_run and lines:
+            self.inv.bulk_change_stock(deltas, InventoryMovementType.manual_adjust, note=note)
+            self.db.commit()
+            applied = True
+        elif not dry_run:
+            self.db.commit()  # release row locks
+        return StockChangeReportOut(
+            dry_run=dry_run,
+            applied=applied,
+            lines=lines,
+            unchanged=sum(1 for r in levels if not deltas.get(r.id)),
+            total_delta=sum(line.qty_delta for line in lines),
+        )
+
+    # ---------- Ledger ----------
+    def stock_at(self, variant_id: int, at: datetime | None = None) -> StockAtOut:
+        """Ledger balance of a variant at `at` (nearest snapshot + later movements)."""
+        if not self.inv.load_variant(variant_id, include_deleted=True):
+            raise NotFound("Variant not found")
+        balance, snapshot_as_of, n = self.inv.balance_at(variant_id, at)
+        return StockAtOut(
+            variant_id=variant_id, at=at, stock_qty=balance, snapshot_as_of=snapshot_as_of, movements_applied=n
+        )
+
+    def reconcile(self, *, after_id: int = 0, limit: int = 1000, product_id: int | None = None) -> ReconcileOut:
+        """Variants (scanned `limit` at a time) whose stock_qty disagrees with the ledger."""
+        rows, next_after = self.inv.ledger_drift(after_variant_id=after_id, limit=limit, product_id=product_id)
+        return ReconcileOut(items=[StockDriftOut.model_validate(r) for r in rows], next_after_id=next_after)
+
+    def snapshot_batch(self, as_of: datetime, *, after_variant_id: int, batch_size: int) -> tuple[int, int]:
+        scanned, last_id = self.inv.write_snapshots(as_of, after_variant_id=after_variant_id, limit=batch_size)
+        self.db.commit()
+        return scanned, last_id
+
+    def maintain_partitions(self) -> tuple[list[str], list[str]]:
+        """
+        Pre-create the next INVENTORY_PARTITION_PREMAKE_MONTHS monthly partitions of the
+        ledger and archive partitions older than INVENTORY_PARTITION_RETENTION_MONTHS,
+        oldest first and only once snapshots cover them. Returns (created, archived).
+        """
+        table = InventoryMovement.__tablename__
+        # partition DDL needs a brief exclusive lock on the parent: don't queue behind long reads
+        self.db.execute(text("SET LOCAL lock_timeout = '5s'"))
+        this_month = partitions.month_start(datetime.now(timezone.utc))
+        created = partitions.ensure_month_partitions(
+            self.db, table, through=partitions.add_months(this_month, settings.INVENTORY_PARTITION_PREMAKE_MONTHS)
+        )
+
+        archived: list[str] = []
+        if settings.INVENTORY_PARTITION_RETENTION_MONTHS > 0:
+            cutoff = partitions.add_months(this_month, -settings.INVENTORY_PARTITION_RETENTION_MONTHS)
+            for p in partitions.list_partitions(self.db, table):
+                if p.start is None or p.end is None or p.end.date() > cutoff:
+                    break
+                if not self.inv.snapshots_cover(p.start, p.end):
+                    log.warning("partition %s is past retention but not covered by snapshots yet", p.name)
+                    break
+                partitions.archive_partition(self.db, table, p.name)
+                archived.append(p.name)
+
+        stray = partitions.default_partition_rows(self.db, table)
+        if stray:
+            log.warning("%s: %d rows in the default partition (outside monthly ranges)", table, stray)
+        self.db.commit()
+        return created, archived
@@ -1,17 +1,23 @@
 # app/services/admin/order_service.py
 from __future__ import annotations
 from datetime import datetime, timezone
-from typing import Optional, List, cast
+from typing import Any, Callable, Iterable, Iterator, Optional, List, Sequence, cast
 
+from sqlalchemy import Row
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.repositories.order_repo import OrderRepository
+from app.core.config import settings
+
+from app.repositories.order_repo import OrderRepository, EXPORT_COLUMNS
 from app.repositories.payment_repo import PaymentRepository
 from app.repositories.shipment_repo import ShipmentRepository
 from app.repositories.inventory_repo import InventoryRepository
+from app.repositories.outbox_repo import OutboxRepository
+from app.outbox import events
 
 from app.schemas.page import Page
-from app.schemas.order import OrderOut
+from app.schemas.order import OrderDetailOut, OrderInclude, BulkShipLineIn, BulkOrderResultOut, BulkOrdersOut
 from app.db.enums import (
     OrderStatusEnum,
     PaymentStatusEnum,
@@ -30,6 +36,7 @@ class AdminOrderService:
         self.payments = PaymentRepository(db)
         self.shipments = ShipmentRepository(db)
         self.inv = InventoryRepository(db)
+        self.outbox = OutboxRepository(db)
 
     # ---------- Read / List ----------
     def list_page(
@@ -44,7 +51,8 @@ class AdminOrderService:
         sort: List[str] = ["-created_at"],
         limit: int = 50,
         offset: int = 0,
-    ) -> Page[OrderOut]:
+        include: Sequence[OrderInclude] = (),
+    ) -> Page[OrderDetailOut]:
         items, total = self.orders.list_paged(
             user_id=user_id,
             status=status,
@@ -55,9 +63,43 @@ class AdminOrderService:
             sort=sort,
             limit=limit,
             offset=offset,
+            include=include,
         )
-        dto = [OrderOut.model_validate(o, from_attributes=True) for o in items]
-        return Page[OrderOut].from_parts(dto, total, limit, offset)
+        dto = [OrderDetailOut.from_order(o, include) for o in items]
+        return Page[OrderDetailOut].from_parts(dto, total, limit, offset)
+
+    def get_detail(
+        self, order_id: int, include: Sequence[OrderInclude] = ("items", "payments", "shipment")
+    ) -> OrderDetailOut:
+        o = self.orders.get_with(order_id, include)
+        if not o:
+            raise NotFound(detail="Order not found")
+        return OrderDetailOut.from_order(o, include)
+
+    def export_rows(
+        self,
+        *,
+        user_id: int | None = None,
+        status: Optional[List[str]] = None,
+        created_from=None,
+        created_to=None,
+        min_total: int | None = None,
+        max_total: int | None = None,
+        sort: List[str] = ["-created_at"],
+    ) -> tuple[list[str], Iterator[Any]]:
+        rows = self.orders.iter_export(
+            user_id=user_id,
+            status=status,
+            created_from=created_from,
+            created_to=created_to,
+            min_total=min_total,
+            max_total=max_total,
+            sort=sort,
+        )
+        return list(EXPORT_COLUMNS), rows
+
+    def _emit(self, o, event_type: str) -> None:
+        self.outbox.add(events.ORDER, o.id, event_type, events.order_payload(o))
 
     def _get_or_404(self, order_id: int):
         o = self.orders.get(order_id)
@@ -83,6 +125,7 @@ class AdminOrderService:
         o.status = OrderStatusEnum.paid
         o.paid_at = cast("datetime | None", now)
         self.orders.save(o)
+        self._emit(o, events.ORDER_PAID)
 
         self.db.commit()
         self.db.refresh(o)
@@ -97,7 +140,7 @@ class AdminOrderService:
         now = datetime.now(timezone.utc)
         for it in o.items:
             if it.variant_id:
-                v = self.inv.load_variant(it.variant_id)
+                v = self.inv.load_variant(it.variant_id, include_deleted=True)
                 if v:
                     self.inv.change_stock(
                         v, +it.qty, InventoryMovementType.cancel_adjust,
@@ -106,6 +149,7 @@ class AdminOrderService:
         o.status = OrderStatusEnum.cancelled
         o.cancelled_at = cast("datetime | None", now)
         self.orders.save(o)
+        self._emit(o, events.ORDER_CANCELLED)
 
         self.db.commit()
         self.db.refresh(o)
@@ -184,6 +228,7 @@ class AdminOrderService:
             o.status = OrderStatusEnum.fulfilled
             o.fulfilled_at = cast("datetime | None", datetime.now(timezone.utc))
             self.orders.save(o)
+            self._emit(o, events.ORDER_FULFILLED)
 
         self.db.commit()
         self.db.refresh(o)
@@ -198,7 +243,7 @@ class AdminOrderService:
         # Restock items
         for it in o.items:
             if it.variant_id:
-                v = self.inv.load_variant(it.variant_id)
+                v = self.inv.load_variant(it.variant_id, include_deleted=True)
                 if v:
                     self.inv.change_stock(
                         v, +it.qty, InventoryMovementType.return_in,
@@ -217,7 +262,154 @@ class AdminOrderService:
         # Update order status
         o.status = OrderStatusEnum.refunded
         self.orders.save(o)
+        self._emit(o, events.ORDER_REFUNDED)
 
         self.db.commit()
         self.db.refresh(o)
         return o
+
+    # ---------- Bulk transitions ----------
+    # Same rules as the single-order actions, applied per chunk of ADMIN_BULK_CHUNK_SIZE orders:
+    # one locking SELECT validates the chunk, then set-based UPDATEs and executemany inserts
+    # (payments, ledger, outbox) and a commit, so row locks are held only for one chunk.
+    def bulk_mark_paid(self, order_ids: Iterable[int], method: PaymentMethodEnum = PaymentMethodEnum.momo) -> BulkOrdersOut:
+        def apply(chunk: list[int]) -> dict[int, BulkOrderResultOut]:
+            ok, results = self._bulk_validate(
+                chunk, {OrderStatusEnum.pending}, "Only 'pending' orders can be marked as paid"
+            )
+            now = datetime.now(timezone.utc)
+            self.payments.create_many([
+                {"order_id": r.id, "amount_cents": r.total_cents, "status": PaymentStatusEnum.paid,
+                 "method": method, "transaction_ref": None}
+                for r in ok
+            ])
+            return results | self._bulk_transition(ok, OrderStatusEnum.paid, {"paid_at": now}, events.ORDER_PAID)
+        return self._bulk_run(order_ids, apply)
+
+    def bulk_cancel(self, order_ids: Iterable[int]) -> BulkOrdersOut:
+        def apply(chunk: list[int]) -> dict[int, BulkOrderResultOut]:
+            ok, results = self._bulk_validate(
+                chunk, {OrderStatusEnum.pending}, "Only 'pending' orders can be cancelled"
+            )
+            self._bulk_restock(ok, InventoryMovementType.cancel_adjust, "admin cancel")
+            now = datetime.now(timezone.utc)
+            return results | self._bulk_transition(
+                ok, OrderStatusEnum.cancelled, {"cancelled_at": now}, events.ORDER_CANCELLED
+            )
+        return self._bulk_run(order_ids, apply)
+
+    def bulk_refund(self, order_ids: Iterable[int], reason: str | None = None) -> BulkOrdersOut:
+        def apply(chunk: list[int]) -> dict[int, BulkOrderResultOut]:
+            ok, results = self._bulk_validate(
+                chunk, {OrderStatusEnum.paid, OrderStatusEnum.fulfilled},
+                "Only 'paid' or 'fulfilled' orders can be refunded",
+            )
+            self._bulk_restock(ok, InventoryMovementType.return_in, reason or "refund")
+            self.payments.create_many([
+                {"order_id": r.id, "amount_cents": r.total_cents, "status": PaymentStatusEnum.refunded,
+                 "method": PaymentMethodEnum.cod, "transaction_ref": None}
+                for r in ok
+            ])
+            return results | self._bulk_transition(ok, OrderStatusEnum.refunded, {}, events.ORDER_REFUNDED)
+        return self._bulk_run(order_ids, apply)
+
+    def bulk_ship(
+        self, items: Sequence[BulkShipLineIn], status: ShipmentStatusEnum = ShipmentStatusEnum.packed
+    ) -> BulkOrdersOut:
+        """Create or update shipments (e.g. a carrier manifest); 'delivered' also fulfills paid orders."""
+        lines = {it.order_id: it for it in items}  # last line wins for a repeated order
+
+        def apply(chunk: list[int]) -> dict[int, BulkOrderResultOut]:
+            ok, results = self._bulk_validate(
+                chunk, {OrderStatusEnum.paid, OrderStatusEnum.fulfilled},
+                "Shipment can be created only for paid/fulfilled orders",
+            )
+            # (carrier, tracking) is unique: reject pairs taken by another order or repeated in the request
+            pairs = {r.id: (lines[r.id].carrier, lines[r.id].tracking_number) for r in ok}
+            owners = self.shipments.tracking_owners(p for p in pairs.values() if None not in p)
+            taken = {r.id for r in ok if None not in pairs[r.id] and owners.setdefault(pairs[r.id], r.id) != r.id}
+            for r in ok:
+                if r.id in taken:
+                    results[r.id] = BulkOrderResultOut(
+                        order_id=r.id, ok=False, status=r.status.value,
+                        error="Tracking number already used by another shipment",
+                    )
+            ok = [r for r in ok if r.id not in taken]
+
+            now = datetime.now(timezone.utc)
+            shipped = status in {ShipmentStatusEnum.in_transit, ShipmentStatusEnum.delivered}
+            delivered = status == ShipmentStatusEnum.delivered
+            self.shipments.upsert_many([
+                {"order_id": r.id, "carrier": lines[r.id].carrier, "tracking_number": lines[r.id].tracking_number,
+                 "status": status, "shipped_at": now if shipped else None, "delivered_at": now if delivered else None}
+                for r in ok
+            ])
+            to_fulfill = [r for r in ok if delivered and r.status == OrderStatusEnum.paid]
+            results |= self._bulk_transition(
+                to_fulfill, OrderStatusEnum.fulfilled, {"fulfilled_at": now}, events.ORDER_FULFILLED
+            )
+            for r in ok:
+                results.setdefault(r.id, BulkOrderResultOut(order_id=r.id, ok=True, status=r.status.value))
+            return results
+        return self._bulk_run(lines, apply)
+
+    def _bulk_run(
+        self, order_ids: Iterable[int], apply: Callable[[list[int]], dict[int, BulkOrderResultOut]]
+    ) -> BulkOrdersOut:
+        ids = list(dict.fromkeys(order_ids))
+        size = max(1, settings.ADMIN_BULK_CHUNK_SIZE)
+        results: dict[int, BulkOrderResultOut] = {}
+        for start in range(0, len(ids), size):
+            chunk = ids[start:start + size]
+            try:
+                results |= apply(chunk)
+                self.db.commit()
+            except IntegrityError:
+                # e.g. a tracking number taken concurrently: this chunk is rolled back, others stand
+                self.db.rollback()
+                results |= {
+                    oid: BulkOrderResultOut(order_id=oid, ok=False, error="Conflicting concurrent change, retry")
+                    for oid in chunk
+                }
+            except Exception:
+                self.db.rollback()
+                raise
+        out = [results[oid] for oid in ids]
+        succeeded = sum(r.ok for r in out)
+        return BulkOrdersOut(processed=len(out), succeeded=succeeded, failed=len(out) - succeeded, results=out)
+
+    def _bulk_validate(
+        self, chunk: list[int], allowed: set[OrderStatusEnum], error: str
+    ) -> tuple[list[Row[Any]], dict[int, BulkOrderResultOut]]:
+        """Lock the chunk in one query; split into rows allowed to transition and failure results."""
+        rows = {r.id: r for r in self.orders.lock_many(chunk)}
+        ok: list[Row[Any]] = []
+        results: dict[int, BulkOrderResultOut] = {}
+        for oid in chunk:
+            r = rows.get(oid)
+            if r is None:
+                results[oid] = BulkOrderResultOut(order_id=oid, ok=False, error="Order not found")
+            elif r.status not in allowed:
+                results[oid] = BulkOrderResultOut(order_id=oid, ok=False, status=r.status.value, error=error)
+            else:
+                ok.append(r)
+        return ok, results
+
+    def _bulk_restock(self, rows: list[Row[Any]], reason: InventoryMovementType, note: str) -> None:
+        lines = [(oid, vid, +qty) for oid, vid, qty in self.orders.item_lines(r.id for r in rows)]
+        if lines:
+            self.inv.stock_levels(variant_ids=(vid for _, vid, _ in lines), for_update=True)
+            self.inv.bulk_change_stock_by_order(lines, reason, note=note)
+
+    def _bulk_transition(
+        self, rows: list[Row[Any]], status: OrderStatusEnum, data: dict, event_type: str
+    ) -> dict[int, BulkOrderResultOut]:
+        """UPDATE the (validated, locked) orders and queue one outbox event per order."""
+        ids = [r.id for r in rows]
+        if not ids:
+            return {}
+        self.orders.set_status_many(ids, {"status": status, **data})
+        self.outbox.add_many([
+            (events.ORDER, o.id, event_type, events.order_payload(o)) for o in self.orders.load_many(ids)
+        ])
+        return {oid: BulkOrderResultOut(order_id=oid, ok=True, status=status.value) for oid in ids}
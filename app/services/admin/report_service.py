@@ -0,0 +1,72 @@
+# app/services/admin/report_service.py
+from __future__ import annotations
+from datetime import date, timedelta
+from typing import Literal
+
+from sqlalchemy.orm import Session
+
+from app.repositories.report_repo import SalesReportRepository, BreakdownBy
+from app.exceptions import BadRequest
+
+MAX_RANGE_DAYS = 3660
+MAX_HOURLY_RANGE_DAYS = 92
+
+
+class AdminReportService:
+    """Sales reports served from rollup tables; refresh/backfill of those tables."""
+    def __init__(self, db: Session):
+        self.db = db
+        self.reports = SalesReportRepository(db)
+
+    @staticmethod
+    def _check_range(day_from: date, day_to: date, max_days: int = MAX_RANGE_DAYS) -> None:
+        if day_to < day_from:
+            raise BadRequest("'date_to' must be on or after 'date_from'")
+        if (day_to - day_from).days + 1 > max_days:
+            raise BadRequest(f"Date range is limited to {max_days} days")
+
+    # ---------- Reads ----------
+    def summary(self, day_from: date, day_to: date) -> dict:
+        self._check_range(day_from, day_to)
+        t = self.reports.totals(day_from, day_to)
+        t["cancellation_rate"] = round(t["orders_cancelled"] / t["orders_placed"], 4) if t["orders_placed"] else 0.0
+        t["refund_rate"] = round(t["orders_refunded"] / t["orders_paid"], 4) if t["orders_paid"] else 0.0
+        t["average_order_cents"] = t["revenue_cents"] // t["orders_paid"] if t["orders_paid"] else 0
+        return {"date_from": day_from, "date_to": day_to, **t}
+
+    def series(self, day_from: date, day_to: date, granularity: Literal["hour", "day"]):
+        if granularity == "hour":
+            self._check_range(day_from, day_to, MAX_HOURLY_RANGE_DAYS)
+            return [
+                {"bucket_start": r.bucket_start, **{k: getattr(r, k) for k in _SERIES_FIELDS}}
+                for r in self.reports.hourly_series(day_from, day_to)
+            ]
+        self._check_range(day_from, day_to)
+        return [{"bucket_start": r.day, **{k: getattr(r, k) for k in _SERIES_FIELDS}} for r in self.reports.daily_series(day_from, day_to)]
+
+    def breakdown(self, by: BreakdownBy, day_from: date, day_to: date, *, limit: int = 20):
+        self._check_range(day_from, day_to)
+        return [dict(r._mapping) for r in self.reports.breakdown(by, day_from, day_to, limit=limit)]
+
+    # ---------- Maintenance ----------
+    def backfill(self, day_from: date, day_to: date) -> int:
+        """Queue every day in the range for recomputation by the reports.refresh job."""
+        self._check_range(day_from, day_to)
+        days = [day_from + timedelta(days=i) for i in range((day_to - day_from).days + 1)]
+        self.reports.mark_dirty(days)
+        self.db.commit()
+        return len(days)
+
+    def refresh_dirty(self, *, batch_size: int = 10) -> int:
+        """Recompute up to `batch_size` queued days in one transaction. Returns days refreshed."""
+        days = self.reports.pop_dirty(batch_size)
+        for d in days:
+            self.reports.refresh_day(d)
+        self.db.commit()
+        return len(days)
+
+
+_SERIES_FIELDS = (
+    "orders_placed", "orders_paid", "orders_cancelled", "orders_refunded",
+    "gross_cents", "revenue_cents", "refunded_cents", "units_sold",
+)
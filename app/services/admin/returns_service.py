@@ -1,14 +1,16 @@
 # app/services/admin/returns_service.py
 from __future__ import annotations
-from typing import Optional
+from typing import Any, Iterator, List, Optional
 from datetime import datetime, timezone
 
 from sqlalchemy.orm import Session
 
-from app.repositories.returns_repo import ReturnsRepository
+from app.repositories.returns_repo import ReturnsRepository, EXPORT_COLUMNS
 from app.repositories.order_repo import OrderRepository
 from app.repositories.payment_repo import PaymentRepository
 from app.repositories.inventory_repo import InventoryRepository
+from app.repositories.outbox_repo import OutboxRepository
+from app.outbox import events
 
 from app.models.returns import ReturnRequest
 from app.db.enums import (
@@ -28,6 +30,7 @@ class AdminReturnsService:
         self.orders = OrderRepository(db)
         self.payments = PaymentRepository(db)
         self.inv = InventoryRepository(db)
+        self.outbox = OutboxRepository(db)
 
     # ---------- Reads ----------
     def get(self, return_id: int) -> ReturnRequest:
@@ -36,6 +39,16 @@ class AdminReturnsService:
             raise NotFound("Return not found")
         return r
 
+    def export_rows(
+        self,
+        *,
+        order_id: int | None = None,
+        status: Optional[List[str]] = None,
+        sort: List[str] | None = None,
+    ) -> tuple[list[str], Iterator[Any]]:
+        rows = self.returns.iter_export(order_id=order_id, status=status, sort=sort or ["-created_at"])
+        return list(EXPORT_COLUMNS), rows
+
     # ---------- Decisions ----------
     def decide(self, return_id: int, approve: bool, reason: Optional[str] = None) -> ReturnRequest:
         r = self.get(return_id)
@@ -67,7 +80,7 @@ class AdminReturnsService:
             oi = self.orders.get_item(ri.order_item_id)
             if not oi or not oi.variant_id:
                 continue
-            v = self.inv.load_variant(oi.variant_id)
+            v = self.inv.load_variant(oi.variant_id, include_deleted=True)
             if not v:
                 continue
             self.inv.change_stock(
@@ -113,6 +126,7 @@ class AdminReturnsService:
 
         order.status = OrderStatusEnum.refunded
         self.orders.save(order)
+        self.outbox.add(events.ORDER, order.id, events.ORDER_REFUNDED, events.order_payload(order))
 
         self.db.commit()
         self.db.refresh(r)
@@ -6,6 +6,7 @@ from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
 from app.repositories.review_repo import ReviewRepository
+from app.repositories.user_stats_repo import UserStatsRepository
 from app.exceptions import NotFound
 
 
@@ -13,9 +14,10 @@ class AdminReviewService:
     def __init__(self, db: Session):
         self.db = db
         self.reviews = ReviewRepository(db)
+        self.stats = UserStatsRepository(db)
 
     def set_published(self, review_id: int, is_published: bool):
-        r = self.reviews.get(review_id)
+        r = self.reviews.get(review_id, include_deleted=True)
         if not r:
             raise NotFound("Review not found")
 
@@ -25,19 +27,23 @@ class AdminReviewService:
         return r
 
     def soft_delete(self, review_id: int) -> None:
-        r = self.reviews.get(review_id)
+        r = self.reviews.get(review_id, include_deleted=True)
         if not r:
             return
         # repo helper sets deleted_at to now (UTC)
         self.reviews.soft_delete(r)
+        self.db.flush()
+        self.stats.refresh([r.user_id])
         self.db.commit()
 
     # Optional: restore a soft-deleted review
     def restore(self, review_id: int):
-        r = self.reviews.get(review_id)
+        r = self.reviews.get(review_id, include_deleted=True)
         if not r:
             raise NotFound("Review not found")
         r = self.reviews.update(r, {"deleted_at": cast("datetime | None", None)})
+        self.db.flush()
+        self.stats.refresh([r.user_id])
         self.db.commit()
         self.db.refresh(r)
         return r
@@ -0,0 +1,174 @@
+from __future__ import annotations
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Iterable, Iterator, Union
+
+from pydantic import ValidationError
+from sqlalchemy import Row
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.enums import OrderStatusEnum, ShipmentStatusEnum
+from app.repositories.order_repo import OrderRepository
+from app.repositories.shipment_repo import ShipmentRepository, STATUS_RANK as _RANK
+from app.repositories.outbox_repo import OutboxRepository
+from app.outbox import events
+from app.schemas.shipment import ShipmentEventIn, ShipmentIngestOut, ShipmentEventErrorOut
+from app.exceptions import BadRequest
+
+TRACKING_FORMATS = ("csv", "jsonl")
+MAX_REPORTED = 100  # unknown pairs / row errors listed in a report
+
+_FINAL = {ShipmentStatusEnum.delivered, ShipmentStatusEnum.cancelled}
+
+# (row_number, event) or (row_number, error message)
+_Item = tuple[int, Union[ShipmentEventIn, str]]
+
+
+def _read_events(stream: BinaryIO, fmt: str, carrier: str | None) -> Iterator[_Item]:
+    """Stream a carrier file; `carrier` fills rows that do not name one (single-carrier files)."""
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        records: Iterable[tuple[int, Any]] = enumerate(csv.DictReader(text), start=1)
+    else:
+        records = ((n, line) for n, line in enumerate(text, start=1) if line.strip())
+    for n, rec in records:
+        if fmt == "jsonl":
+            try:
+                rec = json.loads(rec)
+            except ValueError as e:
+                yield n, f"invalid JSON: {e}"
+                continue
+            if not isinstance(rec, dict):
+                yield n, "expected a JSON object"
+                continue
+        if carrier and not rec.get("carrier"):
+            rec = {**rec, "carrier": carrier}
+        try:
+            yield n, ShipmentEventIn.model_validate(rec)
+        except ValidationError as e:
+            yield n, "; ".join(f"{'.'.join(map(str, err['loc'])) or 'row'}: {err['msg']}" for err in e.errors())
+
+
+class ShipmentTrackingService:
+    """
+    Carrier tracking ingestion. Events are deduplicated and collapsed to the newest status
+    per (carrier, tracking_number), then applied a batch at a time: one locking lookup,
+    one set-based shipment UPDATE, and delivered shipments fulfil their paid orders.
+    Each batch commits on its own; replaying a file is harmless.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self.shipments = ShipmentRepository(db)
+        self.orders = OrderRepository(db)
+        self.outbox = OutboxRepository(db)
+
+    def ingest(self, items: Iterable[ShipmentEventIn]) -> ShipmentIngestOut:
+        """Webhook batch: every item is already validated."""
+        return self._ingest(enumerate(items, start=1))
+
+    def ingest_file(self, stream: BinaryIO, filename: str, *, fmt: str | None = None, carrier: str | None = None) -> ShipmentIngestOut:
+        fmt = (fmt or filename.rsplit(".", 1)[-1]).lower()
+        if fmt == "ndjson":
+            fmt = "jsonl"
+        if fmt not in TRACKING_FORMATS:
+            raise BadRequest("Tracking file format must be 'csv' or 'jsonl'")
+        return self._ingest(_read_events(stream, fmt, carrier))
+
+    def _ingest(self, items: Iterable[_Item]) -> ShipmentIngestOut:
+        report = ShipmentIngestOut(received=0)
+        size = max(1, settings.SHIPMENT_EVENTS_BATCH_SIZE)
+        batch: list[ShipmentEventIn] = []
+        for n, item in items:
+            report.received += 1
+            if isinstance(item, str):
+                report.invalid += 1
+                if len(report.errors) < MAX_REPORTED:
+                    report.errors.append(ShipmentEventErrorOut(row_number=n, message=item[:500]))
+                continue
+            batch.append(item)
+            if len(batch) >= size:
+                self._apply_batch(batch, report)
+                batch = []
+        if batch:
+            self._apply_batch(batch, report)
+        return report
+
+    def _apply_batch(self, batch: list[ShipmentEventIn], report: ShipmentIngestOut) -> None:
+        # Dedupe, then collapse per shipment: newest status wins; first transit/delivery times kept.
+        seen: set[tuple] = set()
+        latest: dict[tuple[str, str], ShipmentEventIn] = {}
+        shipped: dict[tuple[str, str], datetime] = {}
+        delivered: dict[tuple[str, str], datetime] = {}
+        for e in batch:
+            at = e.occurred_at if e.occurred_at.tzinfo else e.occurred_at.replace(tzinfo=timezone.utc)
+            ident = (e.carrier, e.tracking_number, e.status, at)
+            if ident in seen:
+                report.duplicates += 1
+                continue
+            seen.add(ident)
+            key = (e.carrier, e.tracking_number)
+            cur = latest.get(key)
+            if cur is None or (at, _RANK[e.status]) > (cur.occurred_at, _RANK[cur.status]):
+                latest[key] = e.model_copy(update={"occurred_at": at})
+            if e.status in {ShipmentStatusEnum.in_transit, ShipmentStatusEnum.delivered}:
+                shipped[key] = min(at, shipped.get(key, at))
+            if e.status == ShipmentStatusEnum.delivered:
+                delivered[key] = min(at, delivered.get(key, at))
+
+        # Lock order: orders, then shipments (as bulk_ship does), so an ingest running next to a
+        # bulk ship cannot deadlock. Only orders that may be fulfilled need locking.
+        delivering = [k for k, e in latest.items() if e.status == ShipmentStatusEnum.delivered]
+        try:
+            owners = self.shipments.tracking_owners(delivering)
+            orders = {r.id: r for r in self.orders.lock_many(owners.values())} if owners else {}
+            found = self.shipments.lock_by_tracking(latest)
+            missing = set(latest) - {(s.carrier, s.tracking_number) for s in found}
+            report.unknown += len(missing)
+            for carrier, tracking in sorted(missing)[:MAX_REPORTED - len(report.unknown_tracking)]:
+                report.unknown_tracking.append(f"{carrier}:{tracking}")
+
+            updates: list[tuple[int, str, Any, Any]] = []
+            newly_delivered: list[int] = []
+            for s in found:
+                key = (s.carrier, s.tracking_number)
+                status = latest[key].status
+                if s.status != status and (s.status in _FINAL or _RANK[status] < _RANK[s.status]):
+                    report.stale += 1
+                    status = s.status  # timestamps may still be filled in below
+                elif status == ShipmentStatusEnum.delivered and s.order_id not in orders:
+                    # tracking number moved to another order between the two reads: its order
+                    # is not locked and can't be locked now without inverting the lock order
+                    report.stale += 1
+                    continue
+                ship_at = shipped.get(key) if s.shipped_at is None else None
+                deliver_at = delivered.get(key) if s.delivered_at is None and status == ShipmentStatusEnum.delivered else None
+                if deliver_at is not None:
+                    deliver_at = max(deliver_at, s.shipped_at or ship_at or deliver_at)
+                if status == s.status and ship_at is None and deliver_at is None:
+                    continue
+                if status == ShipmentStatusEnum.delivered and s.status != status:
+                    newly_delivered.append(s.order_id)
+                updates.append((s.id, status.value, ship_at, deliver_at))
+            self.shipments.apply_tracking(updates)
+            report.shipments_updated += len(updates)
+            report.orders_fulfilled += self._fulfil([orders[oid] for oid in newly_delivered])
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def _fulfil(self, locked: list[Row[Any]]) -> int:
+        """Delivered shipment -> fulfil the (already locked) order if it is paid (same rule as update_shipment)."""
+        paid = [r.id for r in locked if r.status == OrderStatusEnum.paid]
+        if not paid:
+            return 0
+        self.orders.set_status_many(paid, {
+            "status": OrderStatusEnum.fulfilled, "fulfilled_at": datetime.now(timezone.utc),
+        })
+        self.outbox.add_many([
+            (events.ORDER, o.id, events.ORDER_FULFILLED, events.order_payload(o)) for o in self.orders.load_many(paid)
+        ])
+        return len(paid)
@@ -1,13 +1,14 @@
 # app/services/admin/user_service.py
 from __future__ import annotations
 from datetime import datetime, timezone
-from typing import Optional, List, cast
+from typing import Any, Iterator, Optional, List, cast
 
 from sqlalchemy.orm import Session
 
-from app.repositories.user_repo import UserRepository
+from app.repositories.user_repo import UserRepository, EXPORT_COLUMNS
+from app.repositories.user_stats_repo import UserStatsRepository
 from app.schemas.page import Page
-from app.schemas.user import UserOut
+from app.schemas.user import UserOut, UserStatsOut
 from app.db.enums import UserRoleEnum
 from app.exceptions import NotFound
 
@@ -16,6 +17,7 @@ class AdminUserService:
     def __init__(self, db: Session):
         self.db = db
         self.repo = UserRepository(db)
+        self.stats = UserStatsRepository(db)
 
     # ---------- Read / List ----------
     def list_page(
@@ -38,12 +40,39 @@ class AdminUserService:
             limit=limit,
             offset=offset,
         )
-        dto = [UserOut.model_validate(u, from_attributes=True) for u in items]
+        stats = self.stats.get_many(u.id for u in items)
+        dto = [
+            UserOut(id=u.id, email=u.email, stats=UserStatsOut.model_validate(stats[u.id]) if u.id in stats else UserStatsOut())
+            for u in items
+        ]
         return Page[UserOut].from_parts(dto, total, limit, offset)
 
+    def rebuild_stats_batch(self, *, after_user_id: int = 0, batch_size: int = 1000) -> tuple[int, int]:
+        """Recompute user_stats for the next `batch_size` users. Returns (count, last user id)."""
+        ids = self.stats.user_ids_after(after_user_id, batch_size)
+        if not ids:
+            return 0, after_user_id
+        self.stats.refresh(ids)
+        self.db.commit()
+        return len(ids), ids[-1]
+
+    def export_rows(
+        self,
+        *,
+        q: str | None = None,
+        role: str | None = None,
+        is_active: bool | None = None,
+        include_deleted: bool = True,            # same default as list_page
+        sort: List[str] | None = None,
+    ) -> tuple[list[str], Iterator[Any]]:
+        rows = self.repo.iter_export(
+            q=q, role=role, is_active=is_active, include_deleted=include_deleted, sort=sort or ["-created_at"]
+        )
+        return list(EXPORT_COLUMNS), rows
+
     # ---------- Mutations ----------
     def _get_or_404(self, user_id: int):
-        u = self.repo.get(user_id)
+        u = self.repo.get(user_id, include_deleted=True)
         if not u:
             raise NotFound("User not found")
         return u
@@ -1,6 +1,6 @@
 # app/services/auth_service.py
 from __future__ import annotations
-from typing import Optional
+from typing import Literal, Optional, Sequence
 from jose import JWTError
 from sqlalchemy.orm import Session
 
@@ -10,13 +10,27 @@ from app.core.security import (
     create_reset_token, decode_reset_token, password_fingerprint,
 )
 from app.exceptions import Conflict, Unauthorized, NotFound, BadRequest
+from app.models.auth import User
 from app.repositories.user_repo import UserRepository
+from app.repositories.user_stats_repo import UserStatsRepository
+from app.schemas.auth import MeOut
+from app.schemas.user import UserStatsOut
+
+MeExpand = Literal["stats"]
 
 
 class AuthService:
     def __init__(self, db: Session):
         self.db = db
         self.users = UserRepository(db)
+        self.stats = UserStatsRepository(db)
+
+    def me(self, user: User, expand: Sequence[MeExpand] = ()) -> MeOut:
+        out = MeOut.model_validate(user, from_attributes=True)
+        if "stats" in expand:
+            row = self.stats.get(user.id)  # one primary-key read
+            out.stats = UserStatsOut.model_validate(row, from_attributes=True) if row else UserStatsOut()
+        return out
 
     # ---------- Register / Login ----------
     def register(self, email: str, password: str, full_name: Optional[str] = None):
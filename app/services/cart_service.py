@@ -1,8 +1,11 @@
 # app/services/cart_service.py
 from __future__ import annotations
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.repositories.cart_repo import CartRepository
 from app.repositories.inventory_repo import InventoryRepository
+from app.repositories.reservation_repo import ReservationRepository
 from app.models.catalog import ProductVariant, Product
 from app.exceptions import NotFound, BadRequest
 
@@ -12,11 +15,15 @@ class CartService:
         self.db = db
         self.carts = CartRepository(db)
         self.inv = InventoryRepository(db)
+        self.reservations = ReservationRepository(db)
 
     def _unit_price_for(self, variant: ProductVariant) -> int:
         product: Product = variant.product
         return variant.price_cents if variant.price_cents is not None else product.base_price_cents
 
+    def _hold_until(self) -> datetime:
+        return datetime.now(timezone.utc) + timedelta(minutes=settings.CART_RESERVATION_TTL_MINUTES)
+
     def get_cart(self, user_id: int):
         cart = self.carts.get_open_for_user(user_id) or self.carts.create_for_user(user_id)
         # server-side subtotal (don’t persist; just attach for response mapping)
@@ -32,9 +39,6 @@ class CartService:
         if not variant or not variant.product or not variant.product.is_active:
             raise NotFound(detail="Variant not available")
 
-        if qty > (variant.stock_qty or 0):
-            raise BadRequest(detail="Insufficient stock")
-
         price = self._unit_price_for(variant)
         item = self.carts.add_item(
             cart,
@@ -42,6 +46,11 @@ class CartService:
             qty=qty,
             unit_price_cents=price,
         )
+        self.db.flush()
+        # reserve the whole (merged) line; replaces the old check-at-add
+        if not self.reservations.hold(item, item.qty, self._hold_until()):
+            raise BadRequest(detail="Insufficient stock")
+
         self.db.commit()
         self.db.refresh(item)
         return item
@@ -59,7 +68,7 @@ class CartService:
         if not variant:
             raise NotFound(detail="Variant not found")
 
-        if qty > (variant.stock_qty or 0):
+        if not self.reservations.hold(item, qty, self._hold_until()):
             raise BadRequest(detail="Insufficient stock")
 
         item = self.carts.update_item_qty(item, qty)
@@ -72,5 +81,14 @@ class CartService:
         item = self.carts.get_item(item_id)
         if not item or item.cart_id != cart.id:
             return
+        self.reservations.release_item(item.id)
         self.carts.remove_item(item)
         self.db.commit()
+
+    # --- maintenance (background jobs) ---
+    def abandon_idle_batch(self, idle_for: timedelta, batch_size: int) -> int:
+        """Abandon one batch of idle open carts and release their stock holds. Commits."""
+        cart_ids = self.carts.abandon_idle(datetime.now(timezone.utc) - idle_for, batch_size)
+        self.reservations.release_carts(cart_ids)
+        self.db.commit()
+        return len(cart_ids)
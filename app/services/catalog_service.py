@@ -33,7 +33,7 @@ class CatalogService:
 
     def get_brand(self, brand_id: int) -> BrandOut:
         b = self.catalog.get_brand(brand_id)
-        if not b or getattr(b, "deleted_at", None) is not None:
+        if not b:
             raise NotFound("Brand not found")
         return BrandOut.model_validate(b, from_attributes=True)
 
@@ -55,7 +55,7 @@ class CatalogService:
 
     def get_category(self, category_id: int) -> CategoryOut:
         c = self.catalog.get_category(category_id)
-        if not c or getattr(c, "deleted_at", None) is not None:
+        if not c:
             raise NotFound("Category not found")
         return CategoryOut.model_validate(c, from_attributes=True)
 
@@ -88,7 +88,7 @@ class CatalogService:
     ) -> Page[ProductOut]:
         if validate_exists:
             b = self.catalog.get_brand(brand_id)
-            if not b or getattr(b, "deleted_at", None) is not None:
+            if not b:
                 raise NotFound("Brand not found")
 
         items, total = self.products.list_paged(
@@ -118,7 +118,7 @@ class CatalogService:
     ) -> Page[ProductOut]:
         if validate_exists:
             c = self.catalog.get_category(category_id)
-            if not c or getattr(c, "deleted_at", None) is not None:
+            if not c:
                 raise NotFound("Category not found")
 
         items, total = self.products.list_paged(
@@ -0,0 +1,75 @@
+# app/services/feed_service.py
+from __future__ import annotations
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.db.enums import FeedKindEnum
+from app.repositories.feed_repo import FeedRepository, FeedScope, SCOPES
+from app.schemas.feed import FeedOut
+from app.services.product_service import ProductService
+from app.utils.dates import local_day
+from app.exceptions import BadRequest
+
+log = logging.getLogger(__name__)
+
+FEEDS_TAG = "feeds"
+
+
+class FeedService:
+    """
+    Home page rails. The feeds.refresh job ranks products per kind and scope into
+    product_feeds; a read is one cached primary-key lookup for the id list plus
+    ProductService.cards (card cache, one IN query for misses).
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self.feeds = FeedRepository(db)
+        self.products = ProductService(db)
+
+    # ---------- Read ----------
+    def get_feed(self, kind: FeedKindEnum, scope: FeedScope, scope_id: Optional[int], *, limit: int) -> FeedOut:
+        if scope == "global":
+            scope_id = None
+        elif scope_id is None:
+            raise BadRequest(f"scope_id is required for scope={scope}")
+        entry = get_cache().get_or_set(
+            f"feed:{kind.value}:{scope}:{scope_id or 0}",
+            lambda: self._load(kind, scope, scope_id or 0),
+            ttl=settings.FEED_CACHE_TTL_SECONDS,
+            tags=[FEEDS_TAG],
+        )
+        # hydrate a little past `limit`: products hidden since the refresh are skipped
+        items = self.products.cards(entry["ids"][: limit * 2])[:limit]
+        return FeedOut(kind=kind, scope=scope, scope_id=scope_id, computed_at=entry["computed_at"], items=items)
+
+    def _load(self, kind: FeedKindEnum, scope: FeedScope, scope_id: int) -> dict:
+        row = self.feeds.get(kind, scope, scope_id)
+        if row is None:
+            return {"ids": [], "computed_at": None}
+        return {"ids": list(row.product_ids), "computed_at": row.computed_at.isoformat()}
+
+    # ---------- Refresh (job) ----------
+    def refresh_all(self, should_stop: Callable[[], bool] = lambda: False) -> int:
+        """Recompute every kind for every scope; one transaction per kind. Returns lists written."""
+        size = settings.FEED_SIZE
+        since = local_day(datetime.now(timezone.utc)) - timedelta(days=settings.FEED_BESTSELLER_DAYS)
+        sources = {
+            FeedKindEnum.bestsellers: lambda: self.feeds.bestseller_scores(since),
+            FeedKindEnum.new_arrivals: self.feeds.new_arrival_scores,
+            FeedKindEnum.top_rated: lambda: self.feeds.top_rated_scores(settings.FEED_TOP_RATED_MIN_REVIEWS),
+        }
+        total = 0
+        for kind, scores in sources.items():
+            if should_stop():
+                break
+            n = sum(self.feeds.store(kind, scope, scores(), size=size) for scope in SCOPES)
+            self.db.commit()
+            log.info("feed %s: %d lists", kind.value, n)
+            total += n
+        get_cache().invalidate_tags(FEEDS_TAG)
+        return total
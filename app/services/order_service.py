@@ -1,7 +1,7 @@
 # app/services/order_service.py
 from __future__ import annotations
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from sqlalchemy.orm import Session
 
@@ -9,8 +9,11 @@ from app.repositories.cart_repo import CartRepository
 from app.repositories.order_repo import OrderRepository
 from app.repositories.payment_repo import PaymentRepository
 from app.repositories.inventory_repo import InventoryRepository
+from app.repositories.reservation_repo import ReservationRepository
+from app.repositories.outbox_repo import OutboxRepository
+from app.outbox import events
 
-from app.schemas.order import OrderOut
+from app.schemas.order import OrderDetailOut, OrderInclude
 from app.schemas.page import Page
 from app.utils.orders import gen_order_number
 from app.exceptions import NotFound, BadRequest
@@ -28,6 +31,8 @@ class OrderService:
         self.orders = OrderRepository(db)
         self.payments = PaymentRepository(db)
         self.inv = InventoryRepository(db)
+        self.reservations = ReservationRepository(db)
+        self.outbox = OutboxRepository(db)
 
     # -------- User list as Page --------
     def list_my_orders_page(
@@ -42,7 +47,8 @@ class OrderService:
         sort: list[str] = ["-created_at"],
         limit: int = 50,
         offset: int = 0,
-    ) -> Page[OrderOut]:
+        include: Sequence[OrderInclude] = (),
+    ) -> Page[OrderDetailOut]:
         items, total = self.orders.list_paged(
             user_id=user_id,
             status=status,
@@ -53,9 +59,10 @@ class OrderService:
             sort=sort,
             limit=limit,
             offset=offset,
+            include=include,
         )
-        dto = [OrderOut.model_validate(o, from_attributes=True) for o in items]
-        return Page[OrderOut].from_parts(dto, total, limit, offset)
+        dto = [OrderDetailOut.from_order(o, include) for o in items]
+        return Page[OrderDetailOut].from_parts(dto, total, limit, offset)
 
     # -------- Admin list as Page --------
     def list_admin_orders_page(
@@ -70,7 +77,8 @@ class OrderService:
         sort: list[str] = ["-created_at"],
         limit: int = 50,
         offset: int = 0,
-    ) -> Page[OrderOut]:
+        include: Sequence[OrderInclude] = (),
+    ) -> Page[OrderDetailOut]:
         items, total = self.orders.list_paged(
             user_id=user_id,
             status=status,
@@ -81,9 +89,13 @@ class OrderService:
             sort=sort,
             limit=limit,
             offset=offset,
+            include=include,
         )
-        dto = [OrderOut.model_validate(o, from_attributes=True) for o in items]
-        return Page[OrderOut].from_parts(dto, total, limit, offset)
+        dto = [OrderDetailOut.from_order(o, include) for o in items]
+        return Page[OrderDetailOut].from_parts(dto, total, limit, offset)
+
+    def _emit(self, o: Order, event_type: str) -> None:
+        self.outbox.add(events.ORDER, o.id, event_type, events.order_payload(o))
 
     def get_for_user(self, user_id: int, order_id: int) -> Order:
         o = self.orders.get(order_id)
@@ -91,6 +103,12 @@ class OrderService:
             raise NotFound(detail="Order not found")
         return o
 
+    def get_detail_for_user(self, user_id: int, order_id: int, include: Sequence[OrderInclude] = ("items",)) -> OrderDetailOut:
+        o = self.orders.get_with(order_id, include)
+        if not o or o.user_id != user_id:
+            raise NotFound(detail="Order not found")
+        return OrderDetailOut.from_order(o, include)
+
     # ---- Checkout ----
     def checkout(
         self,
@@ -104,13 +122,18 @@ class OrderService:
         if not cart or not cart.items:
             raise BadRequest(detail="Cart is empty")
 
+        # Hand this cart's holds back, then lock the variants and check against
+        # what other carts still reserve (stock_qty - reserved_qty).
+        self.reservations.release_cart(cart.id)
+        variants = self.inv.lock_variants(it.variant_id for it in cart.items)
+
         # Recompute subtotal & validate stock/availability
         subtotal = 0
         for it in cart.items:
-            v = self.inv.load_variant(it.variant_id)
+            v = variants.get(it.variant_id)
             if not v or not v.product or not v.product.is_active:
                 raise BadRequest(detail=f"Variant {it.variant_id} unavailable")
-            if it.qty > (v.stock_qty or 0):
+            if it.qty > v.available_qty:
                 raise BadRequest(detail=f"Insufficient stock for variant {it.variant_id}")
             subtotal += it.line_total_cents
 
@@ -119,7 +142,7 @@ class OrderService:
 
         # 1) create order (snapshot shipping)
         o = self.orders.create({
-            "order_number": gen_order_number(),
+            "order_number": gen_order_number(self.db),
             "user_id": user_id,
             "status": OrderStatusEnum.pending,
             "subtotal_cents": subtotal,
@@ -135,13 +158,11 @@ class OrderService:
             "ship_ward_name": shipping.get("ward_name"),
             "ship_zip_code": shipping.get("zip_code"),
         })
+        self.db.flush()  # assign o.id for items / ledger rows
 
         # 2) add items & decrement stock with ledger
         for it in cart.items:
-            v = self.inv.load_variant(it.variant_id)
-            # v cannot be None here due to earlier checks, but keep it safe:
-            if not v or not v.product or not v.product.is_active:
-                raise BadRequest(detail=f"Variant {it.variant_id} unavailable")
+            v = variants[it.variant_id]
 
             self.inv.change_stock(
                 v, -it.qty, InventoryMovementType.sold,
@@ -182,6 +203,11 @@ class OrderService:
             o.paid_at = now
             self.orders.save(o)
 
+        self.db.flush()  # o.items for the event payload
+        self._emit(o, events.ORDER_PLACED)
+        if pay_now:
+            self._emit(o, events.ORDER_PAID)
+
         self.db.commit()
         self.db.refresh(o)
         return o
@@ -203,6 +229,7 @@ class OrderService:
         o.status = OrderStatusEnum.paid
         o.paid_at = now
         self.orders.save(o)
+        self._emit(o, events.ORDER_PAID)
 
         self.db.commit()
         self.db.refresh(o)
@@ -218,7 +245,7 @@ class OrderService:
         # return stock
         for it in o.items:
             if it.variant_id:
-                v = self.inv.load_variant(it.variant_id)
+                v = self.inv.load_variant(it.variant_id, include_deleted=True)
                 if v:
                     self.inv.change_stock(
                         v, +it.qty, InventoryMovementType.cancel_adjust,
@@ -227,6 +254,7 @@ class OrderService:
         o.status = OrderStatusEnum.cancelled
         o.cancelled_at = now
         self.orders.save(o)
+        self._emit(o, events.ORDER_CANCELLED)
 
         self.db.commit()
         self.db.refresh(o)
@@ -244,6 +272,7 @@ class OrderService:
         o.status = OrderStatusEnum.fulfilled
         o.fulfilled_at = now
         self.orders.save(o)
+        self._emit(o, events.ORDER_FULFILLED)
 
         self.db.commit()
         self.db.refresh(o)
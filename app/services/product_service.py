@@ -1,19 +1,35 @@
 # app/services/product_service.py
 from __future__ import annotations
-from typing import Sequence
+from typing import Iterable, Sequence
 from sqlalchemy.orm import Session
 
+from app.core.cache import get_cache
+from app.core.config import settings
 from app.repositories.product_repo import ProductRepository
 from app.schemas.page import Page
 from app.schemas.product import (
     ImageOut, ProductCreate, ProductOut, ProductUpdate,
     VariantCreate, VariantUpdate, ImageCreate, ImageUpdate,
+    VariantAvailabilityIn, VariantAvailabilityOut, VariantAvailabilityListOut,
 )
 from app.models.catalog import Product, ProductVariant, ProductImage
 from app.exceptions import NotFound, Conflict, BadRequest
 from app.utils.strings import slugify_unique
 
 
+def card_key(product_id: int) -> str:
+    """Cache key of a product card (ProductOut JSON), shared by feed and listing hydration."""
+    return f"catalog:card:{product_id}"
+
+
+def _avail_sku_key(sku: str) -> str:
+    return f"catalog:avail:sku:{sku}"
+
+
+def _avail_id_key(variant_id: int) -> str:
+    return f"catalog:avail:id:{variant_id}"
+
+
 class ProductService:
     def __init__(self, db: Session):
         self.db = db
@@ -31,6 +47,9 @@ class ProductService:
             "brand_id": payload.brand_id,
             "description": payload.description,
             "base_price_cents": payload.base_price_cents,
+            # no variants yet: the listing price range is the base price
+            "min_price_cents": payload.base_price_cents,
+            "max_price_cents": payload.base_price_cents,
             "currency": payload.currency,
             "is_active": payload.is_active,
             "is_archived": payload.is_archived,
@@ -77,8 +96,11 @@ class ProductService:
             set_cats = getattr(self.repo, "set_categories", None)
             if callable(set_cats):
                 set_cats(p.id, payload.category_ids)
+        if "base_price_cents" in updates:
+            self.repo.refresh_listing([p.id])  # variants without a price inherit it
 
         self.db.commit()
+        get_cache().delete(card_key(p.id))
         self.db.refresh(p)
         return p
 
@@ -95,6 +117,25 @@ class ProductService:
             dto, total, kwargs.get("limit", 50), kwargs.get("offset", 0)
         )
 
+    def cards(self, product_ids: Iterable[int]) -> list[ProductOut]:
+        """
+        Visible products in the given order. Cards come from the cache; misses are loaded with
+        one IN query and cached for PRODUCT_CARD_CACHE_TTL_SECONDS (stock flags may lag that long).
+        Hidden or deleted ids are skipped.
+        """
+        ids = list(dict.fromkeys(product_ids))
+        cache = get_cache()
+        cards = cache.get_many(card_key(i) for i in ids)
+        missing = [i for i in ids if card_key(i) not in cards]
+        if missing:
+            fresh = {
+                card_key(p.id): ProductOut.model_validate(p, from_attributes=True).model_dump(mode="json")
+                for p in self.repo.visible_by_ids(missing)
+            }
+            cache.set_many(fresh, ttl=settings.PRODUCT_CARD_CACHE_TTL_SECONDS)
+            cards.update(fresh)
+        return [ProductOut.model_validate(cards[k]) for i in ids if (k := card_key(i)) in cards]
+
     def list_images(self, product_id: int) -> list[ImageOut]:
         imgs: Sequence[ProductImage] = self.repo.list_images(product_id)
         return [ImageOut.model_validate(i, from_attributes=True) for i in imgs]
@@ -112,6 +153,7 @@ class ProductService:
             self.repo.update(p, {"is_archived": True})
 
         self.db.commit()
+        get_cache().delete(card_key(product_id))
 
     # ---------- Variants ----------
     def add_variant(self, product_id: int, payload: VariantCreate) -> ProductVariant:
@@ -129,6 +171,7 @@ class ProductService:
 
         try:
             v = self.repo.create_variant(product_id, data)
+            self.repo.refresh_listing([product_id])
             self.db.commit()
             self.db.refresh(v)
             return v
@@ -148,20 +191,63 @@ class ProductService:
         if payload.image_url is not None:  data["image_url"] = payload.image_url
 
         v = self.repo.update_variant(v, data)
+        if "stock_qty" in data or "price_cents" in data:
+            self.repo.refresh_listing([v.product_id])
         self.db.commit()
         self.db.refresh(v)
         return v
 
     def list_variants(self, product_id: int) -> Sequence[ProductVariant]:
-        if not self.repo.get(product_id):
+        variants = self.repo.list_variants(product_id)
+        # only an empty list needs the existence check
+        if not variants and not self.repo.get(product_id):
             raise NotFound(detail="Product not found")
-        return self.repo.list_variants(product_id)
+        return variants
+
+    def variant_availability(self, payload: VariantAvailabilityIn) -> VariantAvailabilityListOut:
+        """
+        Stock, reservations and price for many variants by SKU or id, in request order.
+        Rows are micro-cached under both keys for VARIANT_AVAILABILITY_CACHE_TTL_SECONDS, so
+        hot SKUs during a drop cost one query per TTL; misses are loaded with one query and
+        unknown keys are not cached.
+        """
+        skus = list(dict.fromkeys(payload.skus))
+        ids = list(dict.fromkeys(payload.variant_ids))
+        sku_key = {s: _avail_sku_key(s) for s in skus}
+        id_key = {i: _avail_id_key(i) for i in ids}
+        ttl = settings.VARIANT_AVAILABILITY_CACHE_TTL_SECONDS
+        cache = get_cache()
+        rows = cache.get_many([*sku_key.values(), *id_key.values()]) if ttl > 0 else {}
+
+        miss_skus = [s for s in skus if sku_key[s] not in rows]
+        miss_ids = [i for i in ids if id_key[i] not in rows]
+        if miss_skus or miss_ids:
+            fresh: dict[str, dict] = {}
+            for r in self.repo.variant_availability(variant_ids=miss_ids, skus=miss_skus):
+                row = VariantAvailabilityOut(
+                    variant_id=r.id, sku=r.sku, product_id=r.product_id,
+                    stock_qty=r.stock_qty, reserved_qty=r.reserved_qty,
+                    available_qty=r.stock_qty - r.reserved_qty, price_cents=r.price_cents,
+                ).model_dump()
+                fresh[_avail_sku_key(r.sku)] = fresh[_avail_id_key(r.id)] = row
+            if ttl > 0 and fresh:
+                cache.set_many(fresh, ttl=ttl)
+            rows.update(fresh)
+
+        found = [rows[k] for k in [*sku_key.values(), *id_key.values()] if k in rows]
+        return VariantAvailabilityListOut(
+            items=[VariantAvailabilityOut.model_validate(r) for r in {r["variant_id"]: r for r in found}.values()],
+            missing_skus=[s for s in skus if sku_key[s] not in rows],
+            missing_variant_ids=[i for i in ids if id_key[i] not in rows],
+        )
 
     def delete_variant(self, variant_id: int) -> None:
         v = self.repo.get_variant(variant_id)
         if not v:
             return
+        product_id = v.product_id
         self.repo.delete_variant(v)
+        self.repo.refresh_listing([product_id])
         self.db.commit()
 
     # ---------- Images ----------
@@ -0,0 +1,233 @@
+# app/services/related_service.py
+from __future__ import annotations
+import logging
+from itertools import chain
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repositories.related_repo import RelatedRepository
+from app.schemas.product import ProductOut
+from app.schemas.related import RelatedOut
+from app.services.product_service import ProductService
+from app.exceptions import NotFound
+
+log = logging.getLogger(__name__)
+
+_WRITE_BATCH = 1000
+_READ_CHUNK = 50_000
+
+
+# ---------- vectorized helpers (1-D int64 arrays throughout) ----------
+def _as_array(rows: Sequence[Any], width: int, dtype: Any = np.int64) -> np.ndarray:
+    """DB rows as an (n, width) array; np.fromiter on the flat values avoids numpy probing each Row."""
+    flat = chain.from_iterable(rows)
+    return np.fromiter(flat, dtype=dtype, count=len(rows) * width).reshape(-1, width)
+
+
+def _pair_key(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pack two product ids (< 2**31) into one sortable int64."""
+    return (a.astype(np.int64) << 32) | b.astype(np.int64)
+
+
+def _sum_by_key(keys: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    return uniq, np.bincount(inverse, weights=counts).astype(np.int64)
+
+
+def _fold(keys: list[np.ndarray], counts: list[np.ndarray]) -> None:
+    """Reduce accumulated (keys, counts) chunks in place to a single summed chunk."""
+    k, c = _sum_by_key(np.concatenate(keys), np.concatenate(counts))
+    keys[:], counts[:] = [k], [c]
+
+
+def _basket_pairs(orders: np.ndarray, products: np.ndarray, max_basket: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Every (a, b) with a < b bought in the same order. Rows are sorted by (order, product), so
+    each basket is a run; the k-th row of a run of size s pairs with the s-1-k rows after it.
+    Baskets larger than `max_basket` (bulk buys) are skipped: they add s^2 pairs and little signal.
+    """
+    starts = np.flatnonzero(np.r_[True, orders[1:] != orders[:-1]])
+    sizes = np.diff(np.r_[starts, len(orders)])
+    keep = (sizes >= 2) & (sizes <= max_basket)
+    if not keep.any():
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    starts, sizes = starts[keep], sizes[keep]
+    pos = np.repeat(starts, sizes) + (np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes))
+    after = np.repeat(starts + sizes, sizes) - pos - 1               # partners following each position
+    left = np.repeat(pos, after)
+    right = left + np.arange(after.sum()) - np.repeat(np.cumsum(after) - after, after) + 1
+    return products[left], products[right]
+
+
+def _top_k(rows: np.ndarray, cols: np.ndarray, scores: np.ndarray, k: int) -> dict[int, list[int]]:
+    """Best `k` cols per row by score (ties: lower id first)."""
+    if not len(rows):
+        return {}
+    order = np.lexsort((cols, -scores, rows))
+    rows, cols = rows[order], cols[order]
+    starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    sizes = np.diff(np.r_[starts, len(rows)])
+    rank = np.arange(len(rows)) - np.repeat(starts, sizes)
+    rows, cols = rows[rank < k], cols[rank < k]
+    bounds = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    return {int(r): c.tolist() for r, c in zip(rows[bounds], np.split(cols, bounds[1:]))}
+
+
+class RelatedService:
+    """
+    "Customers also bought" and "similar products". The products.related job computes both
+    lists for every visible product into product_related; a product page reads one row by
+    primary key and hydrates it through ProductService.cards.
+    """
+    def __init__(self, db: Session):
+        self.db = db
+        self.repo = RelatedRepository(db)
+        self.products = ProductService(db)
+
+    # ---------- Read ----------
+    def get_related(self, product_id: int, *, limit: int) -> RelatedOut:
+        row = self.repo.get(product_id)
+        if row is None:
+            if not self.products.cards([product_id]):
+                raise NotFound(detail="Product not found")
+            return RelatedOut(product_id=product_id, also_bought=[], similar=[])
+        # one card lookup for both lists; products hidden since the run are skipped
+        also_ids, similar_ids = row.also_bought_ids[: limit * 2], row.similar_ids[: limit * 2]
+        cards = {p.id: p for p in self.products.cards([*also_ids, *similar_ids])}
+        return RelatedOut(
+            product_id=product_id,
+            computed_at=row.computed_at,
+            also_bought=[cards[i] for i in also_ids if i in cards][:limit],
+            similar=[cards[i] for i in similar_ids if i in cards][:limit],
+        )
+
+    # ---------- Recently viewed ----------
+    def record_view(self, user_id: int, product_id: int) -> None:
+        if not self.products.cards([product_id]):
+            raise NotFound(detail="Product not found")
+        self.repo.record_view(user_id, product_id, keep=settings.RECENTLY_VIEWED_MAX)
+        self.db.commit()
+
+    def recently_viewed(self, user_id: int, *, limit: int) -> list[ProductOut]:
+        return self.products.cards(self.repo.recent_ids(user_id, limit))
+
+    # ---------- Rebuild (job) ----------
+    def rebuild(self, should_stop: Callable[[], bool] = lambda: False) -> int:
+        """Recompute both lists for every visible product. Returns the number of rows written."""
+        started = datetime.now(timezone.utc)
+        features = _as_array([(i, np.nan if b is None else b, price) for i, b, price in self.repo.visible_features()], 3, np.float64)
+        visible = features[:, 0].astype(np.int64)
+        also = self._also_bought(started - timedelta(days=settings.RELATED_LOOKBACK_DAYS), visible)
+        if should_stop():
+            return 0
+        similar = self._similar(features)
+        k = settings.RELATED_TOP_K
+        also_top = _top_k(*also, k)
+        similar_top = _top_k(*similar, k)
+        log.info("related products: %d also-bought lists, %d similar lists", len(also_top), len(similar_top))
+
+        written = 0
+        ids = sorted(also_top.keys() | similar_top.keys())
+        for i in range(0, len(ids), _WRITE_BATCH):
+            if should_stop():
+                # leave the previous lists of the unwritten products in place
+                return written
+            batch = ids[i:i + _WRITE_BATCH]
+            self.repo.upsert_many([
+                {"product_id": p, "also_bought_ids": also_top.get(p, []), "similar_ids": similar_top.get(p, []), "computed_at": started}
+                for p in batch
+            ])
+            self.db.commit()
+            written += len(batch)
+        self.repo.drop_stale(started)
+        self.db.commit()
+        return written
+
+    def _also_bought(self, since: datetime, visible: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Sparse co-occurrence over purchased baskets, scored by cosine c(a,b) / sqrt(n(a) n(b)).
+        Rows are streamed in chunks; an order cut by a chunk boundary is carried into the next one.
+        """
+        max_basket = settings.RELATED_MAX_BASKET
+        pair_keys: list[np.ndarray] = [np.empty(0, dtype=np.int64)]
+        pair_counts: list[np.ndarray] = [np.empty(0, dtype=np.int64)]
+        item_keys: list[np.ndarray] = [np.empty(0, dtype=np.int64)]
+        item_counts: list[np.ndarray] = [np.empty(0, dtype=np.int64)]
+
+        def consume(chunk: np.ndarray) -> None:
+            a, b = _basket_pairs(chunk[:, 0], chunk[:, 1], max_basket)
+            keys, counts = np.unique(_pair_key(a, b), return_counts=True)
+            pair_keys.append(keys); pair_counts.append(counts)
+            keys, counts = np.unique(chunk[:, 1], return_counts=True)
+            item_keys.append(keys); item_counts.append(counts)
+            if len(pair_keys) > 16:   # fold partial counts to bound memory
+                _fold(pair_keys, pair_counts)
+                _fold(item_keys, item_counts)
+
+        carry = np.empty((0, 2), dtype=np.int64)
+        for part in self.repo.purchase_rows(since, chunk=_READ_CHUNK):
+            rows = np.concatenate([carry, _as_array(part, 2)])
+            tail = np.searchsorted(rows[:, 0], rows[-1, 0])
+            consume(rows[:tail])
+            carry = rows[tail:]
+        consume(carry)
+
+        _fold(pair_keys, pair_counts)
+        _fold(item_keys, item_counts)
+        (keys,), (c,), (items,), (n,) = pair_keys, pair_counts, item_keys, item_counts
+        a, b = keys >> 32, keys & 0xFFFFFFFF
+        ok = (c >= settings.RELATED_MIN_COOCCURRENCE) & np.isin(a, visible) & np.isin(b, visible)
+        a, b, c = a[ok], b[ok], c[ok]
+        score = c / np.sqrt(n[np.searchsorted(items, a)] * n[np.searchsorted(items, b)])
+        return np.r_[a, b], np.r_[b, a], np.r_[score, score]
+
+    def _similar(self, features: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Content neighbours: products sharing a (category, price band) or (brand, price band)
+        group, the band being floor(log2(price)). Within a group sorted by price, each product
+        pairs with the RELATED_SIMILAR_WINDOW nearest by price rather than the whole group.
+        Score = shared groups minus half the log2 price distance.
+        """
+        if not len(features):
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0)
+        ids = features[:, 0].astype(np.int64)
+        log_price = np.log2(np.maximum(features[:, 2], 1))
+        band = np.floor(log_price).astype(np.int64)
+        by_id = dict(zip(ids.tolist(), range(len(ids))))
+
+        # a product that became visible after visible_features() ran is not in `features`: skip it
+        links = [(by_id[p], c) for p, c in self.repo.visible_categories() if p in by_id]
+        cat_idx = np.fromiter((i for i, _ in links), dtype=np.int64, count=len(links))
+        cat = np.fromiter((c for _, c in links), dtype=np.int64, count=len(links))
+        has_brand = ~np.isnan(features[:, 1])
+        brand_idx = np.flatnonzero(has_brand)
+        brand = features[has_brand, 1].astype(np.int64)
+
+        # group key: kind bit | owner id | band; member: index into `features`
+        group = np.r_[(cat << 8) | band[cat_idx], (brand << 8) | band[brand_idx] | (1 << 62)]
+        member = np.r_[cat_idx, brand_idx]
+        order = np.lexsort((log_price[member], group))
+        group, member = group[order], member[order]
+
+        a_parts, b_parts = [], []
+        for d in range(1, settings.RELATED_SIMILAR_WINDOW + 1):
+            same = group[d:] == group[:-d]
+            if not same.any():
+                break
+            a_parts.append(member[:-d][same]); b_parts.append(member[d:][same])
+        if not a_parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0)
+        a, b = np.concatenate(a_parts), np.concatenate(b_parts)
+        a, b = np.minimum(a, b), np.maximum(a, b)
+        keys, shared = np.unique(_pair_key(a, b), return_counts=True)
+        a, b = keys >> 32, keys & 0xFFFFFFFF
+        score = shared - 0.5 * np.abs(log_price[a] - log_price[b])
+        a, b = ids[a], ids[b]
+        return np.r_[a, b], np.r_[b, a], np.r_[score, score]
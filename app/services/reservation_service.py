@@ -0,0 +1,32 @@
+# app/services/reservation_service.py
+from __future__ import annotations
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from app.repositories.inventory_repo import InventoryRepository
+from app.repositories.reservation_repo import ReservationRepository
+
+
+class ReservationService:
+    """Maintenance side of cart stock holds (the request path lives in CartService/OrderService)."""
+    def __init__(self, db: Session):
+        self.db = db
+        self.reservations = ReservationRepository(db)
+        self.inv = InventoryRepository(db)
+
+    def available(self, variant_ids: list[int]) -> dict[int, int]:
+        return self.inv.available_qty(variant_ids)
+
+    def expire_stale(self, *, batch_size: int = 500, max_batches: int | None = None) -> int:
+        """Release expired holds in short batches (one commit each). Returns rows released."""
+        total = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            n = self.reservations.expire_batch(datetime.now(timezone.utc), batch_size)
+            self.db.commit()
+            total += n
+            batches += 1
+            if n < batch_size:
+                break
+        return total
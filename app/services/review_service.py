@@ -3,6 +3,7 @@ from __future__ import annotations
 from sqlalchemy.orm import Session
 
 from app.repositories.review_repo import ReviewRepository
+from app.repositories.user_stats_repo import UserStatsRepository
 from app.schemas.page import Page
 from app.schemas.review import ReviewOut, ReviewCreate, ReviewUpdate
 from app.exceptions import NotFound, BadRequest
@@ -13,6 +14,7 @@ class ReviewService:
     def __init__(self, db: Session):
         self.db = db
         self.repo = ReviewRepository(db)
+        self.stats = UserStatsRepository(db)
 
     # -------- Public listing for a product --------
     def list_product_reviews_page(
@@ -63,6 +65,8 @@ class ReviewService:
         data.update({"user_id": payload.user_id, "product_id": product_id})
 
         row = self.repo.create(data)
+        self.db.flush()
+        self.stats.refresh([row.user_id])
         self.db.commit()
 
         self.db.refresh(row)
@@ -70,7 +74,7 @@ class ReviewService:
 
     def update_review(self, review_id: int, payload: ReviewUpdate) -> ReviewOut:
         row = self.repo.get(review_id)
-        if not row or row.deleted_at is not None:
+        if not row:
             raise NotFound("Review not found")
 
         changes = {k: v for k, v in payload.model_dump().items() if v is not None}
@@ -85,10 +89,12 @@ class ReviewService:
 
     def delete_review(self, user_id: int, review_id: int) -> None:
         row = self.repo.get(review_id)
-        if not row or row.deleted_at is not None:
+        if not row:
             raise NotFound("Review not found")
         if row.user_id != user_id:
             raise BadRequest("You can only delete your own review")
 
         self.repo.soft_delete(row)
+        self.db.flush()
+        self.stats.refresh([row.user_id])
         self.db.commit()
@@ -0,0 +1,28 @@
+# app/utils/dates.py
+from __future__ import annotations
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from app.core.config import settings
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+def report_tz() -> ZoneInfo:
+    return _zone(settings.REPORTS_TIMEZONE)
+
+
+def local_day(ts: datetime) -> date:
+    """Calendar day of an instant in the reporting timezone."""
+    return ts.astimezone(report_tz()).date()
+
+
+def day_window(day_from: date, day_to: date | None = None) -> tuple[datetime, datetime]:
+    """[start, end) instants covering day_from..day_to (inclusive) in the reporting timezone."""
+    tz = report_tz()
+    end_day = (day_to or day_from) + timedelta(days=1)
+    return datetime.combine(day_from, time.min, tzinfo=tz), datetime.combine(end_day, time.min, tzinfo=tz)
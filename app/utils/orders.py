@@ -1,7 +1,45 @@
 from __future__ import annotations
 from datetime import datetime, timezone
-import random
+import os
+import threading
 
-def gen_order_number(dt: datetime | None = None) -> str:
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.order import ORDER_NUMBER_BLOCK, order_number_seq
+
+
+class _OrderNumberAllocator:
+    """
+    Hi/lo allocator over `order_number_seq`.
+    One nextval() reserves ORDER_NUMBER_BLOCK numbers for this process, so
+    workers/nodes never collide and only 1 in ORDER_NUMBER_BLOCK orders hits the sequence.
+    """
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        # also called in forked children: a block must never be shared between processes
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def take(self, db: Session) -> int:
+        with self._lock:
+            if self._next >= self._end:
+                hi = int(db.execute(select(order_number_seq.next_value())).scalar_one())
+                self._next, self._end = hi, hi + ORDER_NUMBER_BLOCK
+            n = self._next
+            self._next += 1
+            return n
+
+
+_allocator = _OrderNumberAllocator()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_allocator.reset)
+
+
+def gen_order_number(db: Session, dt: datetime | None = None) -> str:
+    """FS-YYYYMMDD-NNNNNNNN; the numeric part is globally unique (the date is informational)."""
     dt = dt or datetime.now(timezone.utc)
-    return f"FS-{dt.strftime('%Y%m%d')}-{random.randint(1000, 9999)}"
+    return f"FS-{dt.strftime('%Y%m%d')}-{_allocator.take(db):08d}"
@@ -1,5 +1,5 @@
 from __future__ import annotations
-import os, sys
+import os, re, sys
 from pathlib import Path
 from logging.config import fileConfig
 from typing import Any, Mapping
@@ -25,9 +25,22 @@ if config.config_file_name:
 DB_URL = os.environ["SQLALCHEMY_DATABASE_URI"]
 target_metadata = Base.metadata
 
+# Monthly partitions (<table>_yYYYYmMM / <table>_default) are created by migrations and the
+# partition maintenance job, not by the models: keep autogenerate from dropping them.
+PARTITIONED = {t.name for t in target_metadata.tables.values() if t.dialect_options["postgresql"]["partition_by"]}
+_PARTITION_RE = re.compile(r"^(?P<parent>.+)_(y\d{4}m\d{2}|default)$")
+
+def include_name(name: str | None, type_: str, parent_names: Mapping[str, Any]) -> bool:
+    if type_ == "table" and name:
+        m = _PARTITION_RE.match(name)
+        if m and m["parent"] in PARTITIONED:
+            return False
+    return True
+
 COMPARE_KWARGS: Mapping[str, Any] = {
     "compare_type": True,
     "compare_server_default": True,
+    "include_name": include_name,
 }
 
 def run_migrations_offline() -> None:
@@ -0,0 +1,87 @@
+"""partition inventory movements
+
+Revision ID: 694b715db2ed
+Revises: 8a83012b82ff
+Create Date: 2026-10-19 07:57:09.247515
+
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '694b715db2ed'
+down_revision: Union[str, Sequence[str], None] = '8a83012b82ff'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Constraint/index names as created by the init schema (naming convention in app.db.base).
+_FKS = (
+    "ADD CONSTRAINT fk_inventory_movements_order_id_orders "
+    "FOREIGN KEY (order_id) REFERENCES orders(id) ON DELETE SET NULL",
+    "ADD CONSTRAINT fk_inventory_movements_variant_id_product_variants "
+    "FOREIGN KEY (variant_id) REFERENCES product_variants(id) ON DELETE CASCADE",
+)
+_INDEXES = (
+    ("ix_inventory_movements_inventory_movements_order_id", "order_id"),
+    ("ix_inventory_movements_inventory_movements_reason", "reason"),
+    ("ix_inventory_movements_inventory_movements_variant_id", "variant_id"),
+    ("ix_inventory_variant_created", "variant_id, created_at"),
+)
+PREMAKE_MONTHS = 3
+
+
+def _add_months(d: date, n: int) -> date:
+    y, m = divmod(d.month - 1 + n, 12)
+    return date(d.year + y, m + 1, 1)
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Copy inventory_movements into a fresh (partitioned or plain) table and swap it in."""
+    conn = op.get_bind()
+    pk = "id, created_at" if partitioned else "id"
+    suffix = " PARTITION BY RANGE (created_at)" if partitioned else ""
+    op.execute(
+        "CREATE TABLE inventory_movements_new "
+        f"(LIKE inventory_movements INCLUDING DEFAULTS INCLUDING CONSTRAINTS){suffix}"
+    )
+    if partitioned:
+        oldest = conn.scalar(sa.text("SELECT min(created_at) FROM inventory_movements"))
+        today = datetime.now(timezone.utc).date()
+        month = date((oldest or today).year, (oldest or today).month, 1)
+        last = _add_months(date(today.year, today.month, 1), PREMAKE_MONTHS)
+        while month <= last:
+            nxt = _add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE inventory_movements_y{month.year}m{month.month:02d} "
+                f"PARTITION OF inventory_movements_new "
+                f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{nxt} 00:00:00+00')"
+            )
+            month = nxt
+        op.execute("CREATE TABLE inventory_movements_default PARTITION OF inventory_movements_new DEFAULT")
+
+    op.execute("INSERT INTO inventory_movements_new SELECT * FROM inventory_movements")
+    op.execute("ALTER SEQUENCE inventory_movements_id_seq OWNED BY NONE")
+    op.execute("DROP TABLE inventory_movements")
+    op.execute("ALTER TABLE inventory_movements_new RENAME TO inventory_movements")
+    op.execute("ALTER SEQUENCE inventory_movements_id_seq OWNED BY inventory_movements.id")
+    op.execute(f"ALTER TABLE inventory_movements ADD CONSTRAINT pk_inventory_movements PRIMARY KEY ({pk})")
+    for fk in _FKS:
+        op.execute(f"ALTER TABLE inventory_movements {fk}")
+    for name, cols in _INDEXES:
+        op.execute(f"CREATE INDEX {name} ON inventory_movements ({cols})")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Monthly RANGE partitions on created_at (see app/db/partitions.py). The PK must contain
+    # the partition key, so it becomes (id, created_at); ids keep coming from the same sequence.
+    _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _rebuild(partitioned=False)
@@ -0,0 +1,29 @@
+"""order number sequence
+
+Revision ID: 7665c68fdc17
+Revises: 89bd36e63679
+Create Date: 2026-10-19 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7665c68fdc17'
+down_revision: Union[str, Sequence[str], None] = '89bd36e63679'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # INCREMENT BY must match app.models.order.ORDER_NUMBER_BLOCK (hi/lo allocation)
+    op.execute(sa.schema.CreateSequence(sa.Sequence('order_number_seq', start=1, increment=100)))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(sa.schema.DropSequence(sa.Sequence('order_number_seq')))
@@ -0,0 +1,36 @@
+"""product in_stock from available stock
+
+Revision ID: e02a0e8e373e
+Revises: 13721a210177
+Create Date: 2026-10-19 09:04:49.092257
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e02a0e8e373e'
+down_revision: Union[str, Sequence[str], None] = '13721a210177'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # in_stock now means some live variant has unreserved stock (ProductRepository._has_available)
+    op.execute(
+        """
+        UPDATE products p SET in_stock = EXISTS (
+            SELECT 1 FROM product_variants pv
+            WHERE pv.product_id = p.id AND pv.deleted_at IS NULL AND pv.stock_qty > pv.reserved_qty
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("UPDATE products SET in_stock = total_stock > 0")
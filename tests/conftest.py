@@ -0,0 +1,48 @@
+"""
+Shared fixtures. Tests that need Postgres (partitions, ON CONFLICT, FILTER aggregates) run
+against the migrated database in SQLALCHEMY_DATABASE_URI and are skipped without one; each
+test runs in a transaction that is rolled back (service commits become savepoint releases).
+"""
+from __future__ import annotations
+import os
+import uuid
+
+import pytest
+
+POSTGRES = os.environ.get("SQLALCHEMY_DATABASE_URI", "").startswith("postgresql")
+
+
+@pytest.fixture
+def pg():
+    from app.db.session import SessionLocal, engine
+
+    conn = engine.connect()
+    outer = conn.begin()
+    db = SessionLocal(bind=conn, join_transaction_mode="create_savepoint")
+    try:
+        yield db
+    finally:
+        db.close()
+        outer.rollback()
+        conn.close()
+
+
+@pytest.fixture
+def make_product(pg):
+    """make_product(n_variants=1, stock=10) -> (product, [variants]), flushed."""
+    from app.models.catalog import Product, ProductVariant
+
+    def make(n_variants: int = 1, stock: int = 10, price_cents: int = 1000):
+        tag = uuid.uuid4().hex[:10]
+        p = Product(name=f"P {tag}", slug=f"p-{tag}", base_price_cents=price_cents, currency="VND",
+                    is_active=True, is_archived=False)
+        pg.add(p)
+        pg.flush()
+        vs = [
+            ProductVariant(product_id=p.id, sku=f"T-{tag}-{i}", color="red", size=str(i), stock_qty=stock)
+            for i in range(n_variants)
+        ]
+        pg.add_all(vs)
+        pg.flush()
+        return p, vs
+    return make
@@ -0,0 +1,61 @@
+from __future__ import annotations
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from conftest import POSTGRES
+
+if not POSTGRES:
+    pytest.skip("needs Postgres (SQLALCHEMY_DATABASE_URI)", allow_module_level=True)
+
+from sqlalchemy import select
+
+from app.db.soft_delete import WITH_DELETED
+from app.models.catalog import ProductVariant
+from app.services.admin.catalog_import_service import CatalogImportService
+
+
+def _run(pg, tmp_path, rows):
+    path = tmp_path / "rows.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in rows) + "\n")
+    svc = CatalogImportService(pg)
+    imp = svc.run(svc.create(path=str(path)).id)
+    errors = svc.list_errors_page(imp.id, limit=50, offset=0).items
+    return imp, {e.sku: e.message for e in errors}
+
+
+def _row(product, sku, **kw):
+    return {"product_name": product.name, "product_slug": product.slug, "base_price_cents": 1000, "sku": sku, **kw}
+
+
+def test_import_never_moves_or_revives_rows(pg, make_product, tmp_path):
+    a, (a_live, a_gone) = make_product(n_variants=2)
+    b, _ = make_product(n_variants=0)
+    c, _ = make_product(n_variants=0)
+    now = datetime.now(timezone.utc)
+    a_gone.deleted_at = now
+    c.deleted_at = now
+    pg.flush()
+
+    imp, errors = _run(pg, tmp_path, [
+        _row(b, a_live.sku, color="blue", size="L"),   # SKU of product a
+        _row(a, a_gone.sku, color="green", size="M"),  # soft-deleted SKU
+        _row(c, f"{c.slug}-new"),                     # soft-deleted product
+        _row(b, f"{b.slug}-new", stock_qty=3),
+    ])
+
+    assert (imp.rows_ok, imp.rows_failed) == (1, 3)
+    assert errors == {
+        a_live.sku: "SKU belongs to another product",
+        a_gone.sku: "SKU is deleted",
+        f"{c.slug}-new": f"product {c.slug} is deleted",
+    }
+    pg.expire_all()
+    owners = dict(pg.execute(
+        select(ProductVariant.sku, ProductVariant.product_id).where(
+            ProductVariant.sku.in_([a_live.sku, a_gone.sku, f"{b.slug}-new"])
+        ),
+        execution_options=WITH_DELETED,
+    ).all())
+    assert owners == {a_live.sku: a.id, a_gone.sku: a.id, f"{b.slug}-new": b.id}
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+
+from conftest import POSTGRES
+
+if not POSTGRES:
+    pytest.skip("needs Postgres (SQLALCHEMY_DATABASE_URI)", allow_module_level=True)
+
+from app.services.admin.inventory_service import AdminInventoryService
+
+
+def test_bulk_adjust_skips_decreases_below_reserved(pg, make_product):
+    _, (held, free) = make_product(n_variants=2, stock=10)
+    held.reserved_qty = 8
+    pg.flush()
+
+    report = AdminInventoryService(pg).bulk_adjust([(held.id, -5), (free.id, -5)])
+
+    assert report.applied
+    assert report.below_reserved_skus == [held.sku]
+    assert [(line.variant_id, line.stock_after) for line in report.lines] == [(free.id, 5)]
+    pg.refresh(held)
+    pg.refresh(free)
+    assert (held.stock_qty, free.stock_qty) == (10, 5)
+
+
+def test_bulk_adjust_still_allows_increases_of_short_variants(pg, make_product):
+    _, (v,) = make_product(n_variants=1, stock=2)
+    v.reserved_qty = 5  # already short, e.g. after a damaged-stock write-off
+    pg.flush()
+
+    report = AdminInventoryService(pg).bulk_adjust([(v.id, 1)])
+    assert report.below_reserved_skus == [] and report.total_delta == 1
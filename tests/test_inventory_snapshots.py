@@ -0,0 +1,37 @@
+from __future__ import annotations
+from datetime import datetime, timezone
+
+import pytest
+
+from conftest import POSTGRES
+
+if not POSTGRES:
+    pytest.skip("needs Postgres (SQLALCHEMY_DATABASE_URI)", allow_module_level=True)
+
+from app.db.enums import InventoryMovementType
+from app.repositories.inventory_repo import InventoryRepository
+
+# a month no other data lands in
+MARCH = datetime(2002, 3, 1, tzinfo=timezone.utc)
+APRIL = datetime(2002, 4, 1, tzinfo=timezone.utc)
+
+
+def _move(inv, variant_id, at):
+    inv.record_movements([{
+        "variant_id": variant_id, "order_id": None, "qty_delta": 1,
+        "reason": InventoryMovementType.manual_adjust, "note": "test", "created_at": at,
+    }])
+
+
+def test_quiet_variant_is_covered_by_its_last_snapshot(pg, make_product):
+    _, (v,) = make_product()
+    inv = InventoryRepository(pg)
+    _move(inv, v.id, datetime(2002, 3, 5, tzinfo=timezone.utc))
+    assert not inv.snapshots_cover(MARCH, APRIL)
+
+    # mid-month snapshot, then the variant never moves again: no snapshot past April 1 will follow
+    inv.write_snapshots(datetime(2002, 3, 15, tzinfo=timezone.utc), after_variant_id=v.id - 1, limit=1)
+    assert inv.snapshots_cover(MARCH, APRIL)
+
+    _move(inv, v.id, datetime(2002, 3, 20, tzinfo=timezone.utc))
+    assert not inv.snapshots_cover(MARCH, APRIL)
@@ -0,0 +1,46 @@
+"""paginate() under the global soft-delete filter (app/db/soft_delete.py), on in-memory SQLite."""
+from __future__ import annotations
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import String, create_engine, event, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.common.listing import paginate
+from app.db.mixins import SoftDeleteMixin
+from app.db.soft_delete import WITH_DELETED, hide_soft_deleted
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class _Item(_Base, SoftDeleteMixin):
+    __tablename__ = "items"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(20))
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    _Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        event.listen(s, "do_orm_execute", hide_soft_deleted)
+        now = datetime.now(timezone.utc)
+        s.add_all([_Item(id=i, name=f"i{i}", deleted_at=now if i <= 2 else None) for i in range(1, 6)])
+        s.commit()
+        yield s
+
+
+def test_paginate_hides_deleted_rows(db):
+    items, total = paginate(db, select(_Item).order_by(_Item.id), limit=10, offset=0)
+    assert [i.id for i in items] == [3, 4, 5]
+    assert total == 3
+
+
+def test_paginate_total_honours_include_deleted(db):
+    stmt = select(_Item).order_by(_Item.id).execution_options(**WITH_DELETED)
+    items, total = paginate(db, stmt, limit=2, offset=0)
+    assert [i.id for i in items] == [1, 2]
+    assert total == 5
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from conftest import POSTGRES
+
+if not POSTGRES:
+    pytest.skip("needs Postgres (SQLALCHEMY_DATABASE_URI)", allow_module_level=True)
+
+from sqlalchemy import update
+
+from app.db.enums import OutboxStatusEnum
+from app.models.outbox import OutboxEvent
+from app.outbox import relay as relay_mod
+from app.outbox.relay import OutboxRelay
+from app.repositories.outbox_repo import OutboxRepository
+
+
+@pytest.fixture
+def outbox(pg):
+    # keep the relay to this test's rows
+    pg.execute(update(OutboxEvent).where(OutboxEvent.status == OutboxStatusEnum.pending)
+               .values(status=OutboxStatusEnum.done))
+    return OutboxRepository(pg)
+
+
+def test_hot_aggregate_drains_in_one_batch(pg, outbox):
+    evs = [outbox.add("test", 1, "test.noop", {"n": i}) for i in range(5)]
+    outbox.add("test", 2, "test.noop", {})
+    pg.flush()
+
+    assert OutboxRelay(pg).relay_batch(100) == 6
+    assert all(e.status == OutboxStatusEnum.done for e in evs)
+
+
+def test_failure_holds_back_the_rest_of_its_aggregate(pg, outbox, monkeypatch):
+    def boom(db, ev):
+        if ev.payload.get("fail"):
+            raise RuntimeError("boom")
+    monkeypatch.setattr(relay_mod, "handlers_for", lambda event_type: [boom])
+
+    first = outbox.add("test", 1, "test.x", {})
+    failing = outbox.add("test", 1, "test.x", {"fail": True})
+    after = outbox.add("test", 1, "test.x", {})
+    other = outbox.add("test", 2, "test.x", {})
+    pg.flush()
+
+    OutboxRelay(pg).relay_batch(100)
+    assert first.status == OutboxStatusEnum.done
+    assert failing.status == OutboxStatusEnum.pending and failing.attempts == 1
+    assert after.status == OutboxStatusEnum.pending and after.attempts == 0
+    assert other.status == OutboxStatusEnum.done
+    # still backing off, so nothing behind it is claimable
+    assert OutboxRelay(pg).relay_batch(100) == 0
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+
+from conftest import POSTGRES
+
+if not POSTGRES:
+    pytest.skip("needs Postgres (SQLALCHEMY_DATABASE_URI)", allow_module_level=True)
+
+from sqlalchemy import select, text
+
+from app.models.catalog import Product
+from app.repositories.product_repo import queue_product_stock
+
+
+def _state(pg, product_id):
+    return pg.execute(
+        select(Product.total_stock, Product.in_stock, text("products.xmin::text")).where(Product.id == product_id)
+    ).one()
+
+
+def test_reservation_only_commit_writes_the_product_only_when_in_stock_flips(pg, make_product):
+    p, (v,) = make_product(stock=2)
+    queue_product_stock(pg, p.id, 2)
+    pg.commit()
+    total, in_stock, _ = _state(pg, p.id)
+    assert (total, in_stock) == (2, True)
+
+    v.reserved_qty = 2
+    pg.flush()
+    queue_product_stock(pg, p.id, 0)
+    pg.commit()
+    total, in_stock, version = _state(pg, p.id)
+    assert (total, in_stock) == (2, False)
+
+    queue_product_stock(pg, p.id, 0)  # nothing changed: the row is neither locked nor rewritten
+    pg.commit()
+    assert _state(pg, p.id) == (2, False, version)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+from datetime import datetime, timezone
+
+import pytest
+
+from conftest import POSTGRES
+
+if not POSTGRES:
+    pytest.skip("needs Postgres (SQLALCHEMY_DATABASE_URI)", allow_module_level=True)
+
+from app.exceptions import NotFound
+from app.services.product_service import ProductService
+
+
+def test_list_variants_of_live_product(pg, make_product):
+    p, vs = make_product(n_variants=2)
+    assert {v.id for v in ProductService(pg).list_variants(p.id)} == {v.id for v in vs}
+
+
+def test_list_variants_of_soft_deleted_product_is_404(pg, make_product):
+    p, _ = make_product(n_variants=2)
+    p.deleted_at = datetime.now(timezone.utc)
+    pg.flush()
+    pg.expunge_all()  # a fresh request: nothing in the identity map
+    with pytest.raises(NotFound):
+        ProductService(pg).list_variants(p.id)
@@ -0,0 +1,49 @@
+from __future__ import annotations
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import POSTGRES
+
+if not POSTGRES:
+    pytest.skip("needs Postgres (SQLALCHEMY_DATABASE_URI)", allow_module_level=True)
+
+from sqlalchemy import select
+
+from app.db.enums import OrderStatusEnum, PaymentStatusEnum
+from app.models.order import Order, OrderItem
+from app.models.payment import Payment
+from app.models.report import ProductSalesDaily, SalesDaily
+from app.repositories.report_repo import SalesReportRepository
+from app.utils.dates import day_window
+
+DAY = date(2001, 1, 1)  # a day no other data lands on
+
+
+def test_partial_refunds_count_the_order_and_its_lines_once(pg):
+    start, _ = day_window(DAY)
+    at = start + timedelta(hours=10)
+    order = Order(
+        order_number="T-REFUND-1", status=OrderStatusEnum.refunded, subtotal_cents=5000, total_cents=5000,
+        ship_full_name="T", ship_mobile_num="0900000000", ship_detail_address="T",
+        created_at=at, paid_at=at,
+    )
+    pg.add(order)
+    pg.flush()
+    pg.add_all([
+        OrderItem(order_id=order.id, name="A", sku="T-RF-A", qty=2, unit_price_cents=1500, line_total_cents=3000),
+        OrderItem(order_id=order.id, name="B", sku="T-RF-B", qty=1, unit_price_cents=2000, line_total_cents=2000),
+        Payment(order_id=order.id, amount_cents=2000, status=PaymentStatusEnum.refunded, created_at=at + timedelta(hours=1)),
+        Payment(order_id=order.id, amount_cents=3000, status=PaymentStatusEnum.refunded, created_at=at + timedelta(hours=2)),
+    ])
+    pg.flush()
+
+    SalesReportRepository(pg).refresh_day(DAY)
+
+    daily = pg.execute(select(SalesDaily).where(SalesDaily.day == DAY)).scalar_one()
+    assert (daily.orders_refunded, daily.refunded_cents) == (1, 5000)
+    per_sku = {
+        r.sku: (r.units_refunded, r.refunded_cents)
+        for r in pg.execute(select(ProductSalesDaily).where(ProductSalesDaily.day == DAY)).scalars()
+    }
+    assert per_sku == {"T-RF-A": (2, 3000), "T-RF-B": (1, 2000)}